@@ -1,6 +1,6 @@
 import cv2
 import numpy as np
-from typing import List, Dict, Any, Callable, Optional, Tuple
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Union
 import os
 import sys
 from dataclasses import dataclass
@@ -12,19 +12,36 @@ from opencv_font_handler import OpenCVFontHandler
 from opencv_layout_config import LayoutConfig
 
 from opencv_drawing_utils import DrawingUtils
+from render_timeline import Phase, Timeline, frame_times, iter_held_frames
+from parallel_render import iter_prefetched
+from bounded_cache import LRUCache
+from frame_pool import FramePool
+from ffmpeg_pipe_encoder import FFmpegPipeEncoder
+from encode_profiles import EncodeProfile, get_encode_profile
+from segment_cache import actor_inputs, movie_inputs
+from render_profiler import RenderProfiler
+from poster_store import get_default_store
+from poster_downloader import PosterResult, get_default_downloader
+from poster_animation import (PosterAnimationTrack, interpolate_geometry,
+                              quantize_ease, shrink_ease)
 
 class OpenCVShortsGenerator:
-    def __init__(self, width=1080, height=1920, duration=15, fps=60, title_phase_percentage=35):
-        # Initialize configuration
-        self.config = LayoutConfig(width, height)
+    # Channel order of the frames iter_frames yields
+    pixel_format = 'bgr24'
+
+    def __init__(self, width=1080, height=1920, duration=15, fps=60, title_phase_percentage=35,
+                 frame_pool_size=0, scale=1.0):
+        # Initialize configuration, shrunk by scale for draft renders
+        self.config = LayoutConfig(width, height).scaled(scale)
         self.font_handler = OpenCVFontHandler()
         self.drawing = DrawingUtils(self.config, self.font_handler)
         
-        self.width = width
-        self.height = height
+        self.width = self.config.width
+        self.height = self.config.height
         self.duration = duration
         self.fps = fps
         self.background_color = (20, 20, 20)  # BGR format
+        self.rows_start_y = self.config.px(100)
         
         # Timing distribution
         self.title_phase_percentage = title_phase_percentage
@@ -40,54 +57,68 @@ class OpenCVShortsGenerator:
         self.poster_fullscreen_duration = min(0.2, self.poster_reveal_duration * 0.3)
         
         self.breakpoints = self.calculate_breakpoints()
+        
+        # Shrinking posters snap to this many sizes so resized copies get reused
+        self.poster_scale_levels = 48
+        self.poster_tracks: Dict[tuple, PosterAnimationTrack] = {}
+        # Posters are read as pre-decoded arrays from the poster store, which
+        # keeps them pre-sized at the row size
+        self.poster_store = get_default_store()
+        self.stored_poster_sizes = ((self.config.poster_width, self.config.row_height),)
+        self.poster_images: Dict[str, Optional[np.ndarray]] = {}
+        self.poster_digests: Dict[str, Optional[str]] = {}
+        self.fetched_posters: Dict[str, Optional[str]] = {}
+        self.resized_posters = LRUCache(64)
+        
+        # With a pool, create_frame draws into a ring of reused buffers instead of
+        # allocating; each frame is then only valid until the ring wraps around
+        self.frame_pool = (FramePool(frame_pool_size, self.width, self.height, self.background_color)
+                           if frame_pool_size else None)
+
+    @classmethod
+    def draft(cls, scale=0.5, fps=15, **kwargs) -> 'OpenCVShortsGenerator':
+        """Generator for quick previews, with the same timeline at a fraction of the size and frame rate"""
+        return cls(fps=fps, scale=scale, **kwargs)
+
+    @property
+    def profiler(self) -> Optional[RenderProfiler]:
+        """RenderProfiler timing each drawing stage, shared with the drawing utils"""
+        return self.drawing.profiler
+
+    @profiler.setter
+    def profiler(self, profiler: Optional[RenderProfiler]):
+        self.drawing.profiler = profiler
 
-    def calculate_breakpoints(self):
+    def _stage(self, name: str, phase: Optional[str] = None):
+        return self.drawing._stage(name, phase)
+
+    def calculate_breakpoints(self) -> Timeline:
         breakpoints = []
         current_time = 0
         
         # Title reveals
         for i in range(5):
-            breakpoints.append({
-                'start': current_time,
-                'end': current_time + self.title_reveal_duration,
-                'type': 'title_reveal',
-                'index': i
-            })
+            breakpoints.append(Phase(current_time, current_time + self.title_reveal_duration, 'title_reveal', i))
             current_time += self.title_reveal_duration
         
         # Poster reveals
         poster_start_time = self.title_phase_time
         for i in range(5):
-            breakpoints.append({
-                'start': poster_start_time + (i * self.poster_reveal_duration),
-                'end': poster_start_time + ((i + 1) * self.poster_reveal_duration),
-                'type': 'poster',
-                'index': i
-            })
+            breakpoints.append(Phase(poster_start_time + (i * self.poster_reveal_duration),
+                                     poster_start_time + ((i + 1) * self.poster_reveal_duration),
+                                     'poster', i))
         
         # Actor reveal
         actor_start_time = self.duration - self.actor_reveal_duration
-        breakpoints.append({
-            'start': actor_start_time,
-            'end': self.duration,
-            'type': 'actor_reveal',
-            'index': -1
-        })
+        breakpoints.append(Phase(actor_start_time, self.duration, 'actor_reveal', -1))
         
-        return breakpoints
+        return Timeline(breakpoints, self.duration)
 
     def get_current_phase(self, progress):
-        current_time = progress * self.duration
-        
-        for breakpoint in self.breakpoints:
-            if breakpoint['start'] <= current_time <= breakpoint['end']:
-                phase_progress = (current_time - breakpoint['start']) / (breakpoint['end'] - breakpoint['start'])
-                return breakpoint, phase_progress
-        
-        return self.breakpoints[-1], 1.0
+        return self.breakpoints.locate(progress * self.duration)
 
-    def calculate_poster_animation(self, phase_progress: float, target_x: int, target_y: int) -> Tuple[int, int, int, int]:
-        # Calculate full screen dimensions
+    def poster_start_geometry(self) -> Tuple[int, int, int, int]:
+        """Full-screen (x, y, width, height) the poster animation starts from"""
         if self.width / self.height > 1 / 1.5:  # 1.5 is standard poster aspect ratio
             poster_height = self.height
             poster_width = int(poster_height / 1.5)
@@ -97,101 +128,254 @@ class OpenCVShortsGenerator:
             
         start_x = (self.width - poster_width) // 2
         start_y = (self.height - poster_height) // 2
+        return start_x, start_y, poster_width, poster_height
+
+    def poster_animation_geometry(self, phase_progress: np.ndarray, target_x: int, target_y: int) -> np.ndarray:
+        """Poster (x, y, width, height) for many phase progress values at once.
         
-        if phase_progress < self.poster_fullscreen_duration / self.poster_reveal_duration:
-            return start_x, start_y, poster_width, poster_height
-        
-        # Calculate shrinking animation
-        shrink_progress = (phase_progress - self.poster_fullscreen_duration / self.poster_reveal_duration) / (1 - self.poster_fullscreen_duration / self.poster_reveal_duration)
-        
-        t = 1 - shrink_progress
-        ease_progress = 1 - (t * t * t)
-        
-        current_width = int(poster_width + (self.config.poster_width - poster_width) * ease_progress)
-        current_height = int(poster_height + (self.config.row_height - poster_height) * ease_progress)
-        current_x = int(start_x + (target_x - start_x) * ease_progress)
-        current_y = int(start_y + (target_y - start_y) * ease_progress)
+        The poster is held full screen, then shrinks into its row with cubic
+        easing. Sizes are snapped to poster_scale_levels pyramid steps.
+        """
+        fullscreen_fraction = self.poster_fullscreen_duration / self.poster_reveal_duration
+        start = self.poster_start_geometry()
+        ease = shrink_ease(phase_progress, fullscreen_fraction)
+        ease = quantize_ease(ease, start[2], self.config.poster_width, self.poster_scale_levels)
+        return interpolate_geometry(ease, start, (target_x, target_y,
+                                                  self.config.poster_width, self.config.row_height))
+
+    def calculate_poster_animation(self, phase_progress: float, target_x: int, target_y: int) -> Tuple[int, int, int, int]:
+        track = self.poster_tracks.get((target_x, target_y))
+        if track is not None:
+            geometry = track.lookup(phase_progress)
+            if geometry is not None:
+                return geometry
+        geometry = self.poster_animation_geometry(np.array([phase_progress]), target_x, target_y)[0]
+        return tuple(int(v) for v in geometry)
+
+    def prepare_poster_tracks(self, fps: Optional[float] = None):
+        """Precompute the poster geometry of every frame, one NumPy pass per poster phase"""
+        n_frames = len(frame_times(self.duration, fps or self.fps))
+        phase_indices, phase_progress = self.breakpoints.phases_for_frames(n_frames, fps or self.fps)
         
-        return current_x, current_y, current_width, current_height
+        self.poster_tracks = {}
+        for i, phase in enumerate(self.breakpoints):
+            progress = phase_progress[phase_indices == i]
+            if phase.type != 'poster' or len(progress) == 0:
+                continue
+            key = (0, self.rows_start_y + ((phase.index + 1) * self.config.vertical_spacing))
+            self.poster_tracks[key] = PosterAnimationTrack(progress, self.poster_animation_geometry(progress, *key))
+
+    def load_poster(self, poster_path: str, width: int, height: int) -> Optional[np.ndarray]:
+        """Poster resized to (width, height), never decoding a file more than once.
+
+        stored_poster_sizes are memory-mapped from the poster store; other
+        sizes (mid-animation) are resized from its decoded original.
+        """
+        if poster_path not in self.poster_images:
+            digest = self.poster_store.add_file(
+                poster_path, derivatives=[('BGR', None)] + [('BGR', size) for size in self.stored_poster_sizes])
+            self.poster_digests[poster_path] = digest
+            self.poster_images[poster_path] = self.poster_store.array(digest, 'BGR') if digest else None
+        poster_img = self.poster_images[poster_path]
+        if poster_img is None:
+            return None
+        if (width, height) in self.stored_poster_sizes:
+            return self.resized_posters.get_or_create(
+                (poster_path, width, height),
+                lambda: self.poster_store.array(self.poster_digests[poster_path], 'BGR', (width, height)))
+        return self.resized_posters.get_or_create(
+            (poster_path, width, height), lambda: cv2.resize(poster_img, (width, height)))
+
+    def prefetch_posters(self, movies: Iterable[Movie]):
+        """Download posters of movies without a poster_path concurrently, so frames never wait on them.
+
+        Titles whose last fetch failed are fetched again.
+        """
+        titles = [movie.get_title() for movie in movies
+                  if movie is not None and not movie.poster_path and not self.fetched_posters.get(movie.get_title())]
+        if titles:
+            for title, result in get_default_downloader().download(titles).items():
+                self.fetched_posters[title] = self.stored_poster_path(result)
+
+    def fetched_poster_path(self, movie: Movie) -> Optional[str]:
+        """Stored copy of the OMDB poster for a movie without a poster_path, fetched once if not prefetched"""
+        title = movie.get_title()
+        if title not in self.fetched_posters:
+            self.fetched_posters[title] = self.stored_poster_path(get_default_downloader().fetch_poster(title))
+        return self.fetched_posters[title]
+
+    def stored_poster_path(self, result: PosterResult) -> Optional[str]:
+        return self.poster_store.original_path(result.digest) if result.digest else None
 
     def draw_poster(self, frame: np.ndarray, movie: Movie, x: int, y: int, width: int, height: int) -> None:
-        if not movie or not movie.poster_path:
+        if not movie:
+            return
+        poster_path = movie.poster_path or self.fetched_poster_path(movie)
+        if not poster_path:
             return
             
-        poster_img = cv2.imread(movie.poster_path)
-        if poster_img is None:
+        resized_poster = self.load_poster(poster_path, width, height)
+        if resized_poster is None:
             return
             
-        resized_poster = cv2.resize(poster_img, (width, height))
-        y_end = min(y + height, frame.shape[0])
-        x_end = min(x + width, frame.shape[1])
-        
-        # Create alpha mask for smooth transition
-        alpha = np.ones((height, width, 1), dtype=np.float32)
-        frame[y:y_end, x:x_end] = cv2.addWeighted(
-            frame[y:y_end, x:x_end], 
-            1 - alpha[:y_end-y, :x_end-x], 
-            resized_poster[:y_end-y, :x_end-x], 
-            alpha[:y_end-y, :x_end-x], 
-            0
-        )
+        # Posters are opaque; the full-screen start of the animation overhangs the frame
+        self.drawing.compositor.paste(frame, resized_poster, x, y)
+
+    def frame_state_key(self, progress: float) -> tuple:
+        """Summary of everything that moves on screen at this point of the timeline.
+        
+        For a given actor and movie list, frames with equal keys are pixel
+        identical, so runs of equal keys only need rendering once.
+        """
+        return self.phase_state_key(*self.get_current_phase(progress))
+
+    def phase_state_key(self, current_phase: Phase, phase_progress: float) -> tuple:
+        """frame_state_key for an already located phase"""
+        if current_phase.type == 'poster':
+            row_y = self.rows_start_y + ((current_phase.index + 1) * self.config.vertical_spacing)
+            return ('poster', current_phase.index,
+                    self.calculate_poster_animation(phase_progress, 0, row_y))
+        if current_phase.type in ['actor_reveal', 'final_frame']:
+            # The actor fades in continuously, so every frame differs
+            return (current_phase.type, current_phase.index, phase_progress)
+        return (current_phase.type, current_phase.index, None)
+
+    def frame_state_keys(self, fps: Optional[float] = None) -> List[tuple]:
+        """frame_state_key for every frame of the render"""
+        n_frames = len(frame_times(self.duration, fps or self.fps))
+        phase_indices, phase_progress = self.breakpoints.phases_for_frames(n_frames, fps or self.fps)
+        return [self.phase_state_key(self.breakpoints[i], progress)
+                for i, progress in zip(phase_indices.tolist(), phase_progress.tolist())]
+
+    def segment_inputs(self, phase: Phase, actor: Actor,
+                       movies_with_descriptors: List[Tuple[Movie, str]]) -> tuple:
+        """Render inputs that are visible during phase, for keying cached segments"""
+        # Every row's descriptor and scores are drawn from the first frame on
+        rows = tuple((movie_inputs(movie), descriptor) for movie, descriptor in movies_with_descriptors)
+        return (rows, actor_inputs(actor) if phase.type in ['actor_reveal', 'final_frame'] else None)
 
     def create_frame(self, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]], progress: float) -> np.ndarray:
         current_phase, phase_progress = self.get_current_phase(progress)
+        if self.profiler is not None:
+            self.profiler.phase = current_phase.type
         
-        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-        frame[:] = self.background_color
-        
-        # Use the drawing utils for all text and UI elements
-        self.drawing.draw_clue_counter(frame, current_phase)
-        
-        start_y = 100
-        self.drawing.draw_row(frame, start_y, None, "Mystery Actor", 
-                            current_phase, -1, phase_progress)
-        
-        for idx, (movie, descriptor) in enumerate(movies_with_descriptors):
-            current_y = start_y + ((idx + 1) * self.config.vertical_spacing)
+        with self._stage('create_frame'):
+            with self._stage('background'):
+                if self.frame_pool is not None:
+                    frame = self.frame_pool.acquire()
+                else:
+                    frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+                    frame[:] = self.background_color
+            
+            # Use the drawing utils for all text and UI elements
+            with self._stage('draw_clue_counter'):
+                self.drawing.draw_clue_counter(frame, current_phase)
+            
+            start_y = self.rows_start_y
+            with self._stage('draw_row'):
+                self.drawing.draw_row(frame, start_y, None, "Mystery Actor", 
+                                    current_phase, -1, phase_progress)
             
-            # Handle title reveals and basic info
-            self.drawing.draw_row(frame, current_y, movie, descriptor,
-                                current_phase, idx, phase_progress)
+            for idx, (movie, descriptor) in enumerate(movies_with_descriptors):
+                current_y = start_y + ((idx + 1) * self.config.vertical_spacing)
+                
+                # Handle title reveals and basic info
+                with self._stage('draw_row'):
+                    self.drawing.draw_row(frame, current_y, movie, descriptor,
+                                        current_phase, idx, phase_progress)
+                
+                # Handle poster reveals
+                with self._stage('draw_poster'):
+                    if current_phase.type == 'poster':
+                        if current_phase.index == idx:
+                            poster_x, poster_y, poster_w, poster_h = self.calculate_poster_animation(
+                                phase_progress, 0, current_y
+                            )
+                            self.draw_poster(frame, movie, poster_x, poster_y, poster_w, poster_h)
+                        elif current_phase.index > idx:
+                            self.draw_poster(frame, movie, 0, current_y,
+                                           self.config.poster_width, self.config.row_height)
+                    elif current_phase.type in ['actor_reveal', 'final_frame']:
+                        self.draw_poster(frame, movie, 0, current_y,
+                                       self.config.poster_width, self.config.row_height)
+            
+            # Draw actor reveal if in that phase
+            if current_phase.type in ['actor_reveal', 'final_frame']:
+                with self._stage('draw_actor'):
+                    self.drawing.draw_actor(frame, actor, phase_progress)
             
-            # Handle poster reveals
-            if current_phase['type'] == 'poster':
-                if current_phase['index'] == idx:
-                    poster_x, poster_y, poster_w, poster_h = self.calculate_poster_animation(
-                        phase_progress, 0, current_y
-                    )
-                    self.draw_poster(frame, movie, poster_x, poster_y, poster_w, poster_h)
-                elif current_phase['index'] > idx:
-                    self.draw_poster(frame, movie, 0, current_y,
-                                   self.config.poster_width, self.config.row_height)
-            elif current_phase['type'] in ['actor_reveal', 'final_frame']:
-                self.draw_poster(frame, movie, 0, current_y,
-                               self.config.poster_width, self.config.row_height)
-        
-        # Draw actor reveal if in that phase
-        if current_phase['type'] in ['actor_reveal', 'final_frame']:
-            self.drawing.draw_actor(frame, actor, phase_progress)
-        
-        return frame
+            return frame
+
+    def iter_frames(self, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]],
+                    fps: Optional[float] = None, prefetch: int = 4,
+                    start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """Yield (index, timestamp, frame) for every frame of the short, in order.
+        
+        Frames are rendered lazily as the consumer pulls them, with up to
+        prefetch frames rendered ahead on a background thread. Held frames are
+        yielded as the same array, so consumers must not modify frames in place.
+        With a frame pool, prefetch is capped so queued frames are never reused.
+        start and stop limit the render to frames [start, stop) of the short.
+        """
+        fps = fps or self.fps
+        times = frame_times(self.duration, fps)
+        self.prepare_poster_tracks(fps)
+        # Every missing poster is downloaded up front, concurrently
+        self.prefetch_posters(movie for movie, _ in movies_with_descriptors)
+        # Decode the actor image again in case the file changed since the last render
+        self.drawing.actor_images.clear()
+        if self.frame_pool is not None:
+            # The consumer's frame, the queue and the frame being drawn are all live
+            prefetch = max(0, min(prefetch, len(self.frame_pool) - 2))
+        # Frames whose visual state doesn't change are rendered once and repeated
+        keys = self.frame_state_keys(fps)[start:stop]
+        held = iter_held_frames(keys, lambda offset: self.create_frame(
+            actor, movies_with_descriptors, times[start + offset] / self.duration))
+        return iter_prefetched(((start + offset, float(times[start + offset]), frame)
+                                for offset, frame in held), prefetch)
 
     def generate_video(self, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]], 
-                      output_path: str, progress_callback: Optional[Callable[[float], None]] = None):
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_path, fourcc, self.fps, (self.width, self.height))
-        
-        try:
-            total_frames = int(self.duration * self.fps)
-            for frame_num in range(total_frames):
-                progress = frame_num / total_frames
-                frame = self.create_frame(actor, movies_with_descriptors, progress)
+                      output_path: str, progress_callback: Optional[Callable[[float], None]] = None,
+                      encoder: str = 'ffmpeg', profile: Union[str, EncodeProfile] = 'publish'):
+        """Render and encode the short.
+        
+        encoder='ffmpeg' pipes frames into x264 with the settings of profile,
+        one of encode_profiles.ENCODE_PROFILES or an EncodeProfile.
+        encoder='mp4v' writes MPEG-4 part 2 through cv2.VideoWriter.
+        """
+        if encoder not in ('ffmpeg', 'mp4v'):
+            raise ValueError(f"Unknown encoder: {encoder}")
+        if self.profiler is not None:
+            self.profiler.begin()
+        
+        # Rendering runs ahead on a background thread while frames are encoded
+        frames = self.iter_frames(actor, movies_with_descriptors)
+        if encoder == 'ffmpeg':
+            profile = get_encode_profile(profile)
+            with FFmpegPipeEncoder(output_path, self.width, self.height, self.fps,
+                                   ffmpeg_params=profile.ffmpeg_params(self.fps),
+                                   pixel_format=self.pixel_format) as out:
+                self.write_frames(out, frames, progress_callback)
+        else:
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = cv2.VideoWriter(output_path, fourcc, self.fps, (self.width, self.height))
+            try:
+                self.write_frames(out, frames, progress_callback)
+            finally:
+                out.release()
+        
+        if self.profiler is not None:
+            self.profiler.finish()
+
+    def write_frames(self, out, frames: Iterator[Tuple[int, float, np.ndarray]],
+                     progress_callback: Optional[Callable[[float], None]] = None):
+        for frame_num, timestamp, frame in frames:
+            phase = self.breakpoints.locate(timestamp)[0].type if self.profiler else None
+            with self._stage('encoder_write', phase):
                 out.write(frame)
-                
-                if progress_callback:
-                    progress_callback(progress)
-        finally:
-            out.release()
+            
+            if progress_callback:
+                progress_callback(timestamp / self.duration)
 
     def generate_video_helper(self, actor: Actor, movies: List[Movie] = None,
                             movies_with_descriptors: List[Tuple[Movie, str]] = None,
@@ -1,6 +1,6 @@
 from datetime import datetime
 import HelperMethods
-from omdb_api import download_single_poster_omdb
+from omdb_api import download_single_poster_omdb, get_movie_record
 
 
 class Movie:
@@ -69,3 +69,5 @@ class Movie:
             return -1
     def get_poster_from_omdb(self):
         return download_single_poster_omdb(self.title)
+    def get_omdb_record(self):
+        return get_movie_record(self.title)
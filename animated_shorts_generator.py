@@ -1,29 +1,54 @@
-from io import BytesIO
 from moviepy.editor import VideoFileClip, TextClip, ImageClip, ColorClip, CompositeVideoClip, AudioFileClip
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from dataclasses import dataclass
-from typing import List, Dict, Any, Callable, Optional, Tuple
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple, Union
 import os
 import sys
 from Actor import Actor
 from Movie import Movie
 from sound_manager import SoundManager
+from layout_config import LayoutConfig
+from poster_cache import PosterCache
+from poster_store import get_default_store
+from frame_layers import FrameLayerCache
+from bounded_cache import LRUCache
+from image_pyramid import ImagePyramid
+from frame_pool import ImageFramePool
+from parallel_render import OrderedFrameStream, iter_frames_parallel, iter_prefetched
+from render_timeline import Phase, Timeline, frame_times, iter_held_frames
+from ffmpeg_pipe_encoder import FFmpegPipeEncoder
+from encode_profiles import EncodeProfile, get_encode_profile
+from segment_cache import actor_inputs, movie_inputs
+from render_profiler import NULL_STAGE, RenderProfiler
+from poster_animation import (PosterAnimationTrack, interpolate_geometry,
+                              quantize_ease, shrink_ease)
 
 class ShortsGenerator:
-    def __init__(self, width=1080, height=1920, duration=15, fps=60, title_phase_percentage=35):
-        self.width = width
-        self.height = height
+    # Channel order of the frames iter_frames yields
+    pixel_format = 'rgb24'
+    
+    def __init__(self, width=1080, height=1920, duration=15, fps=60, title_phase_percentage=35,
+                 frame_pool_size=0, scale=1.0):
+        # Kept so worker processes can build an identical generator
+        self.init_kwargs = dict(width=width, height=height, duration=duration, fps=fps,
+                                title_phase_percentage=title_phase_percentage,
+                                frame_pool_size=frame_pool_size, scale=scale)
+        # Layout for a width x height frame, shrunk by scale for draft renders
+        self.config = LayoutConfig(width, height).scaled(scale)
+        self.width = self.config.width
+        self.height = self.config.height
         self.duration = duration
         self.fps = fps
         self.background_color = (20, 20, 20)
-        self.icon_size = 100
+        self.icon_size = self.px(100)
         # Layout parameters
-        self.row_height = 320
-        self.poster_width = 180
-        self.actor_start_size = 400
-        self.vertical_spacing = (self.height - 100) // 6
-        self.box_office_x = self.width - 150
+        self.row_height = self.config.row_height
+        self.poster_width = self.config.poster_width
+        self.actor_start_size = self.config.actor_start_size
+        self.vertical_spacing = self.config.vertical_spacing
+        self.box_office_x = self.width - self.px(150)
+        self.rows_start_y = self.px(50)
         
         # Timing distribution (in percentages of total duration)
         self.title_phase_percentage = title_phase_percentage
@@ -40,76 +65,97 @@ class ShortsGenerator:
         
         self.breakpoints = self.calculate_breakpoints()
         
+        # Shrinking posters snap to this many sizes so resized copies get reused
+        self.poster_scale_levels = 48
+        self.poster_tracks: Dict[tuple, PosterAnimationTrack] = {}
+        
         # Initialize sound manager
         self.sound_manager = SoundManager("")
+        
+        # Posters are fetched once and resized copies reused across frames; the
+        # row and full-screen sizes are kept pre-sized in the poster store
+        start_width, start_height = self.poster_start_geometry()[2:]
+        self.poster_cache = PosterCache(store=get_default_store(),
+                                        stored_sizes=[(self.poster_width, self.row_height),
+                                                      (int(start_width), int(start_height))])
+        
+        # Static per-phase layers that only the animating element is drawn over
+        self.layer_cache = FrameLayerCache()
+        self.icon_cache: Dict[str, Image.Image] = {}
+        self.fonts: Dict[int, Any] = {}
+        self.actor_images = LRUCache(4)
+        
+        # With a pool, frames are pasted into a ring of reused images instead of
+        # copied; each frame is then only valid until the ring wraps around
+        self.frame_pool = (ImageFramePool(frame_pool_size, self.width, self.height, self.background_color)
+                           if frame_pool_size else None)
+        
+        # Attach a RenderProfiler to time each drawing stage of a render
+        self.profiler: Optional[RenderProfiler] = None
+    
+    @classmethod
+    def draft(cls, scale=0.5, fps=15, **kwargs) -> 'ShortsGenerator':
+        """Generator for quick previews, with the same timeline at a fraction of the size and frame rate"""
+        return cls(fps=fps, scale=scale, **kwargs)
     
-    def calculate_breakpoints(self):
+    def px(self, value) -> int:
+        """Scale a full-size pixel measurement to the frame being rendered"""
+        return self.config.px(value)
+    
+    def _stage(self, name: str, phase: Optional[str] = None):
+        """Context that times a stage when a profiler is attached"""
+        if self.profiler is None:
+            return NULL_STAGE
+        return self.profiler.stage(name, phase)
+    
+    def calculate_breakpoints(self) -> Timeline:
         breakpoints = []
         current_time = 0
         
         # Title reveals
         for i in range(5):
-            breakpoints.append({
-                'start': current_time,
-                'end': current_time + self.title_reveal_duration,
-                'type': 'title_reveal',
-                'index': i
-            })
+            breakpoints.append(Phase(current_time, current_time + self.title_reveal_duration, 'title_reveal', i))
             current_time += self.title_reveal_duration
         
         # Poster reveals
         poster_start_time = self.title_phase_time
         for i in range(5):
-            breakpoints.append({
-                'start': poster_start_time + (i * self.poster_reveal_duration),
-                'end': poster_start_time + ((i + 1) * self.poster_reveal_duration),
-                'type': 'poster',
-                'index': i
-            })
+            breakpoints.append(Phase(poster_start_time + (i * self.poster_reveal_duration),
+                                     poster_start_time + ((i + 1) * self.poster_reveal_duration),
+                                     'poster', i))
         
         # Actor reveal
         actor_start_time = self.duration - self.actor_reveal_duration
-        breakpoints.append({
-            'start': actor_start_time,
-            'end': self.duration,
-            'type': 'actor_reveal'
-        })
+        breakpoints.append(Phase(actor_start_time, self.duration, 'actor_reveal'))
         
-        return breakpoints
+        return Timeline(breakpoints, self.duration)
     
     def get_current_phase(self, progress):
         """Return current phase and progress within that phase"""
-        current_time = progress * self.duration
-        
-        for breakpoint in self.breakpoints:
-            if breakpoint['start'] <= current_time <= breakpoint['end']:
-                phase_progress = (current_time - breakpoint['start']) / (breakpoint['end'] - breakpoint['start'])
-                return breakpoint, phase_progress
-        
-        # If we're past all breakpoints, return the last one with full progress
-        return self.breakpoints[-1], 1.0
+        # Past all breakpoints, the last phase is returned with full progress
+        return self.breakpoints.locate(progress * self.duration)
     
     def count_revealed_clues(self, current_phase):
         clues = 0
-        if current_phase['type'] == 'title_reveal':
-            clues = current_phase['index'] + 1
-        elif current_phase['type'] == 'poster':
-            clues = 5 + current_phase['index'] + 1
-        elif current_phase['type'] == 'actor_reveal':
+        if current_phase.type == 'title_reveal':
+            clues = current_phase.index + 1
+        elif current_phase.type == 'poster':
+            clues = 5 + current_phase.index + 1
+        elif current_phase.type == 'actor_reveal':
             clues = 11  # 5 titles + 5 posters + actor
         return clues
     
-    def draw_clue_counter(self, draw: ImageDraw, current_phase: dict):
+    def draw_clue_counter(self, draw: ImageDraw, current_phase: Phase):
         clues = self.count_revealed_clues(current_phase)
-        font = self.get_font(size=60)  # Increased from 60
+        font = self.get_font(size=self.config.clue_counter_size)  # Increased from 60
         counter_text = f"{clues}"
         bbox = draw.textbbox((0, 0), counter_text, font=font)
         text_width = bbox[2] - bbox[0]
-        x = self.width - text_width - 30
-        y = 30
+        x = self.width - text_width - self.px(30)
+        y = self.px(30)
         
         # Draw counter background
-        padding = 15  # Increased padding for larger text
+        padding = self.config.padding  # Increased padding for larger text
         draw.rectangle((x - padding, y - padding,
                        x + text_width + padding, y + bbox[3] - bbox[1] + padding),
                       fill=(40, 40, 40), outline=(100, 100, 100))
@@ -117,51 +163,80 @@ class ShortsGenerator:
         # Draw counter text
         draw.text((x, y), counter_text, fill=(255, 255, 255), font=font)
     
-    def calculate_poster_animation(self, start_time: float, end_time: float,
-                                 progress: float, target_x: int, target_y: int) -> Optional[Tuple[int, int, int, int]]:
-        animation_duration = end_time - start_time
-        local_progress = progress
-        
-        # Full screen phase
-        if local_progress < self.poster_fullscreen_duration / animation_duration:
-            start_width = min(self.width, self.height * (self.poster_width / self.row_height))
-            start_height = min(self.height, self.width * (self.row_height / self.poster_width))
-            start_x = (self.width - start_width) // 2
-            start_y = (self.height - start_height) // 2
-            return (int(start_x), int(start_y), int(start_width), int(start_height))
-        
-        # Shrinking animation phase
-        shrink_progress = (local_progress - self.poster_fullscreen_duration / animation_duration) / (1 - self.poster_fullscreen_duration / animation_duration)
-        if shrink_progress > 1:
-            return (target_x, target_y, self.poster_width, self.row_height)
-        
-        # Calculate current size and position with cubic easing
-        t = 1 - shrink_progress
-        ease_progress = 1 - (t * t * t)
-        
+    def poster_start_geometry(self) -> Tuple[float, float, float, float]:
+        """Full-screen (x, y, width, height) the poster animation starts from"""
         start_width = min(self.width, self.height * (self.poster_width / self.row_height))
         start_height = min(self.height, self.width * (self.row_height / self.poster_width))
         start_x = (self.width - start_width) // 2
         start_y = (self.height - start_height) // 2
+        return start_x, start_y, start_width, start_height
+    
+    def poster_animation_geometry(self, start_time: float, end_time: float, phase_progress: np.ndarray,
+                                  target_x: int, target_y: int) -> np.ndarray:
+        """Poster (x, y, width, height) for many phase progress values at once.
+        
+        The poster is held full screen, then shrinks into its row with cubic
+        easing. Sizes are snapped to poster_scale_levels pyramid steps.
+        """
+        fullscreen_fraction = self.poster_fullscreen_duration / (end_time - start_time)
+        start = self.poster_start_geometry()
+        ease = shrink_ease(phase_progress, fullscreen_fraction)
+        ease = quantize_ease(ease, start[2], self.poster_width, self.poster_scale_levels)
+        return interpolate_geometry(ease, start, (target_x, target_y, self.poster_width, self.row_height))
+    
+    def calculate_poster_animation(self, start_time: float, end_time: float,
+                                 progress: float, target_x: int, target_y: int) -> Optional[Tuple[int, int, int, int]]:
+        track = self.poster_tracks.get((start_time, end_time, target_x, target_y))
+        if track is not None:
+            geometry = track.lookup(progress)
+            if geometry is not None:
+                return geometry
+        geometry = self.poster_animation_geometry(start_time, end_time, np.array([progress]),
+                                                  target_x, target_y)[0]
+        return tuple(int(v) for v in geometry)
+    
+    def prepare_poster_tracks(self, fps: Optional[float] = None):
+        """Precompute the poster geometry of every frame, one NumPy pass per poster phase"""
+        n_frames = len(frame_times(self.duration, fps or self.fps))
+        phase_indices, phase_progress = self.breakpoints.phases_for_frames(n_frames, fps or self.fps)
+        
+        self.poster_tracks = {}
+        for i, phase in enumerate(self.breakpoints):
+            progress = phase_progress[phase_indices == i]
+            if phase.type != 'poster' or len(progress) == 0:
+                continue
+            row_y = self.rows_start_y + ((phase.index + 1) * self.vertical_spacing)
+            self.poster_tracks[(phase.start, phase.end, 0, row_y)] = PosterAnimationTrack(
+                progress, self.poster_animation_geometry(phase.start, phase.end, progress, 0, row_y))
+    
+    def actor_reveal_size(self, progress: float) -> int:
+        t = progress
+        ease_progress = 1 - (1 - t) * (1 - t) * (1 - t)
         
-        current_width = start_width + (self.poster_width - start_width) * ease_progress
-        current_height = start_height + (self.row_height - start_height) * ease_progress
-        current_x = start_x + (target_x - start_x) * ease_progress
-        current_y = start_y + (target_y - start_y) * ease_progress
-        
-        return (int(current_x), int(current_y), int(current_width), int(current_height))
+        target_size = min(self.width, self.height)
+        return int(self.actor_start_size + (target_size - self.actor_start_size) * ease_progress)
+    
+    def load_actor_pyramid(self, path: str) -> ImagePyramid:
+        """Decode the actor portrait once and build its downscale pyramid"""
+        def load():
+            actor_image = Image.open(path)
+            actor_image.load()
+            if actor_image.mode not in ('RGB', 'RGBA'):
+                actor_image = actor_image.convert('RGBA')
+            # Close levels keep the final resize small enough for bicubic
+            return ImagePyramid(actor_image, actor_image.size,
+                                lambda image, size: image.resize(size, Image.Resampling.BICUBIC),
+                                reduce=lambda image, size: image.resize(size, Image.Resampling.LANCZOS),
+                                scale=0.75)
+        return self.actor_images.get_or_create(path, load)
     
     def draw_actor(self, frame: Image, actor: Actor, progress: float):
         if actor.url and os.path.exists(actor.url):
             try:
-                actor_image = Image.open(actor.url)
-                t = progress
-                ease_progress = 1 - (1 - t) * (1 - t) * (1 - t)
-                
-                target_size = min(self.width, self.height)
-                current_size = int(self.actor_start_size + (target_size - self.actor_start_size) * ease_progress)
+                actor_pyramid = self.load_actor_pyramid(actor.url)
+                current_size = self.actor_reveal_size(progress)
                 
-                aspect_ratio = actor_image.width / actor_image.height
+                aspect_ratio = actor_pyramid.size[0] / actor_pyramid.size[1]
                 if aspect_ratio > 1:
                     width = current_size
                     height = int(current_size / aspect_ratio)
@@ -169,71 +244,76 @@ class ShortsGenerator:
                     height = current_size
                     width = int(current_size * aspect_ratio)
                 
-                actor_image = actor_image.resize((width, height), Image.Resampling.LANCZOS)
+                actor_image = actor_pyramid.resize(width, height)
                 x = (self.width - width) // 2
                 y = (self.height - height) // 2
                 
-                overlay = Image.new('RGBA', frame.size, (0, 0, 0, 0))
-                overlay.paste(actor_image, (x, y))
-                frame.paste(overlay, (0, 0), overlay)
+                # Paste straight into the frame, masking only when the portrait has alpha
+                frame.paste(actor_image, (x, y), actor_image if actor_image.mode == 'RGBA' else None)
                 
                 draw = ImageDraw.Draw(frame)
                 text = "How many clues did you need?"
-                font = self.get_font(size=40)  # Increased from 60
+                font = self.get_font(size=self.config.actor_comment_size)  # Increased from 60
                 bbox = draw.textbbox((0, 0), text, font=font)
                 text_width = bbox[2] - bbox[0]
                 text_x = (self.width - text_width) // 2
-                text_y = y + height + 40
+                text_y = y + height + self.px(40)
                 
-                draw.text((text_x + 2, text_y + 2), text, fill=(0, 0, 0), font=font)
+                shadow = self.px(2)
+                draw.text((text_x + shadow, text_y + shadow), text, fill=(0, 0, 0), font=font)
                 draw.text((text_x, text_y), text, fill=(255, 255, 255), font=font)
                 
             except Exception as e:
                 print(f"Error loading actor image: {e}")
     
     def draw_movie_info(self, draw: ImageDraw, base_frame: Image, movie: Movie, y_pos: int):
-        title_y = y_pos + (self.row_height // 2) - 15
-        font = self.get_font(size=30)  # Increased from 30
-        title_font = self.get_font(size=40)  # Increased from 40
+        title_y = y_pos + (self.row_height // 2) - self.px(15)
+        font = self.get_font(size=self.config.score_size)  # Increased from 30
+        title_font = self.get_font(size=self.config.movie_title_size)  # Increased from 40
         
         # Draw box office
         box_office_text = movie.get_display_box_office()
         bbox = draw.textbbox((0, 0), box_office_text, font=font)
         box_office_width = bbox[2] - bbox[0]
-        box_office_x = self.width - 50 - box_office_width
+        box_office_x = self.width - self.px(50) - box_office_width
         draw.text((box_office_x, title_y), box_office_text, fill=(255, 255, 0), font=font)
         
         # Draw scores
-        current_x = box_office_x - 180  # Increased spacing
+        current_x = box_office_x - self.px(180)  # Increased spacing
         
         # Draw popcornmeter score before icon
         popcorn_score = movie.get_display_popcornmeter()
         bbox = draw.textbbox((0, 0), popcorn_score, font=font)
         score_width = bbox[2] - bbox[0]
-        draw.text((current_x - score_width - 10, title_y), popcorn_score, fill=(255, 255, 255), font=font)
-        self.draw_score(draw, base_frame, current_x, title_y,
-                       movie.get_popcornmeter_int(), "",  # Empty string since we draw score separately
-                       "icons/FreshPopcornmeter.png", "icons/RottenPopcornmeter.png")
+        draw.text((current_x - score_width - self.px(10), title_y), popcorn_score, fill=(255, 255, 255), font=font)
+        with self._stage('draw_score'):
+            self.draw_score(draw, base_frame, current_x, title_y,
+                           movie.get_popcornmeter_int(), "",  # Empty string since we draw score separately
+                           "icons/FreshPopcornmeter.png", "icons/RottenPopcornmeter.png")
         
-        current_x -= 180  # Increased spacing
+        current_x -= self.px(180)  # Increased spacing
         
         # Draw tomatometer score before icon
         tomato_score = movie.get_display_tomatometer()
         bbox = draw.textbbox((0, 0), tomato_score, font=font)
         score_width = bbox[2] - bbox[0]
-        draw.text((current_x - score_width - 10, title_y), tomato_score, fill=(255, 255, 255), font=font)
-        self.draw_score(draw, base_frame, current_x, title_y,
-                       movie.get_tomatometer_int(), "",  # Empty string since we draw score separately
-                       "icons/FreshTomatometer.png", "icons/RottenTomatometer.png")
+        draw.text((current_x - score_width - self.px(10), title_y), tomato_score, fill=(255, 255, 255), font=font)
+        with self._stage('draw_score'):
+            self.draw_score(draw, base_frame, current_x, title_y,
+                           movie.get_tomatometer_int(), "",  # Empty string since we draw score separately
+                           "icons/FreshTomatometer.png", "icons/RottenTomatometer.png")
         
         # Draw title
-        draw.text((self.poster_width + 40, title_y), movie.get_title(),
+        draw.text((self.poster_width + self.config.margin, title_y), movie.get_title(),
                  fill=(255, 255, 255), font=title_font)
     
     def draw_score(self, draw: ImageDraw, frame: Image, x: int, y: int,
                   score: int, display_score: str, fresh_icon: str, rotten_icon: str):
         icon_path = fresh_icon if score > 60 else rotten_icon
-        icon = Image.open(icon_path).resize((self.icon_size, self.icon_size))
+        icon = self.icon_cache.get(icon_path)
+        if icon is None:
+            icon = Image.open(icon_path).resize((self.icon_size, self.icon_size))
+            self.icon_cache[icon_path] = icon
         frame.paste(icon, (x, y-self.icon_size//2), icon)
     
     def draw_mystery_poster(self, draw: ImageDraw, x: int, y: int, width: int, height: int):
@@ -244,6 +324,9 @@ class ShortsGenerator:
                  fill=(150, 150, 150), font=self.get_font(size=font_size))
     
     def get_font(self, size=30):
+        font = self.fonts.get(size)
+        if font is not None:
+            return font
     # Always use the default font since TrueType isn't available
         default_font = ImageFont.load_default()
         
@@ -277,123 +360,351 @@ class ShortsGenerator:
             def __getattr__(self, name):
                 return getattr(self.font, name)
         
-        return ScaledFont(default_font, scale)
+        self.fonts[size] = ScaledFont(default_font, scale)
+        return self.fonts[size]
     
 
 
     def draw_row(self, base_frame: Image, overlay_frame: Image, y_pos: int,
-                 movie: Optional[Movie], descriptor: str, current_phase: dict, 
-                 poster_index: Optional[int], phase_progress: float):
+                 movie: Optional[Movie], descriptor: str, current_phase: Phase, 
+                 poster_index: Optional[int], phase_progress: float,
+                 draw_animating: bool = True):
         base_draw = ImageDraw.Draw(base_frame)
         overlay_draw = ImageDraw.Draw(overlay_frame)
         
         # Show descriptor if current phase is past this row's reveal
         show_descriptor = False
-        if current_phase['type'] == 'title_reveal':
-            show_descriptor = current_phase['index'] >= poster_index
-        elif current_phase['type'] in ['poster', 'actor_reveal']:
+        if current_phase.type == 'title_reveal':
+            show_descriptor = current_phase.index >= poster_index
+        elif current_phase.type in ['poster', 'actor_reveal']:
             show_descriptor = True
         
         if show_descriptor and poster_index >= 0:
             # Use a more reasonable font size
-            descriptor_font = self.get_font(size=50)  # Adjusted from 2060
+            descriptor_font = self.get_font(size=self.px(50))  # Adjusted from 2060
             
             # Calculate text position to align with poster top
-            text_y = y_pos + 10  # Small padding from top of poster
+            text_y = y_pos + self.px(10)  # Small padding from top of poster
             
             # Draw the descriptor text
-            base_draw.text((self.poster_width + 40, text_y), descriptor, 
+            base_draw.text((self.poster_width + self.config.margin, text_y), descriptor, 
                           fill=(200, 200, 200), 
                           font=descriptor_font)
         
         # Handle poster visibility and animation
         show_poster = False
-        if current_phase['type'] == 'poster':
-            if current_phase['index'] == poster_index:
+        if current_phase.type == 'poster':
+            if current_phase.index == poster_index and not draw_animating:
+                # Leave the slot empty; the animating poster is composited later
+                show_poster = True
+            elif current_phase.index == poster_index:
                 # This is the currently animating poster
-                poster_params = self.calculate_poster_animation(current_phase['start'],
-                                                              current_phase['end'],
+                poster_params = self.calculate_poster_animation(current_phase.start,
+                                                              current_phase.end,
                                                               phase_progress,
                                                               0, y_pos)
                 if poster_params and movie:
-                    try:
-                        poster_data = movie.get_poster_from_omdb()
-                        if poster_data:
-                            poster = Image.open(BytesIO(poster_data))
-                            poster = poster.resize((poster_params[2], poster_params[3]))
+                    with self._stage('poster'):
+                        poster = self.poster_cache.get_resized(movie, poster_params[2], poster_params[3])
+                        if poster is not None:
                             target_frame = overlay_frame if poster_params[2] > self.poster_width else base_frame
                             target_frame.paste(poster, (poster_params[0], poster_params[1]))
                             show_poster = True
-                    except:
-                        pass
-            elif current_phase['index'] > poster_index:
-                # This poster has already been revealed
-                show_poster = True
+            elif current_phase.index > poster_index:
+                # This poster has already been revealed; the mystery poster stands in if it failed
                 if movie:
-                    try:
-                        poster_data = movie.get_poster_from_omdb()
-                        if poster_data:
-                            poster = Image.open(BytesIO(poster_data))
-                            poster = poster.resize((self.poster_width, self.row_height))
+                    with self._stage('poster'):
+                        poster = self.poster_cache.get_resized(movie, self.poster_width, self.row_height)
+                        if poster is not None:
                             base_frame.paste(poster, (0, y_pos))
-                    except:
-                        self.draw_mystery_poster(base_draw, 0, y_pos, self.poster_width, self.row_height)
-        elif current_phase['type'] == 'actor_reveal':
+                            show_poster = True
+        elif current_phase.type == 'actor_reveal':
             # All posters should be visible during actor reveal
-            show_poster = True
             if movie:
-                try:
-                    poster_data = movie.get_poster_from_omdb()
-                    if poster_data:
-                        poster = Image.open(BytesIO(poster_data))
-                        poster = poster.resize((self.poster_width, self.row_height))
+                with self._stage('poster'):
+                    poster = self.poster_cache.get_resized(movie, self.poster_width, self.row_height)
+                    if poster is not None:
                         base_frame.paste(poster, (0, y_pos))
-                except:
-                    self.draw_mystery_poster(base_draw, 0, y_pos, self.poster_width, self.row_height)
+                        show_poster = True
         
         if not show_poster:
             self.draw_mystery_poster(base_draw, 0, y_pos, self.poster_width, self.row_height)
         
         # Show movie info if descriptor is shown
         if movie is not None and show_descriptor:
-            self.draw_movie_info(base_draw, base_frame, movie, y_pos)
+            with self._stage('draw_movie_info'):
+                self.draw_movie_info(base_draw, base_frame, movie, y_pos)
 
-    def create_frame(self, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]], 
-                    progress: float) -> Image:
-        # Get current phase based on progress
-        current_phase, phase_progress = self.get_current_phase(progress)
-        
+    def draw_layers(self, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]],
+                    current_phase: Phase, phase_progress: float,
+                    draw_animating: bool = True) -> Tuple[Image.Image, Image.Image]:
+        """Draw the clue counter and every row, returning (base_frame, overlay_frame)"""
         base_frame = Image.new('RGB', (self.width, self.height), self.background_color)
         overlay_frame = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
         base_draw = ImageDraw.Draw(base_frame)
         
         # Draw clue counter
-        self.draw_clue_counter(base_draw, current_phase)
+        with self._stage('draw_clue_counter'):
+            self.draw_clue_counter(base_draw, current_phase)
         
-        start_y = 50
-        self.draw_row(base_frame, overlay_frame, start_y, None, "Mystery Actor", 
-                     current_phase, -1, phase_progress)
+        start_y = self.rows_start_y
+        with self._stage('draw_row'):
+            self.draw_row(base_frame, overlay_frame, start_y, None, "Mystery Actor", 
+                         current_phase, -1, phase_progress, draw_animating)
         
         for idx, (movie, descriptor) in enumerate(movies_with_descriptors):
             current_y = start_y + ((idx + 1) * self.vertical_spacing)
-            self.draw_row(base_frame, overlay_frame, current_y, movie, descriptor,
-                         current_phase, idx, phase_progress)
-        
-        if current_phase['type'] == 'actor_reveal':
-            self.draw_actor(base_frame, actor, phase_progress)
+            with self._stage('draw_row'):
+                self.draw_row(base_frame, overlay_frame, current_y, movie, descriptor,
+                             current_phase, idx, phase_progress, draw_animating)
+        return base_frame, overlay_frame
+
+    def render_frame(self, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]],
+                     current_phase: Phase, phase_progress: float) -> Image:
+        """Draw a complete frame from scratch, without the layer cache"""
+        base_frame, overlay_frame = self.draw_layers(actor, movies_with_descriptors,
+                                                     current_phase, phase_progress)
+        
+        if current_phase.type == 'actor_reveal':
+            with self._stage('draw_actor'):
+                self.draw_actor(base_frame, actor, phase_progress)
+        
+        with self._stage('alpha_composite'):
+            result = Image.alpha_composite(base_frame.convert('RGBA'), overlay_frame)
+            return result.convert('RGB')
+
+    def get_static_layer(self, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]],
+                         current_phase: Phase, settled: bool = True) -> Image:
+        """Return the cached static layer for a phase.
+        
+        With settled=False the animating poster's slot is left empty so the
+        moving poster can be pasted on top of the layer.
+        """
+        key = (current_phase.type, current_phase.index, settled)
+        
+        def render():
+            # Phase progress 1.0 puts the animating poster at its resting place
+            with self._stage('static_layer'):
+                base_frame, _ = self.draw_layers(actor, movies_with_descriptors, current_phase,
+                                                 1.0, draw_animating=settled)
+            return base_frame
+        
+        return self.layer_cache.get(key, render)
+
+    def frame_state_key(self, progress: float) -> tuple:
+        """Summary of everything that moves on screen at this point of the timeline.
         
-        result = Image.alpha_composite(base_frame.convert('RGBA'), overlay_frame)
-        return result.convert('RGB')
+        For a given actor and movie list, frames with equal keys are pixel
+        identical, so runs of equal keys only need rendering once.
+        """
+        return self.phase_state_key(*self.get_current_phase(progress))
+
+    def phase_state_key(self, current_phase: Phase, phase_progress: float) -> tuple:
+        """frame_state_key for an already located phase"""
+        if current_phase.type == 'poster':
+            row_y = self.rows_start_y + ((current_phase.index + 1) * self.vertical_spacing)
+            poster_params = self.calculate_poster_animation(current_phase.start, current_phase.end,
+                                                            phase_progress, 0, row_y)
+            return ('poster', current_phase.index, poster_params)
+        if current_phase.type == 'actor_reveal':
+            return ('actor_reveal', None, self.actor_reveal_size(phase_progress))
+        return (current_phase.type, current_phase.index, None)
+
+    def frame_state_keys(self, fps: Optional[float] = None) -> List[tuple]:
+        """frame_state_key for every frame of the render"""
+        n_frames = len(frame_times(self.duration, fps or self.fps))
+        phase_indices, phase_progress = self.breakpoints.phases_for_frames(n_frames, fps or self.fps)
+        return [self.phase_state_key(self.breakpoints[i], progress)
+                for i, progress in zip(phase_indices.tolist(), phase_progress.tolist())]
+
+    def segment_inputs(self, phase: Phase, actor: Actor,
+                       movies_with_descriptors: List[Tuple[Movie, str]]) -> tuple:
+        """Render inputs that are visible during phase, for keying cached segments"""
+        if phase.type == 'title_reveal':
+            # Rows after the one being revealed are still mystery slots
+            shown = movies_with_descriptors[:phase.index + 1]
+        else:
+            shown = movies_with_descriptors
+        rows = tuple((movie_inputs(movie), descriptor) for movie, descriptor in shown)
+        return (len(movies_with_descriptors), rows,
+                actor_inputs(actor) if phase.type == 'actor_reveal' else None)
+
+    def copy_layer(self, layer: Image) -> Image:
+        """Writable copy of a cached layer, in a pooled frame when pooling is on"""
+        with self._stage('copy_layer'):
+            if self.frame_pool is not None:
+                return self.frame_pool.acquire(layer)
+            return layer.copy()
+
+    def create_frame(self, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]], 
+                    progress: float) -> Image:
+        # Get current phase based on progress
+        current_phase, phase_progress = self.get_current_phase(progress)
+        self.layer_cache.bind(actor, tuple(movies_with_descriptors))
+        if self.profiler is not None:
+            self.profiler.phase = current_phase.type
+        
+        with self._stage('create_frame'):
+            if current_phase.type == 'poster':
+                return self.create_poster_frame(actor, movies_with_descriptors,
+                                                current_phase, phase_progress)
+            
+            frame = self.copy_layer(self.get_static_layer(actor, movies_with_descriptors, current_phase))
+            if current_phase.type == 'actor_reveal':
+                with self._stage('draw_actor'):
+                    self.draw_actor(frame, actor, phase_progress)
+            return frame
+
+    def create_poster_frame(self, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]],
+                            current_phase: Phase, phase_progress: float) -> Image:
+        """Composite the animating poster over its phase's static layer"""
+        index = current_phase.index
+        if index >= len(movies_with_descriptors):
+            return self.copy_layer(self.get_static_layer(actor, movies_with_descriptors, current_phase))
+        
+        movie = movies_with_descriptors[index][0]
+        row_y = self.rows_start_y + ((index + 1) * self.vertical_spacing)
+        poster_params = self.calculate_poster_animation(current_phase.start,
+                                                        current_phase.end,
+                                                        phase_progress, 0, row_y)
+        with self._stage('poster'):
+            poster = self.poster_cache.get_resized(movie, poster_params[2], poster_params[3]) if movie else None
+        
+        if poster is None or poster_params == (0, row_y, self.poster_width, self.row_height):
+            return self.copy_layer(self.get_static_layer(actor, movies_with_descriptors, current_phase))
+        
+        if poster_params[2] > self.poster_width:
+            # Large posters sit above every row, so they go straight on top
+            frame = self.copy_layer(self.get_static_layer(actor, movies_with_descriptors, current_phase,
+                                                          settled=False))
+            with self._stage('poster'):
+                frame.paste(poster, (poster_params[0], poster_params[1]))
+            return frame
+        
+        # Nearly settled posters are drawn underneath the following rows
+        return self.render_frame(actor, movies_with_descriptors, current_phase, phase_progress)
+
+    def iter_frames(self, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]],
+                    fps: Optional[float] = None, prefetch: int = 4,
+                    start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """Yield (index, timestamp, frame) for every frame of the short, in order.
+        
+        Frames are rendered lazily as the consumer pulls them, with up to
+        prefetch frames rendered ahead on a background thread. Held frames are
+        yielded as the same array, so consumers must not modify frames in place.
+        start and stop limit the render to frames [start, stop) of the short.
+        """
+        fps = fps or self.fps
+        times = frame_times(self.duration, fps)
+        self.prepare_poster_tracks(fps)
+        self.actor_images.clear()
+        self.poster_cache.prefetch(movie for movie, _ in movies_with_descriptors)
+        keys = self.frame_state_keys(fps)[start:stop]
+        
+        def render_index(offset):
+            return np.asarray(self.create_frame(actor, movies_with_descriptors,
+                                                times[start + offset] / self.duration))
+        
+        frames = ((start + offset, float(times[start + offset]), frame)
+                  for offset, frame in iter_held_frames(keys, render_index))
+        return iter_prefetched(frames, prefetch)
 
     def generate_video(self, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]], 
-                    output_path: str, progress_callback: Optional[Callable[[float], None]] = None):
+                    output_path: str, progress_callback: Optional[Callable[[float], None]] = None,
+                    workers: int = 1, encoder: str = 'moviepy',
+                    profile: Union[str, EncodeProfile] = 'publish'):
+        """Render and encode the short.
+        
+        With workers > 1 frames are rendered in that many processes and
+        streamed to the encoder in order; the output is identical to the
+        serial path. encoder='ffmpeg' pipes raw frames straight into ffmpeg
+        instead of going through MoviePy. profile picks the x264 settings,
+        one of encode_profiles.ENCODE_PROFILES or an EncodeProfile.
+        """
+        profile = get_encode_profile(profile)
+        if self.profiler is not None:
+            self.profiler.begin()
+        times = frame_times(self.duration, self.fps)
+        self.prepare_poster_tracks()
+        # Decode the actor portrait again in case the file changed since the last render
+        self.actor_images.clear()
+        # Frames whose visual state doesn't change are rendered once and repeated
+        keys = self.frame_state_keys()
+        
+        def render_index(index):
+            return np.array(self.create_frame(actor, movies_with_descriptors, times[index] / self.duration))
+        
+        if encoder == 'ffmpeg':
+            if workers > 1:
+                frames = iter_frames_parallel(self, actor, movies_with_descriptors, self.fps, workers)
+            else:
+                frames = ((index, frame) for index, _, frame
+                          in self.iter_frames(actor, movies_with_descriptors))
+            self.write_ffmpeg(frames, output_path, progress_callback, profile, workers)
+            if self.profiler is not None:
+                self.profiler.finish()
+            return
+        elif encoder != 'moviepy':
+            raise ValueError(f"Unknown encoder: {encoder}")
+        
+        stream = None
+        if workers <= 1:
+            # Every poster is downloaded up front, concurrently; workers fetch their own
+            self.poster_cache.prefetch(movie for movie, _ in movies_with_descriptors)
+        else:
+            stream = OrderedFrameStream(
+                iter_frames_parallel(self, actor, movies_with_descriptors, self.fps, workers),
+                render_index)
+        held = {'key': None, 'frame': None}
+        
         def make_frame(t):
             progress = t / self.duration
             if progress_callback:
                 progress_callback(progress)
-            frame = self.create_frame(actor, movies_with_descriptors, progress)
-            return np.array(frame)
+            index = int(round(t * self.fps))
+            if stream is not None:
+                return stream.get(index)
+            key = keys[index] if index < len(keys) else self.frame_state_key(progress)
+            if held['frame'] is None or key != held['key']:
+                held['key'] = key
+                held['frame'] = np.array(self.create_frame(actor, movies_with_descriptors, progress))
+            return held['frame']
         
+        try:
+            self.write_clip(make_frame, output_path, profile, workers)
+        finally:
+            if stream is not None:
+                stream.close()
+        if self.profiler is not None:
+            self.profiler.finish()
+
+    def write_ffmpeg(self, frames: Iterator[Tuple[int, Any]], output_path: str,
+                     progress_callback: Optional[Callable[[float], None]] = None,
+                     profile: Union[str, EncodeProfile] = 'publish', workers: int = 1):
+        """Pipe (index, frame) pairs into ffmpeg, muxing the background music"""
+        audio_path = "soundclips/background.mp3"
+        if not os.path.exists(audio_path):
+            print(f"Background music not found: {audio_path}, encoding without audio")
+            audio_path = None
+        
+        profile = get_encode_profile(profile)
+        print(f"Using ffmpeg pipe encoding with x264 ({profile.name})...")
+        encoder = FFmpegPipeEncoder(output_path, self.width, self.height, self.fps,
+                                    ffmpeg_params=profile.ffmpeg_params(self.fps, workers),
+                                    audio_path=audio_path,
+                                    audio_volume_db=self.sound_manager.background_volume,
+                                    duration=self.duration)
+        with encoder:
+            for index, frame in frames:
+                if progress_callback:
+                    progress_callback(index / self.fps / self.duration)
+                phase = self.breakpoints.locate(index / self.fps)[0].type if self.profiler else None
+                with self._stage('encoder_write', phase):
+                    encoder.write(frame)
+
+    def write_clip(self, make_frame: Callable[[float], np.ndarray], output_path: str,
+                   profile: Union[str, EncodeProfile] = 'publish', workers: int = 1):
+        profile = get_encode_profile(profile)
         clip = ColorClip(size=(self.width, self.height), color=self.background_color, duration=self.duration)
         clip = clip.set_make_frame(make_frame)
         
@@ -402,32 +713,18 @@ class ShortsGenerator:
         if background_music:
             clip = clip.set_audio(background_music)
         
-        # Common video settings
-        bitrate = "15000k"  # Adjust based on your quality needs
-        
         try:
-            # Try CPU encoding first with optimized settings
-            print("Using CPU encoding with x264...")
-            ffmpeg_params = [
-                '-c:v', 'libx264',
-                '-preset', 'medium',  # Balance between speed and compression
-                '-crf', '23',        # Constant Rate Factor (18-28 is good, lower = better quality)
-                '-pix_fmt', 'yuv420p',  # Required for compatibility
-                '-movflags', '+faststart',  # Enable streaming
-                '-b:v', bitrate,
-                '-maxrate', bitrate,
-                '-bufsize', f"{int(bitrate[:-1])*2}k",
-                '-profile:v', 'high',
-                '-level', '4.2'
-            ]
+            # Try CPU encoding first with the profile's settings
+            print(f"Using CPU encoding with x264 ({profile.name})...")
             
             clip.write_videofile(
                 output_path,
                 fps=self.fps,
                 codec='libx264',
-                ffmpeg_params=ffmpeg_params,
+                preset=profile.preset,
+                ffmpeg_params=profile.ffmpeg_params(self.fps, workers),
                 audio_codec='aac',
-                threads=4  # Adjust based on your CPU
+                threads=profile.threads(workers)
             )
             return
             
@@ -441,8 +738,8 @@ class ShortsGenerator:
                     output_path,
                     fps=self.fps,
                     codec='libx264',
-                    preset='medium',
-                    bitrate=bitrate,
+                    preset=profile.preset,
+                    bitrate=profile.maxrate,
                     audio_codec='aac'
                 )
                 return
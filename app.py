@@ -4,7 +4,7 @@ from tkcalendar import Calendar
 from datetime import datetime
 from PIL import Image, ImageTk
 import threading
-from moviepy.editor import VideoFileClip
+import os
 from typing import Optional
 from RT import RottenTomatoes
 from Movie import Movie
@@ -73,6 +73,15 @@ class MovieShortsApp:
         }
         
         self.selected_categories = {}
+        
+        # Storyboard previews reuse one small generator so posters stay cached
+        self.storyboard_generator = None
+        self.storyboard_lock = threading.Lock()
+        self.storyboard_request = 0
+        
+        # Encoded timeline segments, so re-renders only encode what changed
+        self.segment_cache = None
+        
         self.create_widgets()
         
     def create_widgets(self):
@@ -111,9 +120,13 @@ class MovieShortsApp:
         btn_frame = ttk.Frame(main_frame)
         btn_frame.pack(fill=tk.X, pady=10)
         
-        self.generate_btn = ttk.Button(btn_frame, text="Generate Video", command=self.generate_video_helper, state=tk.DISABLED)
+        self.generate_btn = ttk.Button(btn_frame, text="Generate Video", command=self.generate_video, state=tk.DISABLED)
         self.generate_btn.pack(side=tk.LEFT, padx=5)
         
+        # Low resolution, low frame rate render for checking layout and timing
+        self.draft_btn = ttk.Button(btn_frame, text="Draft Preview", command=lambda: self.generate_video(draft=True), state=tk.DISABLED)
+        self.draft_btn.pack(side=tk.LEFT, padx=5)
+        
         self.publish_btn = ttk.Button(btn_frame, text="Publish to YouTube", command=self.show_publish_dialog, state=tk.DISABLED)
         self.publish_btn.pack(side=tk.LEFT, padx=5)
         
@@ -152,6 +165,7 @@ class MovieShortsApp:
                 
             self.category_listbox.configure(state=tk.NORMAL)
             self.generate_btn.configure(state=tk.NORMAL)
+            self.draft_btn.configure(state=tk.NORMAL)
             
             self.update_category_selection()
             messagebox.showinfo("Success", f"Found {len(self.actor.movies)} movies for {actor_name}")
@@ -183,6 +197,7 @@ class MovieShortsApp:
                     self.category_listbox.delete(i)
                     self.category_listbox.insert(i, f"{category}: {movie.title} ({movie.year}) - Critics: {movie.get_display_tomatometer()}, Audience: {movie.get_display_popcornmeter()}")
                     self.selected_categories[category] = movie
+            self.update_storyboard()
 
     def update_category_selection(self):
         self.selected_categories.clear()
@@ -195,66 +210,115 @@ class MovieShortsApp:
                 self.selected_categories[category] = movie
             else:
                 self.category_listbox.insert(tk.END, f"{category}: No movie found")
+        self.update_storyboard()
+
+    def get_ordered_movies(self):
+        """(movie, category) pairs in the listbox order"""
+        ordered_categories = [item.split(":")[0].strip() for item in list(self.category_listbox.get(0, tk.END))]
+        return [(self.selected_categories[cat], cat) for cat in ordered_categories 
+                if cat in self.selected_categories]
+
+    def update_storyboard(self, selected_movies=None):
+        """Render a storyboard of the current selection in the background and show it"""
+        if not self.actor or not self.selected_categories:
+            return
+        if selected_movies is None:
+            selected_movies = self.get_ordered_movies()
+        self.storyboard_request += 1
+        thread = threading.Thread(
+            target=self.storyboard_thread,
+            args=(selected_movies, self.storyboard_request),
+            daemon=True
+        )
+        thread.start()
 
-    def generate_video(self):
+    def storyboard_thread(self, selected_movies, request):
+        try:
+            from animated_shorts_generator import ShortsGenerator
+            from storyboard_preview import render_storyboard
+            with self.storyboard_lock:
+                # Only the latest selection is worth drawing
+                if request != self.storyboard_request:
+                    return
+                if self.storyboard_generator is None:
+                    self.storyboard_generator = ShortsGenerator.draft(scale=0.25, duration=20)
+                image = render_storyboard(self.storyboard_generator, self.actor, selected_movies)
+            self.root.after(0, lambda: self.show_preview_image(image))
+        except Exception as e:
+            print(f"Error rendering storyboard: {e}")
+
+    def show_preview_image(self, image):
+        image.thumbnail((1080, 1920))  # Maintain aspect ratio
+        photo = ImageTk.PhotoImage(image)
+        
+        if hasattr(self, 'preview_image_label'):
+            self.preview_image_label.configure(image=photo)
+            self.preview_image_label.image = photo
+        else:
+            self.preview_image_label = ttk.Label(self.preview_frame, image=photo)
+            self.preview_image_label.image = photo
+            self.preview_image_label.pack(fill=tk.BOTH, expand=True)
+
+    def generate_video(self, draft: bool = False):
         if len(self.selected_categories) < 3:
             messagebox.showerror("Error", "Please select at least 3 categories")
             return
             
-        ordered_categories = [item.split(":")[0].strip() for item in list(self.category_listbox.get(0, tk.END))]
-        ordered_movies = [(self.selected_categories[cat], cat) for cat in ordered_categories 
-                         if cat in self.selected_categories]
+        ordered_movies = self.get_ordered_movies()
             
         self.generate_btn.configure(state=tk.DISABLED)
+        self.draft_btn.configure(state=tk.DISABLED)
         self.progress["value"] = 0
         
         thread = threading.Thread(
             target=self.generate_video_thread,
-            args=(ordered_movies,)
+            args=(ordered_movies, draft)
         )
         thread.start()
 
-    def generate_video_thread(self, selected_movies):
+    def generate_video_thread(self, selected_movies, draft=False):
         try:
             from animated_shorts_generator import ShortsGenerator
-            generator = ShortsGenerator(duration=20)
+            from segment_cache import SegmentCache, generate_video_incremental
             
             def update_progress(value):
-                self.root.after(0, lambda: self.progress.configure(value=value))
+                self.root.after(0, lambda: self.progress.configure(value=value * 100))
+            
+            if draft:
+                # Quarter size at 15 fps with the fastest encode; layout and timing match the final render
+                generator = ShortsGenerator.draft(scale=0.25, duration=20)
+                output_path = "draft_preview.mp4"
+                profile = 'draft'
+            else:
+                generator = ShortsGenerator(duration=20)
+                output_path = "generated_video.mp4"
+                profile = 'publish'
             
-            output_path = "generated_video.mp4"
-            generator.generate_video_helper(self.actor, movies_with_descriptors=selected_movies, output_path = output_path, progress_callback=update_progress)
+            if self.segment_cache is None:
+                self.segment_cache = SegmentCache()
+            audio_path = "soundclips/background.mp3"
+            generate_video_incremental(
+                generator, self.actor, selected_movies, output_path, self.segment_cache,
+                update_progress, profile=profile,
+                audio_path=audio_path if os.path.exists(audio_path) else None,
+                audio_volume_db=generator.sound_manager.background_volume)
             
-            self.root.after(0, lambda: self.on_generation_complete(output_path))
+            self.root.after(0, lambda: self.on_generation_complete(output_path, selected_movies, draft))
             
         except Exception as e:
             self.root.after(0, lambda: messagebox.showerror("Error", str(e)))
         finally:
             self.root.after(0, lambda: self.generate_btn.configure(state=tk.NORMAL))
+            self.root.after(0, lambda: self.draft_btn.configure(state=tk.NORMAL))
 
-    def on_generation_complete(self, video_path):
-        self.video_path = video_path
-        self.publish_btn.configure(state=tk.NORMAL)
+    def on_generation_complete(self, video_path, selected_movies, draft=False):
+        # Drafts are only previewed, never published
+        if not draft:
+            self.video_path = video_path
+            self.publish_btn.configure(state=tk.NORMAL)
         
-        try:
-            clip = VideoFileClip(video_path)
-            frame = clip.get_frame(0)
-            image = Image.fromarray(frame)
-            image.thumbnail((1080, 1920))  # Maintain aspect ratio
-            photo = ImageTk.PhotoImage(image)
-            
-            if hasattr(self, 'preview_image_label'):
-                self.preview_image_label.configure(image=photo)
-                self.preview_image_label.image = photo
-            else:
-                self.preview_image_label = ttk.Label(self.preview_frame, image=photo)
-                self.preview_image_label.image = photo
-                self.preview_image_label.pack(fill=tk.BOTH, expand=True)
-                
-            clip.close()
-            
-        except Exception as e:
-            messagebox.showwarning("Preview Error", "Could not load video preview")
+        # Preview the rendered selection from the generator instead of decoding the video
+        self.update_storyboard(selected_movies)
 
     def show_publish_dialog(self):
         dialog = PublishDialog(self.root)
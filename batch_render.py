@@ -0,0 +1,214 @@
+"""Render many "guess the actor" shorts in one long-lived process pool.
+
+Each worker process builds one ShortsGenerator and reuses it for every job
+it picks up, so fonts, score icons, posters and background music stay
+loaded between actors instead of being rebuilt for every video.
+
+Usage:
+    python batch_render.py "Dwayne Johnson" "Emma Stone" --workers 2
+    python batch_render.py --manifest actors.json --report report.json
+
+A JSON manifest is a list of actor names or objects with an "actor" key and
+optional "output", "portrait" and "profile" keys. A CSV manifest has the
+same columns.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from Actor import Actor
+from Movie import Movie
+from encode_profiles import ENCODE_PROFILES, get_encode_profile
+
+# Same categories, in the same order, as the app's category list
+CATEGORY_FUNCTIONS: List[Tuple[str, Callable[[Actor], Optional[Movie]]]] = [
+    ("Critics Least Favorite", Actor.get_worst_tomatometer),
+    ("Audience Least Favorite", Actor.get_worst_popcornmeter),
+    ("Most Successful", Actor.get_most_successful),
+    ("Audience Favorite", Actor.get_best_popcornmeter),
+    ("Critics Favorite", Actor.get_best_tomatometer),
+]
+
+
+@dataclass
+class BatchJob:
+    actor: str
+    output: str = ""
+    portrait: str = ""
+    profile: str = ""
+
+
+@dataclass
+class JobResult:
+    actor: str
+    output: str
+    status: str = "ok"
+    error: str = ""
+    worker: int = 0
+    jobs_on_worker: int = 0
+    resolve_seconds: float = 0.0
+    render_seconds: float = 0.0
+    total_seconds: float = 0.0
+    poster_requests: int = 0
+
+
+def load_manifest(path: str) -> List[BatchJob]:
+    """Read jobs from a JSON or CSV manifest"""
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(path, encoding='utf-8') as f:
+            rows = json.load(f)
+
+    jobs = []
+    for row in rows:
+        if isinstance(row, str):
+            row = {'actor': row}
+        name = (row.get('actor') or '').strip()
+        if not name:
+            print(f"Skipping manifest entry without an actor: {row}")
+            continue
+        jobs.append(BatchJob(name, (row.get('output') or '').strip(), (row.get('portrait') or '').strip(),
+                             (row.get('profile') or '').strip()))
+    return jobs
+
+
+def resolve_movies(actor: Actor) -> List[Tuple[Movie, str]]:
+    """Pick a movie for each category, the way the app fills its category list"""
+    movies_with_descriptors = []
+    for descriptor, pick in CATEGORY_FUNCTIONS:
+        try:
+            movie = pick(actor)
+        except Exception as e:
+            print(f"No {descriptor} movie for {actor.name}: {e}")
+            movie = None
+        if movie is not None:
+            movies_with_descriptors.append((movie, descriptor))
+    return movies_with_descriptors
+
+
+def resolve_actor(job: BatchJob) -> Actor:
+    from RT import RottenTomatoes
+    rt = RottenTomatoes()
+    actor = rt.scrape_actor_data(job.actor)
+    if not actor:
+        raise LookupError(f"Could not find actor: {job.actor}")
+    actor.url = job.portrait or rt.get_actor_portrait(job.actor) or ""
+    return actor
+
+
+# Per-process state, filled in by _init_worker and kept warm across jobs
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(generator_kwargs: Dict[str, Any], video_kwargs: Dict[str, Any], workers: int):
+    from animated_shorts_generator import ShortsGenerator
+    _worker['generator'] = ShortsGenerator(**generator_kwargs)
+    _worker['video_kwargs'] = video_kwargs
+    # Every worker encodes at once, so each gets its share of the cores
+    _worker['encoder_threads'] = max(1, (os.cpu_count() or 1) // workers)
+    _worker['jobs'] = 0
+
+
+def _run_job(job: BatchJob, output_dir: str) -> JobResult:
+    generator = _worker['generator']
+    _worker['jobs'] += 1
+    result = JobResult(job.actor, job.output, worker=os.getpid(), jobs_on_worker=_worker['jobs'])
+    start = time.perf_counter()
+    try:
+        actor = resolve_actor(job)
+        movies_with_descriptors = resolve_movies(actor)
+        if len(movies_with_descriptors) < 3:
+            raise ValueError(f"Only {len(movies_with_descriptors)} categories found for {job.actor}")
+        result.resolve_seconds = time.perf_counter() - start
+
+        if not result.output:
+            result.output = os.path.join(output_dir, f"{actor.name} quiz.mp4")
+        requests_before = generator.poster_cache.requests
+        render_start = time.perf_counter()
+        video_kwargs = dict(_worker['video_kwargs'])
+        profile = get_encode_profile(job.profile or video_kwargs.get('profile', 'publish'))
+        video_kwargs['profile'] = replace(profile, thread_count=_worker['encoder_threads'])
+        generator.generate_video(actor, movies_with_descriptors, result.output, **video_kwargs)
+        result.render_seconds = time.perf_counter() - render_start
+        result.poster_requests = generator.poster_cache.requests - requests_before
+    except Exception as e:
+        result.status = "failed"
+        result.error = str(e)
+    result.total_seconds = time.perf_counter() - start
+    return result
+
+
+def run_batch(jobs: List[BatchJob], output_dir: str = ".", workers: int = 1,
+              generator_kwargs: Optional[Dict[str, Any]] = None,
+              video_kwargs: Optional[Dict[str, Any]] = None) -> List[JobResult]:
+    """Render every job, returning results in job order"""
+    os.makedirs(output_dir, exist_ok=True)
+    generator_kwargs = generator_kwargs or {}
+    video_kwargs = video_kwargs or {}
+    results: List[Optional[JobResult]] = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(generator_kwargs, video_kwargs, workers)) as pool:
+        futures = {pool.submit(_run_job, job, output_dir): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            print(f"[{sum(r is not None for r in results)}/{len(jobs)}] {result.actor}: {result.status} "
+                  f"in {result.total_seconds:.1f}s" + (f" ({result.error})" if result.error else ""))
+    return results
+
+
+def print_report(results: List[JobResult], wall_seconds: float):
+    print(f"\n{'actor':<28} {'status':<7} {'worker':>7} {'#':>3} {'resolve':>8} {'render':>8} "
+          f"{'total':>8} {'posters':>8}")
+    for r in results:
+        print(f"{r.actor[:28]:<28} {r.status:<7} {r.worker:>7} {r.jobs_on_worker:>3} "
+              f"{r.resolve_seconds:>7.1f}s {r.render_seconds:>7.1f}s {r.total_seconds:>7.1f}s "
+              f"{r.poster_requests:>8}")
+    rendered = [r for r in results if r.status == "ok"]
+    print(f"\n{len(rendered)}/{len(results)} rendered in {wall_seconds:.1f}s wall time")
+    if rendered:
+        render_times = sorted(r.render_seconds for r in rendered)
+        print(f"render time: mean {sum(render_times) / len(render_times):.1f}s, "
+              f"median {render_times[len(render_times) // 2]:.1f}s, max {render_times[-1]:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a batch of actor quiz shorts")
+    parser.add_argument('actors', nargs='*', help="Actor names to render")
+    parser.add_argument('--manifest', help="JSON or CSV file listing the jobs")
+    parser.add_argument('--output-dir', default="batch_output")
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--encoder', choices=['moviepy', 'ffmpeg'], default='ffmpeg')
+    parser.add_argument('--profile', choices=list(ENCODE_PROFILES), default='publish',
+                        help="Default encode profile; manifest entries can override it")
+    parser.add_argument('--report', help="Write per-job timings to this JSON file")
+    args = parser.parse_args()
+
+    jobs = [BatchJob(name) for name in args.actors]
+    if args.manifest:
+        jobs.extend(load_manifest(args.manifest))
+    if not jobs:
+        parser.error("no actors given")
+
+    start = time.perf_counter()
+    results = run_batch(jobs, args.output_dir, args.workers,
+                        generator_kwargs=dict(duration=args.duration, fps=args.fps),
+                        video_kwargs=dict(encoder=args.encoder, profile=args.profile))
+    wall_seconds = time.perf_counter() - start
+    print_report(results, wall_seconds)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({'wall_seconds': wall_seconds, 'jobs': [asdict(r) for r in results]}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Benchmarks for the shorts renderers.
+
+Each module is a script run from the repository root, for example:
+    python -m benchmarks.bench_render
+"""
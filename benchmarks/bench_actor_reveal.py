@@ -0,0 +1,127 @@
+"""Benchmark for the actor reveal phase of both renderers.
+
+Compares decoding and LANCZOS-resizing the actor portrait on every frame,
+as draw_actor used to, against resizing from the cached image pyramid.
+Also times whole reveal frames through create_frame as they render now.
+
+Run from the repository root:
+    python -m benchmarks.bench_actor_reveal
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+from PIL import Image
+from Actor import Actor
+from Movie import Movie
+from render_timeline import frame_times
+
+
+def reveal_progress(generator):
+    """Phase progress of every frame in the actor reveal phase"""
+    n_frames = len(frame_times(generator.duration, generator.fps))
+    indices, progress = generator.breakpoints.phases_for_frames(n_frames, generator.fps)
+    reveal = [i for i, phase in enumerate(generator.breakpoints) if phase.type == 'actor_reveal']
+    return progress[np.isin(indices, reveal)].tolist()
+
+
+def fit(size, aspect_ratio):
+    if aspect_ratio > 1:
+        return size, int(size / aspect_ratio)
+    return int(size * aspect_ratio), size
+
+
+def psnr(a, b):
+    mse = np.mean((np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64)) ** 2)
+    return float('inf') if mse == 0 else 10 * np.log10(255 ** 2 / mse)
+
+
+def time_resizes(label, sizes, legacy, pyramid_factory):
+    start = time.perf_counter()
+    legacy_images = [legacy(size) for size in sizes]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pyramid = pyramid_factory()
+    pyramid_images = [pyramid.resize(*size) for size in sizes]
+    pyramid_time = time.perf_counter() - start
+
+    quality = min(psnr(a, b) for a, b in zip(legacy_images, pyramid_images))
+    print(f"{label:<10} per-frame decode {legacy_time / len(sizes) * 1e3:>7.2f} ms/frame   "
+          f"pyramid {pyramid_time / len(sizes) * 1e3:>7.2f} ms/frame   "
+          f"{legacy_time / pyramid_time:>5.1f}x faster   worst PSNR {quality:.1f} dB")
+
+
+def time_frames(label, generator, actor, movies_with_descriptors):
+    times = frame_times(generator.duration, generator.fps)
+    n_frames = len(times)
+    indices, _ = generator.breakpoints.phases_for_frames(n_frames, generator.fps)
+    reveal = [i for i, phase in enumerate(generator.breakpoints) if phase.type == 'actor_reveal']
+    frames = np.flatnonzero(np.isin(indices, reveal))
+    start = time.perf_counter()
+    for index in frames:
+        generator.create_frame(actor, movies_with_descriptors, times[index] / generator.duration)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} create_frame over {len(frames)} reveal frames: "
+          f"{elapsed / len(frames) * 1e3:.2f} ms/frame, {len(frames) / elapsed:.1f} fps")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--actor', default='Dwayne_Johnson.jpg')
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--skip-frames', action='store_true',
+                        help="Only time the resize paths, not whole frames")
+    args = parser.parse_args()
+
+    from animated_shorts_generator import ShortsGenerator
+    from Main_opencv import OpenCVShortsGenerator
+
+    pil_generator = ShortsGenerator(fps=args.fps)
+    cv_generator = OpenCVShortsGenerator(fps=args.fps)
+
+    with Image.open(args.actor) as image:
+        pil_aspect = image.width / image.height
+    pil_sizes = [fit(pil_generator.actor_reveal_size(p), pil_aspect) for p in reveal_progress(pil_generator)]
+
+    def pil_legacy(size):
+        return Image.open(args.actor).resize(size, Image.Resampling.LANCZOS)
+
+    def pil_pyramid():
+        pil_generator.actor_images.clear()
+        return pil_generator.load_actor_pyramid(args.actor)
+
+    time_resizes("PIL", pil_sizes, pil_legacy, pil_pyramid)
+
+    config = cv_generator.config
+    target_size = min(config.width, config.height)
+    image = cv2.imread(args.actor, cv2.IMREAD_UNCHANGED)
+    cv_aspect = image.shape[1] / image.shape[0]
+    cv_sizes = []
+    for t in reveal_progress(cv_generator):
+        ease_progress = 1 - (1 - t) * (1 - t) * (1 - t)
+        size = int(config.actor_start_size + (target_size - config.actor_start_size) * ease_progress)
+        cv_sizes.append(fit(size, cv_aspect))
+
+    def cv_legacy(size):
+        return cv2.resize(cv2.imread(args.actor, cv2.IMREAD_UNCHANGED), size, interpolation=cv2.INTER_LANCZOS4)
+
+    def cv_pyramid():
+        cv_generator.drawing.actor_images.clear()
+        return cv_generator.drawing.load_actor_pyramid(args.actor)
+
+    time_resizes("OpenCV", cv_sizes, cv_legacy, cv_pyramid)
+
+    if args.skip_frames:
+        return
+    movies = [Movie(title, "2020", "$100M", "85%", "40%", "") for title in "ABCDE"]
+    actor = Actor("Benchmark Actor", movies, args.actor)
+    movies_with_descriptors = list(zip(movies, ["Descriptor"] * 5))
+    # Posters aren't part of this benchmark, so skip the network
+    pil_generator.poster_cache.fetch = lambda movie: None
+    time_frames("PIL", pil_generator, actor, movies_with_descriptors)
+    time_frames("OpenCV", cv_generator, actor, movies_with_descriptors)
+
+
+if __name__ == "__main__":
+    main()
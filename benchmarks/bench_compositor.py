@@ -0,0 +1,92 @@
+"""Micro-benchmark for the OpenCV alpha-blend paths.
+
+Compares the per-call blending the renderers used to do (float64 channel
+loop in draw_score, np.stack alpha in _add_icon, fresh arrays in draw_actor)
+against opencv_compositor, reporting time and allocations per blend.
+
+Run from the repository root:
+    python -m benchmarks.bench_compositor
+"""
+import argparse
+import timeit
+import tracemalloc
+import cv2
+import numpy as np
+from opencv_compositor import Compositor, Sprite
+
+FRAME_SHAPE = (1920, 1080, 3)
+
+
+def legacy_draw_score(frame, icon, x, y):
+    size = icon.shape[0]
+    alpha = icon[:, :, 3] / 255.0
+    bgr = icon[:, :, :3]
+    for c in range(3):
+        frame[y:y + size, x:x + size, c] = (
+            frame[y:y + size, x:x + size, c] * (1 - alpha) +
+            bgr[:, :, c] * alpha
+        )
+
+
+def legacy_add_icon(frame, icon, x, y):
+    size = icon.shape[0]
+    alpha = icon[:, :, 3].astype(float) / 255
+    alpha = np.stack([alpha] * 3, axis=-1)
+    background = frame[y:y + size, x:x + size]
+    frame[y:y + size, x:x + size] = cv2.convertScaleAbs(icon[:, :, :3] * alpha + background * (1 - alpha))
+
+
+def legacy_draw_actor(frame, image, x, y, progress):
+    height, width = image.shape[:2]
+    alpha = np.full((height, width, 1), progress, dtype=np.float32)
+    roi = frame[y:y + height, x:x + width]
+    frame[y:y + height, x:x + width] = cv2.addWeighted(roi, 1 - progress, image, progress, 0)
+
+
+def measure(label, func, repeat):
+    func()  # warm up caches and scratch buffers
+    seconds = min(timeit.repeat(func, number=repeat, repeat=3)) / repeat
+    tracemalloc.start()
+    func()
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+    print(f"{label:<32} {seconds * 1e6:>10.1f} us {peak / 1024:>10.1f} KiB peak {blocks:>6} live blocks")
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--icon', default='icons/FreshTomatometer.png')
+    parser.add_argument('--icon-size', type=int, default=120)
+    parser.add_argument('--actor', default='Dwayne_Johnson.jpg')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, FRAME_SHAPE, dtype=np.uint8)
+    icon = cv2.resize(cv2.imread(args.icon, cv2.IMREAD_UNCHANGED), (args.icon_size, args.icon_size))
+    actor = cv2.imread(args.actor)
+    actor = cv2.resize(actor, (700, int(700 * actor.shape[0] / actor.shape[1])))
+    sprite = Sprite.from_image(icon)
+    compositor = Compositor()
+
+    print(f"{'blend':<32} {'time':>13} {'memory':>15} {'retained':>18}")
+    cases = [
+        ("icon, legacy draw_score", lambda: legacy_draw_score(frame, icon, 500, 600),
+         "icon, compositor", lambda: compositor.blend_sprite(frame, sprite, 500, 600)),
+        ("icon, legacy _add_icon", lambda: legacy_add_icon(frame, icon, 500, 600),
+         "icon, compositor", lambda: compositor.blend_sprite(frame, sprite, 500, 600)),
+        ("actor, legacy draw_actor", lambda: legacy_draw_actor(frame, actor, 190, 400, 0.5),
+         "actor, compositor", lambda: compositor.blend_constant(frame, actor, 190, 400, 0.5)),
+    ]
+    for old_label, old, new_label, new in cases:
+        old_time, old_peak = measure(old_label, old, args.repeat)
+        new_time, new_peak = measure(new_label, new, args.repeat)
+        print(f"{'':<32} {old_time / new_time:>9.1f}x faster, "
+              f"{old_peak / max(new_peak, 1):.0f}x less peak memory\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Speed/quality benchmark for the x264 encode profiles.
+
+Renders a reference short once with the OpenCV generator into a lossless
+RGB H.264 file (qp 0, which decodes much faster than FFV1), then encodes
+that reference under each profile and reports encode fps, file size and
+PSNR/SSIM against the lossless frames.
+
+Run from the repository root:
+    python -m benchmarks.bench_encode_profiles --duration 5 --fps 30
+"""
+import argparse
+import os
+import re
+import subprocess
+import time
+from Actor import Actor
+from Movie import Movie
+from encode_profiles import ENCODE_PROFILES
+from ffmpeg_pipe_encoder import FFmpegPipeEncoder, get_ffmpeg_binary
+
+LOSSLESS_PARAMS = ['-c:v', 'libx264rgb', '-qp', '0', '-preset', 'ultrafast', '-pix_fmt', 'bgr24']
+
+
+def render_reference(path, args):
+    from Main_opencv import OpenCVShortsGenerator
+    generator = OpenCVShortsGenerator(width=args.width, height=args.height,
+                                      duration=args.duration, fps=args.fps)
+    movies = [Movie(title, "2020", "$100M", "85%", "40%", "", poster_path=args.poster)
+              for title in ["Role Models", "Prestige", "Alien", "Red", "Moana"]]
+    actor = Actor("Dwayne Johnson", movies, args.actor)
+    descriptors = ["Critics Least Favorite", "Audience Least Favorite", "Most Successful",
+                   "Audience Favorite", "Critics Favorite"]
+    start = time.perf_counter()
+    with FFmpegPipeEncoder(path, generator.width, generator.height, generator.fps,
+                           ffmpeg_params=LOSSLESS_PARAMS, pixel_format='bgr24') as encoder:
+        for _, _, frame in generator.iter_frames(actor, list(zip(movies, descriptors))):
+            encoder.write(frame)
+    print(f"Rendered {encoder.frames_written} reference frames in {time.perf_counter() - start:.1f}s")
+    return encoder.frames_written
+
+
+def run_ffmpeg(args):
+    result = subprocess.run([get_ffmpeg_binary(), '-hide_banner', '-nostdin', '-y'] + args,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    log = result.stderr.decode(errors='replace')
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {log[-2000:]}")
+    return log
+
+
+def timed_ffmpeg(args):
+    start = time.perf_counter()
+    run_ffmpeg(args)
+    return time.perf_counter() - start
+
+
+def compare(encoded, reference, fps):
+    """(PSNR dB, SSIM) of encoded against reference"""
+    # Pair frames by number; the two containers round timestamps differently
+    align = f'settb=1/{fps},setpts=N'
+    log = run_ffmpeg(['-i', encoded, '-i', reference, '-lavfi',
+                      f'[0:v]{align},split[a0][a1];[1:v]{align},split[b0][b1];[a0][b0]psnr;[a1][b1]ssim',
+                      '-f', 'null', '-'])
+    psnr = re.search(r'PSNR .*average:(\S+)', log)
+    ssim = re.search(r'SSIM .*All:(\S+)', log)
+    return (float(psnr.group(1)) if psnr else float('nan'),
+            float(ssim.group(1)) if ssim else float('nan'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', nargs='+', choices=list(ENCODE_PROFILES), default=list(ENCODE_PROFILES))
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--width', type=int, default=1080)
+    parser.add_argument('--height', type=int, default=1920)
+    parser.add_argument('--poster', default='Aquaman.jpg')
+    parser.add_argument('--actor', default='Dwayne_Johnson.jpg')
+    parser.add_argument('--output-dir', default='benchmark_output')
+    parser.add_argument('--reuse-reference', action='store_true',
+                        help="Keep an existing reference.mkv instead of rendering it again")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    reference = os.path.join(args.output_dir, 'reference.mkv')
+    if args.reuse_reference and os.path.exists(reference):
+        n_frames = int(round(args.duration * args.fps))
+    else:
+        n_frames = render_reference(reference, args)
+
+    # Decoding the reference is part of every encode below, so report it separately
+    decode_seconds = timed_ffmpeg(['-i', reference, '-f', 'null', '-'])
+    print(f"Reference: {os.path.getsize(reference) / 1e6:.1f} MB lossless, "
+          f"decodes at {n_frames / decode_seconds:.0f} fps\n")
+
+    print(f"{'profile':<10} {'preset':<10} {'crf':>4} {'fps':>8} {'size':>10} {'kbit/s':>8} "
+          f"{'PSNR':>8} {'SSIM':>8}")
+    for name in args.profiles:
+        profile = ENCODE_PROFILES[name]
+        encoded = os.path.join(args.output_dir, f'{name}.mp4')
+        seconds = timed_ffmpeg(['-i', reference] + profile.ffmpeg_params(args.fps) + [encoded])
+        size = os.path.getsize(encoded)
+        psnr, ssim = compare(encoded, reference, args.fps)
+        print(f"{name:<10} {profile.preset:<10} {profile.crf:>4} {n_frames / seconds:>8.1f} "
+              f"{size / 1e6:>8.2f}MB {size * 8 / 1000 / args.duration:>8.0f} {psnr:>7.2f}dB {ssim:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Offline benchmark of the OMDB fetch layer against fake_omdb_server.
+
+Every scenario starts from an empty in-memory response cache and an empty
+poster store in a temporary directory, except "warm", which repeats the
+concurrent run on the caches it filled. Reports wall time, posters fetched
+and the requests the server saw:
+  - sequential:  PosterDownloader with one worker
+  - concurrent:  PosterDownloader with --workers workers
+  - warm:        the concurrent run again; nothing should reach the server
+  - getters:     genre, director and box office for every title via the
+                 get_*_from_omdb helpers, uncached and cached
+  - flaky:       concurrent run with --error-rate of requests failing with
+                 503, showing what the retries recover
+
+Run from the repository root:
+    python -m benchmarks.bench_omdb_fetch
+    python -m benchmarks.bench_omdb_fetch --titles 50 --latency 0.1 --error-rate 0.2
+"""
+import argparse
+import tempfile
+import time
+from typing import Any, Dict, List
+import omdb_api
+from fake_omdb_server import FakeOmdbServer, make_fixtures
+from omdb_cache import OmdbCache
+from poster_downloader import PosterDownloader
+from poster_store import PosterStore
+
+
+def run_downloads(server: FakeOmdbServer, titles: List[str], store: PosterStore,
+                  workers: int, args) -> Dict[str, Any]:
+    downloader = PosterDownloader(max_workers=workers, requests_per_second=args.requests_per_second,
+                                  backoff=args.backoff, store=store)
+    server.reset_stats()
+    start = time.perf_counter()
+    try:
+        results = downloader.download(titles)
+    finally:
+        downloader.close()
+    return {'seconds': time.perf_counter() - start,
+            'ok': sum(result.ok for result in results.values()),
+            **server.stats}
+
+
+def run_getters(server: FakeOmdbServer, titles: List[str]) -> Dict[str, Any]:
+    server.reset_stats()
+    start = time.perf_counter()
+    for title in titles:
+        omdb_api.get_genre_from_omdb(omdb_api.Master_api_key, title)
+        omdb_api.get_director_from_omdb(omdb_api.Master_api_key, title)
+        omdb_api.get_box_office_from_omdb(omdb_api.Master_api_key, title)
+    return {'seconds': time.perf_counter() - start, 'ok': len(titles), **server.stats}
+
+
+def scenarios(args) -> Dict[str, Dict[str, Any]]:
+    fixtures = make_fixtures(args.titles)
+    titles = [fixture['Title'] for fixture in fixtures]
+    results = {}
+    with FakeOmdbServer(fixtures, latency=args.latency, jitter=args.jitter, seed=args.seed) as server, \
+            tempfile.TemporaryDirectory() as directory:
+        omdb_api.set_base_url(server.url)
+
+        omdb_api.set_cache(OmdbCache(':memory:'))
+        results['sequential'] = run_downloads(server, titles, PosterStore(f"{directory}/seq"), 1, args)
+
+        omdb_api.set_cache(OmdbCache(':memory:'))
+        store = PosterStore(f"{directory}/concurrent")
+        results['concurrent'] = run_downloads(server, titles, store, args.workers, args)
+        results['warm'] = run_downloads(server, titles, store, args.workers, args)
+
+        omdb_api.set_cache(None)
+        results['getters uncached'] = run_getters(server, titles)
+        omdb_api.set_cache(OmdbCache(':memory:'))
+        results['getters cached'] = run_getters(server, titles)
+
+        server.error_rate = args.error_rate
+        omdb_api.set_cache(OmdbCache(':memory:'))
+        results['flaky'] = run_downloads(server, titles, PosterStore(f"{directory}/flaky"),
+                                         args.workers, args)
+    omdb_api.set_base_url(omdb_api.DEFAULT_BASE_URL)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.1, help="Seconds per request")
+    parser.add_argument('--jitter', type=float, default=0.05)
+    parser.add_argument('--error-rate', type=float, default=0.2, help="503 rate of the flaky run")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--requests-per-second', type=float, default=0,
+                        help="Downloader rate limit; the fake server is a single host")
+    parser.add_argument('--backoff', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = scenarios(args)
+    print(f"{args.titles} titles, {args.latency * 1000:.0f} ms latency, {args.workers} workers")
+    print(f"{'scenario':<18} {'seconds':>8} {'ok':>5} {'requests':>9} {'lookups':>8} "
+          f"{'posters':>8} {'503s':>6}")
+    for name, row in results.items():
+        print(f"{name:<18} {row['seconds']:>8.2f} {row['ok']:>5} {row['requests']:>9} "
+              f"{row['lookups']:>8} {row['posters']:>8} {row['errors_injected']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""End-to-end render benchmark for both shorts generators.
+
+Renders the sample actor from the generators' __main__ blocks offline,
+with every poster served from a local image instead of OMDB, and measures
+for each renderer:
+  - frames/s per phase type, iterating frames the way the encoders do
+  - per-frame allocation peak (tracemalloc) and retained memory blocks
+  - peak RSS of the process
+  - wall time of a complete generate_video encode
+
+Each renderer runs in a fresh process so RSS and caches don't leak between
+them. Results are saved as <commit>.json in the results directory, and
+--compare prints the change against an earlier run.
+
+Run from the repository root:
+    python -m benchmarks.bench_render
+    python -m benchmarks.bench_render --compare 1a9d159
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from Actor import Actor
+from Movie import Movie
+from render_timeline import frame_times
+
+RENDERERS = ('pil', 'opencv')
+
+
+def sample_short(poster: str, portrait: str) -> Tuple[Actor, List[Tuple[Movie, str]]]:
+    """The __main__ sample actor, with every poster read from one local file"""
+    movies = [
+        Movie("role models", "2024", "$100M", "85%", "90%", "", poster_path=poster),
+        Movie("Prestige", "2023", "$150M", "75%", "30%", "", poster_path=poster),
+        Movie("Alien", "2022", "$200M", "95%", "100%", "", poster_path=poster),
+        Movie("Red", "2021", "$120M", "41%", "85%", "", poster_path=poster),
+        Movie("Moana", "2020", "$180M", "90%", "95%", "", poster_path=poster),
+    ]
+    actor = Actor("Dwayne Johnson", movies, portrait)
+    descriptors = ["Critics Least Favorite", "Audience Least Favorite", "Most Successful",
+                   "Audience Favorite", "Critics Favorite"]
+    return actor, list(zip(movies, descriptors))
+
+
+def build_generator(renderer: str, args: Dict[str, Any]):
+    settings = dict(duration=args['duration'], fps=args['fps'],
+                    title_phase_percentage=args['title_phase_percentage'])
+    if renderer == 'pil':
+        from animated_shorts_generator import ShortsGenerator
+        generator = ShortsGenerator(**settings)
+        with open(args['poster'], 'rb') as f:
+            poster_data = f.read()
+        # Posters come from the local file instead of OMDB
+        generator.poster_cache.fetch = lambda movie: poster_data
+        return generator
+    from Main_opencv import OpenCVShortsGenerator
+    return OpenCVShortsGenerator(**settings)
+
+
+def phase_types(generator) -> List[str]:
+    n_frames = len(frame_times(generator.duration, generator.fps))
+    indices, _ = generator.breakpoints.phases_for_frames(n_frames, generator.fps)
+    return [generator.breakpoints[i].type for i in indices.tolist()]
+
+
+def measure_fps(generator, actor, movies_with_descriptors) -> Dict[str, Dict[str, float]]:
+    """Frames/s per phase type, rendering in the calling thread"""
+    phases = phase_types(generator)
+    seconds: Dict[str, float] = {}
+    frames: Dict[str, int] = {}
+    last = time.perf_counter()
+    for index, _, _ in generator.iter_frames(actor, movies_with_descriptors, prefetch=0):
+        now = time.perf_counter()
+        phase = phases[index]
+        seconds[phase] = seconds.get(phase, 0.0) + now - last
+        frames[phase] = frames.get(phase, 0) + 1
+        last = now
+    results = {phase: {'frames': frames[phase], 'seconds': seconds[phase],
+                       'fps': frames[phase] / seconds[phase] if seconds[phase] else float('inf')}
+               for phase in frames}
+    total_seconds = sum(seconds.values())
+    results['all'] = {'frames': len(phases), 'seconds': total_seconds,
+                      'fps': len(phases) / total_seconds}
+    return results
+
+
+def measure_allocations(generator, actor, movies_with_descriptors, stride: int) -> Dict[str, Any]:
+    """Per-frame tracemalloc peak for every stride-th frame, after one warm-up frame per phase.
+
+    Python can't count allocation events cheaply, so this reports how much
+    memory a frame allocates at its peak and how many blocks stay allocated.
+    Pillow allocates image buffers outside Python's allocator, so only NumPy
+    and Python objects show up for the PIL renderer.
+    """
+    times = frame_times(generator.duration, generator.fps)
+    phases = phase_types(generator)
+    sample = list(range(0, len(times), max(1, stride)))
+    # Warm caches first so the numbers show steady-state rendering
+    for phase in set(phases):
+        index = phases.index(phase)
+        generator.create_frame(actor, movies_with_descriptors, times[index] / generator.duration)
+
+    peaks: Dict[str, List[int]] = {}
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        for index in sample:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            frame = generator.create_frame(actor, movies_with_descriptors, times[index] / generator.duration)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.setdefault(phases[index], []).append(peak - base)
+            del frame
+        traced_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    results = {phase: {'frames': len(values), 'mean_mb': float(np.mean(values)) / 1e6,
+                       'max_mb': float(np.max(values)) / 1e6}
+               for phase, values in peaks.items()}
+    results['retained_blocks'] = sys.getallocatedblocks() - blocks_before
+    results['traced_peak_mb'] = traced_peak / 1e6
+    return results
+
+
+def measure_encode(generator, actor, movies_with_descriptors, profile: str) -> float:
+    """Wall time of a full generate_video through the ffmpeg pipe"""
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = os.path.join(directory, 'bench.mp4')
+        start = time.perf_counter()
+        generator.generate_video(actor, movies_with_descriptors, output_path,
+                                 encoder='ffmpeg', profile=profile)
+        return time.perf_counter() - start
+
+
+def run_renderer(renderer: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    """Every measurement for one renderer; runs in its own process"""
+    actor, movies_with_descriptors = sample_short(args['poster'], args['portrait'])
+    results: Dict[str, Any] = {}
+    generator = build_generator(renderer, args)
+    results['fps'] = measure_fps(generator, actor, movies_with_descriptors)
+    if args['alloc_stride']:
+        results['allocations'] = measure_allocations(build_generator(renderer, args), actor,
+                                                     movies_with_descriptors, args['alloc_stride'])
+    if not args['skip_encode']:
+        results['encode_seconds'] = measure_encode(build_generator(renderer, args), actor,
+                                                   movies_with_descriptors, args['profile'])
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results['peak_rss_mb'] = maxrss / (1e6 if sys.platform == 'darwin' else 1e3)
+    return results
+
+
+def current_commit() -> str:
+    """Short hash of HEAD, marked -dirty when tracked files have changes"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def summary(run: Dict[str, Any]) -> Dict[Tuple[str, str], float]:
+    """Flat {(renderer, metric): value} view of a results file, for comparisons"""
+    rows = {}
+    for renderer, results in run['renderers'].items():
+        for phase, row in results['fps'].items():
+            rows[(renderer, f"fps {phase}")] = row['fps']
+        for phase, row in results.get('allocations', {}).items():
+            if isinstance(row, dict):
+                rows[(renderer, f"alloc MB/frame {phase}")] = row['mean_mb']
+        if 'allocations' in results:
+            rows[(renderer, "retained blocks")] = results['allocations']['retained_blocks']
+        if 'encode_seconds' in results:
+            rows[(renderer, "encode wall s")] = results['encode_seconds']
+        rows[(renderer, "peak RSS MB")] = results['peak_rss_mb']
+    return rows
+
+
+def print_results(run: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    current = summary(run)
+    previous = summary(baseline) if baseline else {}
+    header = f"{'renderer':<8} {'metric':<30} {run['commit']:>14}"
+    if baseline:
+        header += f" {baseline['commit']:>14} {'change':>8}"
+    print(header)
+    for (renderer, metric), value in current.items():
+        line = f"{renderer:<8} {metric:<30} {value:>14.3f}"
+        if baseline:
+            old = previous.get((renderer, metric))
+            if old is None:
+                line += f" {'-':>14} {'':>8}"
+            else:
+                change = f"{(value - old) / old * 100:+.1f}%" if old else ""
+                line += f" {old:>14.3f} {change:>8}"
+        print(line)
+
+
+def load_run(reference: str, results_dir: str) -> Dict[str, Any]:
+    """A saved run by path or by (a prefix of) its commit"""
+    if os.path.exists(reference):
+        path = reference
+    else:
+        matches = sorted(name for name in os.listdir(results_dir)
+                         if name.startswith(reference) and name.endswith('.json'))
+        if not matches:
+            raise SystemExit(f"No saved benchmark run for {reference} in {results_dir}")
+        path = os.path.join(results_dir, matches[-1])
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--renderers', nargs='+', choices=RENDERERS, default=list(RENDERERS))
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--title-phase-percentage', type=float, default=30)
+    parser.add_argument('--poster', default='Aquaman.jpg')
+    parser.add_argument('--portrait', default='Dwayne_Johnson.jpg')
+    parser.add_argument('--profile', default='fast', help="Encode profile for the wall time run")
+    parser.add_argument('--alloc-stride', type=int, default=10,
+                        help="Trace allocations for every Nth frame; 0 skips the allocation pass")
+    parser.add_argument('--skip-encode', action='store_true')
+    parser.add_argument('--results-dir', default='benchmark_results')
+    parser.add_argument('--compare', help="Commit or results file to compare against")
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args()
+
+    settings = {key: getattr(args, key) for key in (
+        'duration', 'fps', 'title_phase_percentage', 'poster', 'portrait', 'profile',
+        'alloc_stride', 'skip_encode')}
+    run = {
+        'commit': current_commit(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': settings,
+        'renderers': {},
+    }
+    for renderer in args.renderers:
+        print(f"Benchmarking {renderer}...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            run['renderers'][renderer] = pool.submit(run_renderer, renderer, settings).result()
+
+    baseline = load_run(args.compare, args.results_dir) if args.compare else None
+    if baseline and baseline.get('settings') != settings:
+        print("Warning: the baseline was run with different settings")
+    print_results(run, baseline)
+
+    if not args.no_save:
+        os.makedirs(args.results_dir, exist_ok=True)
+        path = os.path.join(args.results_dir, f"{run['commit']}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
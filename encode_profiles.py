@@ -0,0 +1,70 @@
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+
+@dataclass(frozen=True)
+class EncodeProfile:
+    """Named x264 settings for encoding a short.
+
+    Quality is set by CRF alone; a VBV cap (maxrate) is only added where the
+    upload target needs one. The shorts are flat synthetic graphics, so x264
+    is tuned for animation and keyframes are spaced by time rather than frames.
+    """
+    name: str
+    preset: str
+    crf: int
+    tune: Optional[str] = 'animation'
+    keyint_seconds: float = 2.0
+    maxrate: Optional[str] = None
+    profile: str = 'high'
+    level: str = '4.2'
+    # Fixed x264 thread count; by default it is derived from os.cpu_count()
+    thread_count: Optional[int] = None
+
+    def threads(self, workers: int = 1) -> int:
+        """Encoder threads, sharing the machine's cores between parallel workers"""
+        if self.thread_count:
+            return self.thread_count
+        return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+    def keyint(self, fps: float) -> int:
+        return max(1, int(round(fps * self.keyint_seconds)))
+
+    def ffmpeg_params(self, fps: float, workers: int = 1) -> List[str]:
+        """ffmpeg output options for this profile"""
+        params = ['-c:v', 'libx264', '-preset', self.preset, '-crf', str(self.crf)]
+        if self.tune:
+            params += ['-tune', self.tune]
+        params += ['-g', str(self.keyint(fps)), '-keyint_min', str(max(1, self.keyint(fps) // 2))]
+        if self.maxrate:
+            params += ['-maxrate', self.maxrate, '-bufsize', f"{int(self.maxrate[:-1]) * 2}k"]
+        params += [
+            '-pix_fmt', 'yuv420p',  # Required for compatibility
+            '-movflags', '+faststart',  # Enable streaming
+            '-profile:v', self.profile,
+            '-level', self.level,
+            '-threads', str(self.threads(workers)),
+        ]
+        return params
+
+
+ENCODE_PROFILES: Dict[str, EncodeProfile] = {
+    # Quick look at timing and layout; long GOPs and no lookahead to speak of
+    'draft': EncodeProfile('draft', preset='ultrafast', crf=30, keyint_seconds=10.0),
+    # Everyday renders that still look clean
+    'fast': EncodeProfile('fast', preset='veryfast', crf=23),
+    # Upload quality, capped at the bitrate the old fixed settings used
+    'publish': EncodeProfile('publish', preset='slow', crf=18, maxrate='15000k'),
+}
+
+
+def get_encode_profile(profile: Union[str, EncodeProfile]) -> EncodeProfile:
+    """Look up a profile by name, passing EncodeProfile instances through"""
+    if isinstance(profile, EncodeProfile):
+        return profile
+    try:
+        return ENCODE_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown encode profile: {profile} "
+                         f"(choose from {', '.join(ENCODE_PROFILES)})") from None
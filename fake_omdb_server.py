@@ -0,0 +1,262 @@
+"""Local stand-in for the OMDB API, for offline tests and benchmarks.
+
+Serves OMDB-style JSON for a set of fixture movies, plus a poster image
+for each, with configurable latency and a rate of injected server errors.
+Point omdb_api at it with set_base_url(server.url) or the OMDB_BASE_URL
+environment variable.
+
+    with FakeOmdbServer(make_fixtures(50), latency=0.05) as server:
+        omdb_api.set_base_url(server.url)
+        ...
+
+Or run it standalone:
+    python fake_omdb_server.py --port 8765 --latency 0.1 --error-rate 0.05
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlsplit
+from PIL import Image, ImageDraw
+from omdb_cache import normalize_title
+
+SAMPLE_TITLES = ["Role Models", "The Prestige", "Alien", "Red", "Moana"]
+
+
+def make_fixtures(titles: Union[int, List[str]] = SAMPLE_TITLES) -> List[Dict[str, Any]]:
+    """OMDB-style responses for titles, or for that many generated titles"""
+    if isinstance(titles, int):
+        titles = [f"Fixture Movie {i + 1}" for i in range(titles)]
+    fixtures = []
+    for i, title in enumerate(titles):
+        fixtures.append({
+            'Title': title, 'Year': str(1980 + i % 45), 'Rated': 'PG-13',
+            'Released': '01 Jan 2000', 'Runtime': f"{90 + i % 60} min",
+            'Genre': 'Action, Comedy', 'Director': 'Jane Doe', 'Writer': 'John Doe',
+            'Actors': 'Dwayne Johnson, Jane Doe', 'Plot': f"The plot of {title}.",
+            'Language': 'English', 'Country': 'United States', 'Awards': 'N/A',
+            'Ratings': [{'Source': 'Internet Movie Database', 'Value': '7.0/10'},
+                        {'Source': 'Rotten Tomatoes', 'Value': f"{40 + i % 60}%"}],
+            'Metascore': '70', 'imdbRating': '7.0', 'imdbVotes': f"{(i + 1) * 1234:,}",
+            'imdbID': f"tt{9000000 + i:07d}", 'Type': 'movie', 'DVD': 'N/A',
+            'BoxOffice': f"${(i + 1) * 1000000:,}", 'Production': 'N/A', 'Website': 'N/A',
+            'Response': 'True',
+        })
+    return fixtures
+
+
+def load_fixtures(path: str) -> List[Dict[str, Any]]:
+    """Fixtures from a JSON list of OMDB responses.
+
+    Each entry needs a Title; imdbID is generated if missing. An optional
+    PosterFile is served as that movie's poster instead of a generated one.
+    """
+    with open(path, encoding='utf-8') as f:
+        fixtures = json.load(f)
+    for i, fixture in enumerate(fixtures):
+        fixture.setdefault('imdbID', f"tt{8000000 + i:07d}")
+        fixture.setdefault('Response', 'True')
+    return fixtures
+
+
+def make_poster(title: str, size=(300, 445)) -> bytes:
+    """A JPEG poster in a colour derived from title, with the title on it"""
+    colour = tuple(hashlib.md5(title.encode()).digest()[:3])
+    image = Image.new('RGB', size, colour)
+    ImageDraw.Draw(image).text((10, size[1] // 2), title, fill=(255, 255, 255))
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', quality=85)
+    return buffer.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: '_Server'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        fake = self.server.fake
+        url = urlsplit(self.path)
+        fake.count('requests')
+        fake.wait()
+        if fake.inject_error():
+            fake.count('errors_injected')
+            self.send_body(fake.error_status, b'', 'text/plain')
+            return
+        if url.path.startswith('/posters/'):
+            data = fake.poster(url.path[len('/posters/'):].rsplit('.', 1)[0])
+            if data is None:
+                self.send_body(404, b'', 'text/plain')
+            else:
+                fake.count('posters')
+                self.send_body(200, data, 'image/jpeg')
+            return
+        status, body = fake.lookup({key: values[0] for key, values in parse_qs(url.query).items()})
+        self.send_body(status, json.dumps(body).encode(), 'application/json')
+
+    def send_body(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: 'FakeOmdbServer'
+
+
+class FakeOmdbServer:
+    """OMDB API stand-in on a local port, served from a background thread.
+
+    Args:
+        fixtures: OMDB responses to serve, by default make_fixtures()
+        latency: Seconds every request waits before it is answered
+        jitter: Up to this many extra seconds of random wait per request
+        error_rate: Fraction of requests answered with error_status instead
+        error_status: HTTP status of injected errors
+        api_key: Key requests must pass as apikey; None accepts any
+        seed: Seed of the latency and error randomness
+        port: Port to listen on; 0 picks a free one
+    """
+
+    def __init__(self, fixtures: Optional[List[Dict[str, Any]]] = None, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, error_status: int = 503,
+                 api_key: Optional[str] = None, seed: int = 0, host: str = '127.0.0.1',
+                 port: int = 0):
+        self.fixtures = make_fixtures() if fixtures is None else fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.api_key = api_key
+        self.by_title = {normalize_title(f['Title']): f for f in self.fixtures}
+        self.by_id = {f['imdbID'].lower(): f for f in self.fixtures}
+        self.stats = {'requests': 0, 'lookups': 0, 'posters': 0, 'not_found': 0,
+                      'errors_injected': 0}
+        self._posters: Dict[str, bytes] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> 'FakeOmdbServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-omdb",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve from the calling thread until interrupted"""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'FakeOmdbServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def wait(self):
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def inject_error(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def lookup(self, params: Dict[str, str]):
+        """(status, body) OMDB would answer for the query params"""
+        if self.api_key is not None and params.get('apikey') != self.api_key:
+            return 401, {'Response': 'False', 'Error': 'Invalid API key!'}
+        self.count('lookups')
+        if 'i' in params:
+            fixture = self.by_id.get(params['i'].strip().lower())
+            error = 'Incorrect IMDb ID.'
+        else:
+            fixture = self.by_title.get(normalize_title(params.get('t', '')))
+            error = 'Movie not found!'
+        if fixture is None:
+            self.count('not_found')
+            return 200, {'Response': 'False', 'Error': error}
+        body = {key: value for key, value in fixture.items() if key != 'PosterFile'}
+        if body.get('Poster') != 'N/A':
+            body['Poster'] = f"{self.url}posters/{fixture['imdbID']}.jpg"
+        return 200, body
+
+    def poster(self, imdb_id: str) -> Optional[bytes]:
+        """Poster bytes for imdb_id, generated or read once and then reused"""
+        if not re.fullmatch(r'tt\d+', imdb_id):
+            return None
+        with self._lock:
+            if imdb_id not in self._posters:
+                fixture = self.by_id.get(imdb_id.lower())
+                if fixture is None:
+                    return None
+                if fixture.get('PosterFile'):
+                    with open(fixture['PosterFile'], 'rb') as f:
+                        self._posters[imdb_id] = f.read()
+                else:
+                    self._posters[imdb_id] = make_poster(fixture['Title'])
+            return self._posters[imdb_id]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake OMDB API locally")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', help="JSON list of OMDB responses; defaults to sample titles")
+    parser.add_argument('--titles', type=int, help="Serve this many generated titles instead")
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)
+    else:
+        fixtures = make_fixtures(args.titles or SAMPLE_TITLES)
+    server = FakeOmdbServer(fixtures, latency=args.latency, jitter=args.jitter,
+                            error_rate=args.error_rate, port=args.port)
+    print(f"Serving {len(fixtures)} movies at {server.url}")
+    print(f"export OMDB_BASE_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import os
+import subprocess
+import tempfile
+from typing import List, Optional, Union
+import numpy as np
+from PIL import Image
+
+
+def get_ffmpeg_binary() -> str:
+    """Return the ffmpeg executable MoviePy is configured with"""
+    try:
+        from moviepy.config import get_setting
+        return get_setting("FFMPEG_BINARY")
+    except Exception:
+        return "ffmpeg"
+
+
+class FFmpegPipeEncoder:
+    """Encodes frames by writing raw video straight into an ffmpeg process.
+
+    Frames are PIL images or HxWx3 uint8 arrays in pixel_format order
+    ('rgb24' for PIL/MoviePy frames, 'bgr24' for OpenCV frames). Contiguous
+    uint8 arrays are written without copying; anything else is converted
+    through one reusable buffer. An optional audio file is muxed in the
+    same ffmpeg invocation.
+    """
+
+    def __init__(self, output_path: str, width: int, height: int, fps: float,
+                 ffmpeg_params: Optional[List[str]] = None,
+                 audio_path: Optional[str] = None, audio_volume_db: float = 0,
+                 duration: Optional[float] = None, pixel_format: str = 'rgb24',
+                 ffmpeg_binary: Optional[str] = None):
+        self.output_path = output_path
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.ffmpeg_params = ffmpeg_params if ffmpeg_params is not None else ['-c:v', 'libx264', '-pix_fmt', 'yuv420p']
+        self.audio_path = audio_path
+        self.audio_volume_db = audio_volume_db
+        self.duration = duration
+        self.pixel_format = pixel_format
+        self.ffmpeg_binary = ffmpeg_binary or get_ffmpeg_binary()
+        self.frames_written = 0
+        self._buffer = np.empty((height, width, 3), dtype=np.uint8)
+        self._process: Optional[subprocess.Popen] = None
+        self._log = None
+
+    def build_command(self) -> List[str]:
+        cmd = [
+            self.ffmpeg_binary, '-y', '-hide_banner', '-loglevel', 'error',
+            '-f', 'rawvideo',
+            '-pix_fmt', self.pixel_format,
+            '-s', f'{self.width}x{self.height}',
+            '-r', f'{self.fps}',
+            '-i', '-',
+        ]
+        if self.audio_path:
+            cmd += ['-i', self.audio_path, '-map', '0:v:0', '-map', '1:a:0',
+                    '-c:a', 'aac', '-shortest']
+            if self.audio_volume_db:
+                cmd += ['-af', f'volume={self.audio_volume_db}dB']
+        if self.duration is not None:
+            cmd += ['-t', f'{self.duration}']
+        return cmd + self.ffmpeg_params + [self.output_path]
+
+    def open(self):
+        self._log = tempfile.TemporaryFile()
+        self._process = subprocess.Popen(self.build_command(), stdin=subprocess.PIPE,
+                                         stdout=subprocess.DEVNULL, stderr=self._log)
+        return self
+
+    def write(self, frame: Union[Image.Image, np.ndarray]):
+        if isinstance(frame, Image.Image):
+            data = frame.tobytes()
+        elif (frame.dtype == np.uint8 and frame.shape == self._buffer.shape
+              and frame.flags['C_CONTIGUOUS']):
+            data = memoryview(frame)
+        else:
+            np.copyto(self._buffer, frame, casting='unsafe')
+            data = memoryview(self._buffer)
+        try:
+            self._process.stdin.write(data)
+        except BrokenPipeError:
+            self.close()
+            raise
+        self.frames_written += 1
+
+    def close(self):
+        """Finish the encode, raising if ffmpeg reported an error"""
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = process.wait()
+        self._log.seek(0)
+        errors = self._log.read().decode(errors='replace').strip()
+        self._log.close()
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg exited with code {returncode}: {errors}")
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._process is not None:
+            self._process.kill()
+            try:
+                self.close()
+            except (RuntimeError, OSError):
+                pass
+        return False
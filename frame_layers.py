@@ -0,0 +1,33 @@
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from PIL import Image
+
+
+class FrameLayerCache:
+    """Pre-rendered static frame layers, keyed by breakpoint phase.
+
+    A layer holds everything that stays put for the whole phase (background,
+    clue counter, rows, settled posters). Layers belong to one set of render
+    inputs; binding a different actor or movie list drops them.
+    """
+
+    def __init__(self):
+        self._layers: Dict[Hashable, Image.Image] = {}
+        self._inputs: Optional[Tuple[Any, ...]] = None
+
+    def bind(self, *inputs: Any) -> None:
+        """Drop cached layers if the render inputs changed since the last call"""
+        if self._inputs != inputs:
+            self._layers.clear()
+            self._inputs = inputs
+
+    def get(self, key: Hashable, render: Callable[[], Image.Image]) -> Image.Image:
+        """Return the layer for key, rendering it on first use"""
+        layer = self._layers.get(key)
+        if layer is None:
+            layer = render()
+            self._layers[key] = layer
+        return layer
+
+    def clear(self) -> None:
+        self._layers.clear()
+        self._inputs = None
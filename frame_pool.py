@@ -0,0 +1,54 @@
+from typing import List, Tuple
+import numpy as np
+from PIL import Image
+
+
+class FramePool:
+    """Fixed ring of preallocated BGR frames for the OpenCV renderer.
+
+    acquire() hands out the next buffer of the ring, reset to the cached
+    background with np.copyto, so steady-state rendering allocates no frames.
+    A frame stays valid until `size` more frames have been acquired, so
+    consumers must encode or copy it before then.
+    """
+
+    def __init__(self, size: int, width: int, height: int, background_color: Tuple[int, int, int]):
+        if size < 1:
+            raise ValueError("FramePool needs at least one frame")
+        self.background = np.empty((height, width, 3), dtype=np.uint8)
+        self.background[:] = background_color
+        self.frames: List[np.ndarray] = [np.empty_like(self.background) for _ in range(size)]
+        self.position = 0
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def acquire(self) -> np.ndarray:
+        frame = self.frames[self.position]
+        self.position = (self.position + 1) % len(self.frames)
+        np.copyto(frame, self.background)
+        return frame
+
+
+class ImageFramePool:
+    """Fixed ring of preallocated PIL frames, the PIL counterpart of FramePool.
+
+    acquire(layer) pastes a cached layer into the next frame in place instead
+    of copying the layer into a new image.
+    """
+
+    def __init__(self, size: int, width: int, height: int, background_color: Tuple[int, int, int]):
+        if size < 1:
+            raise ValueError("ImageFramePool needs at least one frame")
+        self.frames: List[Image.Image] = [Image.new('RGB', (width, height), background_color)
+                                          for _ in range(size)]
+        self.position = 0
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def acquire(self, layer: Image.Image) -> Image.Image:
+        frame = self.frames[self.position]
+        self.position = (self.position + 1) % len(self.frames)
+        frame.paste(layer)
+        return frame
@@ -0,0 +1,56 @@
+from typing import Any, Callable, List, Optional, Tuple
+
+Size = Tuple[int, int]
+
+
+class ImagePyramid:
+    """A decoded image plus successively downscaled copies of it.
+
+    Scaling to any size starts from the smallest level that still covers the
+    requested size, so the final resize never shrinks by more than one level.
+    Works for PIL images and NumPy arrays alike; the caller supplies the
+    resize functions.
+    """
+
+    def __init__(self, image: Any, size: Size, resize: Callable[[Any, Size], Any],
+                 reduce: Optional[Callable[[Any, Size], Any]] = None,
+                 scale: float = 0.5, min_size: int = 32):
+        """
+        Args:
+            image: Full resolution image, level 0 of the pyramid
+            size: (width, height) of image
+            resize: Final resize used for every requested size
+            reduce: Resize used to build each level, defaults to resize
+            scale: Size of each level relative to the one above it
+            min_size: Stop adding levels once either side would drop below this
+        """
+        self.resize_image = resize
+        reduce = reduce or resize
+        self.levels: List[Tuple[Size, Any]] = [(size, image)]
+        width, height = size
+        while int(width * scale) >= min_size and int(height * scale) >= min_size:
+            width, height = int(width * scale), int(height * scale)
+            image = reduce(image, (width, height))
+            self.levels.append(((width, height), image))
+
+    @property
+    def size(self) -> Size:
+        return self.levels[0][0]
+
+    def level_for(self, width: int, height: int) -> Tuple[Size, Any]:
+        """Smallest level at least (width, height); the original when upscaling"""
+        for level_size, image in reversed(self.levels):
+            if level_size[0] >= width and level_size[1] >= height:
+                return level_size, image
+        return self.levels[0]
+
+    def resize(self, width: int, height: int) -> Any:
+        """The image at (width, height), resized from the nearest level.
+
+        The returned image may be one of the pyramid levels, so callers must
+        not modify it in place.
+        """
+        level_size, image = self.level_for(width, height)
+        if level_size == (width, height):
+            return image
+        return self.resize_image(image, (width, height))
@@ -1,4 +1,5 @@
 
+import copy
 from dataclasses import dataclass
 from typing import Tuple
 
@@ -8,6 +9,8 @@ class LayoutConfig:
         # Base dimensions
         self.width = width
         self.height = height
+        # Size relative to the full-size layout; see scaled()
+        self.scale = 1.0
         
         # Layout measurements
         self.row_height = 320
@@ -43,4 +46,30 @@ class LayoutConfig:
             ("FILM FAN (4-6 Clues)", (4, 6)),
             ("CASUAL VIEWER (7-9 Clues)", (7, 9)),
             ("MOVIE NOVICE (10+ Clues)", (10, 11))
-        ]
\ No newline at end of file
+        ]
+
+    # Pixel measurements that scaled() shrinks along with the frame
+    SCALED_FIELDS = ('row_height', 'poster_width', 'margin', 'padding', 'icon_size',
+                     'vertical_spacing', 'actor_start_size', 'clue_counter_size',
+                     'movie_title_size', 'score_size', 'box_office_size', 'descriptor_size',
+                     'actor_name_size', 'actor_comment_size')
+
+    def px(self, value) -> int:
+        """A full-size pixel measurement at this layout's scale, at least 1"""
+        return max(1, int(round(value * self.scale)))
+
+    def scaled(self, scale: float) -> 'LayoutConfig':
+        """Copy of this layout with every measurement multiplied by scale.
+
+        Frame dimensions are rounded to even numbers for yuv420p encoding.
+        A scale of 1 returns an identical copy.
+        """
+        config = copy.copy(self)
+        if scale == 1:
+            return config
+        config.width = max(2, int(round(self.width * scale / 2)) * 2)
+        config.height = max(2, int(round(self.height * scale / 2)) * 2)
+        config.scale = self.scale * scale
+        for name in self.SCALED_FIELDS:
+            setattr(config, name, max(1, int(round(getattr(self, name) * scale))))
+        return config
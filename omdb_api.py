@@ -1,51 +1,143 @@
 import requests
 import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+from omdb_cache import OmdbCache, imdb_key, title_key
+from omdb_record import OmdbRecord
 Master_api_key = '66f234c0'
-def download_movie_posters_omdb(movie_titles, output_folder,api_key=Master_api_key):
-    # Create the output folder if it doesn't exist
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
+DEFAULT_BASE_URL = "http://www.omdbapi.com/"
+# Point OMDB_BASE_URL (or set_base_url) at fake_omdb_server to run without omdbapi.com
+BASE_URL = os.environ.get('OMDB_BASE_URL', DEFAULT_BASE_URL)
+# Answers for movies OMDB doesn't have; other errors (bad key, quota) are never cached
+NOT_FOUND_ERRORS = ('Movie not found!', 'Incorrect IMDb ID.')
+
+_cache: Optional[OmdbCache] = None
+_cache_enabled = True
+# Lookups being fetched right now, by cache key, so concurrent callers share one request
+_in_flight: Dict[str, Future] = {}
+_in_flight_lock = threading.Lock()
+
+
+def get_cache() -> Optional[OmdbCache]:
+    """The response cache every lookup goes through, opened on first use"""
+    global _cache
+    if _cache is None and _cache_enabled:
+        _cache = OmdbCache()
+    return _cache
+
+
+def set_cache(cache: Optional[OmdbCache]):
+    """Use cache for all lookups, or pass None to always query OMDB"""
+    global _cache, _cache_enabled
+    _cache = cache
+    _cache_enabled = cache is not None
+
+
+def set_base_url(url: str):
+    """Send every lookup to url, for example a local fake_omdb_server"""
+    global BASE_URL
+    BASE_URL = url
+
+
+def lookup_movie(movie_title: Optional[str] = None, api_key: str = Master_api_key,
+                 imdb_id: Optional[str] = None, session=None) -> Optional[Dict[str, Any]]:
+    """
+    Raw OMDB response for a title or imdbID, served from the cache when possible.
+
+    Requests go through session, anything with a requests-style get(); by
+    default the shared pooled session of poster_downloader.
+
+    Returns:
+        dict: The response, including Response 'False' answers for unknown movies
+        None: If the request failed
+    """
+    # Responses from any other server are cached apart from the real ones
+    scope = '' if BASE_URL == DEFAULT_BASE_URL else BASE_URL
+    key = scope + (imdb_key(imdb_id) if imdb_id else title_key(movie_title))
+    cache = get_cache()
+    if cache is not None:
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        leader = future is None
+        if leader:
+            future = _in_flight[key] = Future()
+    if leader:
+        try:
+            future.set_result(_fetch_movie(key, scope, movie_title, api_key, imdb_id, cache, session))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with _in_flight_lock:
+                del _in_flight[key]
+    data = future.result()
+    # Each caller gets its own dict, as get_movie_data edits the one it's given
+    return dict(data) if data is not None else None
+
+
+def _fetch_movie(key: str, scope: str, movie_title: Optional[str], api_key: str,
+                 imdb_id: Optional[str], cache: Optional[OmdbCache],
+                 session=None) -> Optional[Dict[str, Any]]:
+    if session is None:
+        from poster_downloader import get_default_downloader
+        session = get_default_downloader()
+    params = {'apikey': api_key, 'r': 'json'}
+    if imdb_id:
+        params['i'] = imdb_id
+    else:
+        params['t'] = movie_title
+    try:
+        response = session.get(BASE_URL, params=params)
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching data for {imdb_id or movie_title}: {e}")
+        return None
+    if response.status_code != 200:
+        print(f"Error fetching data: {response.status_code} - {response.text}")
+        return None
+    try:
+        data = response.json()
+    except ValueError:
+        print(f"Error decoding JSON for movie: {imdb_id or movie_title}")
+        return None
+
+    if cache is not None and (data.get('Response') == 'True' or data.get('Error') in NOT_FOUND_ERRORS):
+        cache.put(data, key, scope=scope)
+    return data
+
 
-    base_url = "http://www.omdbapi.com/"
+def get_movie_record(movie_title: Optional[str] = None, api_key: str = Master_api_key,
+                     imdb_id: Optional[str] = None) -> Optional[OmdbRecord]:
+    """
+    Every OMDB field for a movie from a single lookup.
+
+    Returns:
+        OmdbRecord: The parsed response
+        None: If the movie wasn't found or the request failed
+    """
+    data = lookup_movie(movie_title, api_key, imdb_id)
+    return OmdbRecord.from_response(data) if data else None
+
+
+def download_movie_posters_omdb(movie_titles, output_folder,api_key=Master_api_key):
+    """Download every title's poster into output_folder; True if all of them were found"""
+    from poster_downloader import PosterDownloader
 
     # Check if movie_titles is a single string or a list
     if isinstance(movie_titles, str):
         movie_titles = [movie_titles]
 
-    for title in movie_titles:
-        # Make a request to the OMDB API
-        params = {
-            'apikey': api_key,
-            't': title,
-            'plot': 'short',
-            'r': 'json'
-        }
-        response = requests.get(base_url, params=params)
-        movie_data = response.json()
-
-        # Check if the movie was found and has a poster
-        if movie_data.get('Response') == 'True' and movie_data.get('Poster') != 'N/A':
-            poster_url = movie_data['Poster']
-            
-            # Get the image file name
-            img_name = f"{title.replace(' ', '_').replace('/', '_').replace('?', '').replace(':', '')}.jpg"
-            
-            # Download the image
-            img_data = requests.get(poster_url).content
-            
-            # Save the image
-            try:
-                with open(os.path.join(output_folder, img_name), 'wb') as handler:
-                    handler.write(img_data)
-                
-                print(f"Downloaded: {img_name}")
-                return True
-            except Exception as e:
-                print(f"Error downloading poster for {title}: {str(e)}")
-                return False
-        else:
-            print(f"No poster found for: {title}")
-            return False
+    downloader = PosterDownloader(api_key=api_key)
+    try:
+        results = downloader.download(movie_titles, output_folder)
+    finally:
+        downloader.close()
+    report_poster_downloads(results)
+    return all(result.path and not result.error for result in results.values())
+
 def download_single_poster_omdb(movie_title, api_key=Master_api_key):
     """
     Downloads a single movie poster from OMDB API.
@@ -58,33 +150,12 @@ def download_single_poster_omdb(movie_title, api_key=Master_api_key):
         bytes: Raw image data if poster was found and downloaded successfully
         None: If poster could not be found or downloaded
     """
-    base_url = "http://www.omdbapi.com/"
-    
-    # Query OMDB API
-    params = {
-        'apikey': api_key,
-        't': movie_title,
-        'plot': 'short',
-        'r': 'json'
-    }
-    response = requests.get(base_url, params=params)
-    movie_data = response.json()
-
-    # Check if movie found and has poster
-    if movie_data.get('Response') == 'True' and movie_data.get('Poster') != 'N/A':
-        poster_url = movie_data['Poster']
-        
-        try:
-            # Download image
-            img_data = requests.get(poster_url).content
-            return img_data
-            
-        except Exception as e:
-            print(f"Error downloading poster for {movie_title}: {str(e)}")
-            return None
-    else:
-        print(f"No poster found for: {movie_title}")
-        return None
+    from poster_downloader import get_default_downloader
+
+    result = get_default_downloader().fetch_poster(movie_title, api_key=api_key)
+    if not result.ok:
+        print(f"No poster found for: {movie_title} ({result.error})")
+    return result.data
 
 
 def get_genre_from_omdb(api_key, movie_title):
@@ -164,15 +235,8 @@ def get_movie_actors_from_omdb(api_key, movie_title):
 
 
 def get_movie_data(api_key, movie_title):
-    base_url = "http://www.omdbapi.com/"
-    params = {
-        'apikey': Master_api_key,
-        't': movie_title,
-        'r': 'json'
-    }
-    response = requests.get(base_url, params=params)
-    if response.status_code == 200:
-        data = response.json()
+    data = lookup_movie(movie_title)
+    if data is not None:
         box_office = data.get('BoxOffice', None)
         if box_office:
             try:
@@ -185,11 +249,13 @@ def get_movie_data(api_key, movie_title):
             data['BoxOffice'] = -1
         return data
     else:
-        print(f"Error fetching data: {response.status_code} - {response.text}")
         return {}
 
 def get_box_office_from_omdb(api_key, movie_title):
     box_office = get_movie_data(api_key, movie_title).get('BoxOffice', None)
+    # get_movie_data has already converted it
+    if isinstance(box_office, (int, float)):
+        return box_office
     if box_office:
         try:
             # Remove '$' and ',' from the string and convert to float
@@ -200,57 +266,21 @@ def get_box_office_from_omdb(api_key, movie_title):
     return -1
 
 def download_movie_posters(api_key, movie_titles, output_folder):
-    # Create the output folder if it doesn't exist
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
-
-    base_url = "http://www.omdbapi.com/"
-
-    # Check if movie_titles is a single string or a list
-    # if isinstance(movie_titles, str):
-        # movie_titles = [movie_titles]
-
-    for title in movie_titles:
-        # Make a request to the OMDB API
-        params = {
-            'apikey': api_key,
-            't': title,
-            'plot': 'short',
-            'r': 'json'
-        }
-        response = requests.get(base_url, params=params)
-
-        # Check if the response is successful
-        if response.status_code == 200:
-            try:
-                movie_data = response.json()
-            except requests.exceptions.JSONDecodeError:
-                print(f"Error decoding JSON for movie: {title}")
-                continue
-        else:
-            print(f"Error fetching data for {title}: {response.status_code} - {response.text}")
-            continue
-
-        # Check if the movie was found and has a poster
-        if movie_data.get('Response') == 'True' and movie_data.get('Poster') != 'N/A':
-            poster_url = movie_data['Poster']
-            
-            # Get the image file name
-            img_name = f"{title.replace(' ', '_').replace('/', '_').replace('?', '').replace(':', '')}.jpg"
-            
-            # Download the image
-            img_data = requests.get(poster_url).content
-            
-            # Save the image
-            try:
-                with open(os.path.join(output_folder, img_name), 'wb') as handler:
-                    handler.write(img_data)
-                
-                print(f"Downloaded: {img_name}")
-                # return os.path.join(output_folder, img_name)
-            except Exception as e:
-                print(f"Error downloading poster for {title}: {str(e)}")
-                return False
+    """Download every title's poster into output_folder, returning {title: PosterResult}"""
+    from poster_downloader import PosterDownloader
+
+    downloader = PosterDownloader(api_key=api_key)
+    try:
+        results = downloader.download(movie_titles, output_folder)
+    finally:
+        downloader.close()
+    report_poster_downloads(results)
+    return results
+
+
+def report_poster_downloads(results):
+    for title, result in results.items():
+        if result.path and not result.error:
+            print(f"Downloaded: {os.path.basename(result.path)}")
         else:
-            print(f"No poster found for: {title}")
-            return False
+            print(f"Error downloading poster for {title}: {result.error}")
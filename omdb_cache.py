@@ -0,0 +1,110 @@
+"""On-disk cache of OMDB responses.
+
+Every lookup in omdb_api goes through here, so asking for a title's genre,
+director and box office costs one request instead of three, and repeated
+runs don't spend the daily API quota again. Responses are stored in SQLite
+under the normalized title and, once known, the imdbID. "Movie not found"
+answers are cached too, for a shorter time than real responses.
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DAY = 24 * 60 * 60
+
+
+def normalize_title(title: str) -> str:
+    """Case- and whitespace-insensitive form of a title, used in cache keys"""
+    return re.sub(r'\s+', ' ', str(title)).strip().lower()
+
+
+def title_key(title: str) -> str:
+    return f"t:{normalize_title(title)}"
+
+
+def imdb_key(imdb_id: str) -> str:
+    return f"i:{imdb_id.strip().lower()}"
+
+
+class OmdbCache:
+    """SQLite-backed OMDB response cache with expiry and hit/miss counters.
+
+    Args:
+        path: Database file, or ":memory:" for a cache that lasts one process
+        ttl: Seconds a found movie's response stays valid
+        negative_ttl: Seconds a "not found" answer stays valid
+    """
+
+    def __init__(self, path: str = "omdb_cache.db", ttl: float = 30 * DAY,
+                 negative_ttl: float = 1 * DAY):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        # One connection shared by every thread; sqlite3 objects aren't thread-safe on their own
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    found INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    expires REAL NOT NULL
+                )
+            """)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The cached response for key, or None on a miss or after it expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT found, data, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or row[2] < time.time():
+                self.misses += 1
+                return None
+            if row[0]:
+                self.hits += 1
+            else:
+                self.negative_hits += 1
+            return json.loads(row[1])
+
+    def put(self, data: Dict[str, Any], *keys: str, scope: str = ""):
+        """Store a response under each of keys.
+
+        Found movies are also stored under scope plus their imdbID key and
+        kept for ttl; "not found" responses are kept for negative_ttl.
+        """
+        found = data.get('Response') == 'True'
+        if found and data.get('imdbID'):
+            keys += (scope + imdb_key(data['imdbID']),)
+        expires = time.time() + (self.ttl if found else self.negative_ttl)
+        encoded = json.dumps(data)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO responses (key, found, data, expires) VALUES (?, ?, ?, ?)",
+                [(key, int(found), encoded, expires) for key in keys])
+
+    def purge_expired(self) -> int:
+        """Delete expired entries, returning how many were removed"""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM responses WHERE expires < ?", (time.time(),)).rowcount
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {'hits': self.hits, 'negative_hits': self.negative_hits,
+                'misses': self.misses, 'entries': entries}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
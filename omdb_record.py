@@ -0,0 +1,132 @@
+import re
+from typing import Any, Dict, List, Optional
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """Number from an OMDB string such as "$1,234", "7.6", "93%" or "N/A" (None)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value or value == 'N/A':
+        return None
+    try:
+        return float(str(value).replace('$', '').replace(',', '').replace('%', '').strip())
+    except ValueError:
+        return None
+
+
+def parse_int(value: Any) -> Optional[int]:
+    """Leading integer of strings such as "2010", "2010–2013" or "117 min" """
+    match = re.match(r'\s*(\d+)', str(value or ''))
+    return int(match.group(1)) if match else None
+
+
+def parse_list(value: Any) -> List[str]:
+    """Items of a comma separated OMDB field such as Genre or Actors"""
+    if not value or value == 'N/A':
+        return []
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_text(value: Any) -> Optional[str]:
+    return None if value in (None, '', 'N/A') else value
+
+
+def parse_rating(value: str) -> Optional[float]:
+    """A rating as a 0-100 score: "7.6/10" -> 76, "93%" -> 93, "89/100" -> 89"""
+    if '/' in value:
+        score, scale = value.split('/', 1)
+        score, scale = parse_number(score), parse_number(scale)
+        return score * 100 / scale if score is not None and scale else None
+    return parse_number(value)
+
+
+class OmdbRecord:
+    """Every field of one OMDB response, parsed once.
+
+    Numbers are numbers ("$1,234" box office, "12,345" votes, "7.6" rating),
+    comma separated fields are lists and "N/A" is None. ratings maps each
+    source to a 0-100 score.
+    """
+    __slots__ = ('title', 'year', 'rated', 'released', 'runtime', 'genres', 'director',
+                 'writer', 'actors', 'plot', 'language', 'country', 'awards', 'poster_url',
+                 'ratings', 'metascore', 'imdb_rating', 'imdb_votes', 'imdb_id', 'type',
+                 'dvd', 'box_office', 'production', 'website')
+
+    def __init__(self, title: str, year: Optional[int] = None, rated: Optional[str] = None,
+                 released: Optional[str] = None, runtime: Optional[int] = None,
+                 genres: Optional[List[str]] = None, director: Optional[str] = None,
+                 writer: Optional[str] = None, actors: Optional[List[str]] = None,
+                 plot: Optional[str] = None, language: Optional[str] = None,
+                 country: Optional[str] = None, awards: Optional[str] = None,
+                 poster_url: Optional[str] = None, ratings: Optional[Dict[str, float]] = None,
+                 metascore: Optional[int] = None, imdb_rating: Optional[float] = None,
+                 imdb_votes: Optional[int] = None, imdb_id: Optional[str] = None,
+                 type: Optional[str] = None, dvd: Optional[str] = None,
+                 box_office: Optional[float] = None, production: Optional[str] = None,
+                 website: Optional[str] = None):
+        self.title = title
+        self.year = year
+        self.rated = rated
+        self.released = released
+        # Minutes
+        self.runtime = runtime
+        self.genres = genres or []
+        self.director = director
+        self.writer = writer
+        self.actors = actors or []
+        self.plot = plot
+        self.language = language
+        self.country = country
+        self.awards = awards
+        self.poster_url = poster_url
+        self.ratings = ratings or {}
+        self.metascore = metascore
+        self.imdb_rating = imdb_rating
+        self.imdb_votes = imdb_votes
+        self.imdb_id = imdb_id
+        self.type = type
+        self.dvd = dvd
+        self.box_office = box_office
+        self.production = production
+        self.website = website
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Any]) -> Optional['OmdbRecord']:
+        """Record for an OMDB JSON response, or None if OMDB didn't find the movie"""
+        if data.get('Response') != 'True':
+            return None
+        ratings = {}
+        for rating in data.get('Ratings') or []:
+            score = parse_rating(rating.get('Value', ''))
+            if score is not None:
+                ratings[rating.get('Source')] = score
+        votes = parse_number(data.get('imdbVotes'))
+        return cls(
+            title=data.get('Title'),
+            year=parse_int(data.get('Year')),
+            rated=parse_text(data.get('Rated')),
+            released=parse_text(data.get('Released')),
+            runtime=parse_int(data.get('Runtime')),
+            genres=parse_list(data.get('Genre')),
+            director=parse_text(data.get('Director')),
+            writer=parse_text(data.get('Writer')),
+            actors=parse_list(data.get('Actors')),
+            plot=parse_text(data.get('Plot')),
+            language=parse_text(data.get('Language')),
+            country=parse_text(data.get('Country')),
+            awards=parse_text(data.get('Awards')),
+            poster_url=parse_text(data.get('Poster')),
+            ratings=ratings,
+            metascore=parse_int(data.get('Metascore')),
+            imdb_rating=parse_number(data.get('imdbRating')),
+            imdb_votes=int(votes) if votes is not None else None,
+            imdb_id=parse_text(data.get('imdbID')),
+            type=parse_text(data.get('Type')),
+            dvd=parse_text(data.get('DVD')),
+            box_office=parse_number(data.get('BoxOffice')),
+            production=parse_text(data.get('Production')),
+            website=parse_text(data.get('Website')),
+        )
+
+    def __repr__(self):
+        return f"OmdbRecord({self.title!r}, {self.year!r}, imdb_id={self.imdb_id!r})"
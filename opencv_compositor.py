@@ -0,0 +1,104 @@
+import cv2
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+
+class Sprite:
+    """A BGR image with alpha, stored premultiplied in uint8 fixed point.
+
+    premultiplied holds round(bgr * a / 255) and inverse_alpha holds 255 - a
+    (repeated per channel), so blending is dst = premultiplied + dst * inverse_alpha / 255.
+    """
+    __slots__ = ('premultiplied', 'inverse_alpha', 'opaque')
+
+    def __init__(self, premultiplied: np.ndarray, inverse_alpha: np.ndarray):
+        self.premultiplied = premultiplied
+        self.inverse_alpha = inverse_alpha
+        self.opaque = not inverse_alpha.any()
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.premultiplied.shape[:2]
+
+    @classmethod
+    def from_image(cls, image: np.ndarray, alpha: Optional[np.ndarray] = None) -> 'Sprite':
+        """Build a sprite from a grayscale, BGR or BGRA image (or BGR plus an alpha plane)"""
+        if len(image.shape) == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        if alpha is None and image.shape[2] == 4:
+            alpha = image[:, :, 3]
+        bgr = np.ascontiguousarray(image[:, :, :3])
+        if alpha is None:
+            alpha = np.full(bgr.shape[:2], 255, dtype=np.uint8)
+        alpha = cv2.merge([alpha.astype(np.uint8)] * 3)
+        premultiplied = cv2.multiply(bgr, alpha, scale=1 / 255.0)
+        inverse_alpha = cv2.subtract(np.full_like(alpha, 255), alpha)
+        return cls(premultiplied, inverse_alpha)
+
+
+def clip_region(frame_shape: Tuple[int, ...], x: int, y: int,
+                width: int, height: int) -> Optional[Tuple[slice, slice, slice, slice]]:
+    """Clip a width x height box at (x, y) to the frame.
+
+    Returns (frame rows, frame cols, source rows, source cols), or None when
+    nothing is visible.
+    """
+    x1, y1 = max(x, 0), max(y, 0)
+    x2, y2 = min(x + width, frame_shape[1]), min(y + height, frame_shape[0])
+    if x1 >= x2 or y1 >= y2:
+        return None
+    return slice(y1, y2), slice(x1, x2), slice(y1 - y, y2 - y), slice(x1 - x, x2 - x)
+
+
+class Compositor:
+    """In-place blending into frame regions, reusing its scratch buffers"""
+
+    def __init__(self):
+        self._scratch: Dict[Tuple[int, ...], np.ndarray] = {}
+
+    def _get_scratch(self, shape: Tuple[int, ...]) -> np.ndarray:
+        scratch = self._scratch.get(shape)
+        if scratch is None:
+            scratch = np.empty(shape, dtype=np.uint8)
+            self._scratch[shape] = scratch
+        return scratch
+
+    def blend_sprite(self, frame: np.ndarray, sprite: Sprite, x: int, y: int):
+        """Alpha-blend sprite into frame with its top-left corner at (x, y)"""
+        height, width = sprite.shape
+        region = clip_region(frame.shape, x, y, width, height)
+        if region is None:
+            return
+        rows, cols, src_rows, src_cols = region
+        roi = frame[rows, cols]
+        premultiplied = sprite.premultiplied[src_rows, src_cols]
+        if sprite.opaque:
+            roi[:] = premultiplied
+            return
+        # dst = dst * (255 - a) / 255 + premultiplied, in place via saturating uint8 ops
+        scratch = self._get_scratch(roi.shape)
+        cv2.multiply(roi, sprite.inverse_alpha[src_rows, src_cols], dst=scratch, scale=1 / 255.0)
+        cv2.add(scratch, premultiplied, dst=roi)
+
+    def blend_constant(self, frame: np.ndarray, image: np.ndarray, x: int, y: int, alpha: float):
+        """Blend an opaque BGR image into frame at a uniform opacity"""
+        height, width = image.shape[:2]
+        region = clip_region(frame.shape, x, y, width, height)
+        if region is None:
+            return
+        rows, cols, src_rows, src_cols = region
+        roi = frame[rows, cols]
+        cv2.addWeighted(roi, 1 - alpha, image[src_rows, src_cols], alpha, 0, dst=roi)
+
+    def paste(self, frame: np.ndarray, image: np.ndarray, x: int, y: int):
+        """Copy an opaque BGR image into frame, clipped to the frame bounds"""
+        height, width = image.shape[:2]
+        region = clip_region(frame.shape, x, y, width, height)
+        if region is None:
+            return
+        rows, cols, src_rows, src_cols = region
+        frame[rows, cols] = image[src_rows, src_cols]
+
+
+# Shared instance for renderers that don't need their own scratch buffers
+default_compositor = Compositor()
@@ -6,11 +6,32 @@ from Actor import Actor
 from Movie import Movie
 from layout_config import LayoutConfig
 from opencv_font_handler import OpenCVFontHandler
+from opencv_icon_atlas import IconAtlas
+from opencv_compositor import Compositor
+from bounded_cache import LRUCache
+from image_pyramid import ImagePyramid
+from render_timeline import Phase
+from render_profiler import NULL_STAGE
 
 class DrawingUtils:
     def __init__(self, config, font_handler):
         self.config = config
         self.font_handler = font_handler
+        # Score icons are decoded and resized once, not per frame
+        self.icon_atlas = IconAtlas(config.icon_size)
+        self.compositor = Compositor()
+        self.actor_images = LRUCache(4)
+        # Reused for the actor resize and text fade instead of allocating per frame
+        self.actor_buffer: Optional[np.ndarray] = None
+        self.fade_buffer: Optional[np.ndarray] = None
+        # Set through OpenCVShortsGenerator.profiler
+        self.profiler = None
+
+    def _stage(self, name: str, phase: Optional[str] = None):
+        """Context that times a stage when a profiler is attached"""
+        if self.profiler is None:
+            return NULL_STAGE
+        return self.profiler.stage(name, phase)
 
     def load_image_from_url_or_path(self, url_or_path: str) -> Optional[np.ndarray]:
         """Load an image from either a URL or local path using OpenCV"""
@@ -45,7 +66,7 @@ class DrawingUtils:
         self.font_handler.put_text(frame, text, (text_x, text_y),
                                 font_size, (150, 150, 150))
 
-    def draw_clue_counter(self, frame: np.ndarray, current_phase: dict):
+    def draw_clue_counter(self, frame: np.ndarray, current_phase: Phase):
         """Draw the clue counter with enhanced styling"""
         # Get the clue count from the phase
         clues = self.count_revealed_clues(current_phase)
@@ -56,8 +77,8 @@ class DrawingUtils:
             counter_text, self.config.clue_counter_size)
         
         # Calculate position (top right corner)
-        x = self.config.width - text_width - 30
-        y = 30
+        x = self.config.width - text_width - self.config.px(30)
+        y = self.config.px(30)
         
         # Draw counter background
         padding = self.config.padding
@@ -79,21 +100,21 @@ class DrawingUtils:
             self.config.clue_counter_size,
             self.config.text_colors['white'],
             outline_color=self.config.text_colors['outline'],
-            outline_thickness=2
+            outline_thickness=self.config.px(2)
         )
-    def count_revealed_clues(self, current_phase: dict) -> int:
+    def count_revealed_clues(self, current_phase: Phase) -> int:
         """Count number of revealed clues based on current phase"""
         clues = 0
-        if current_phase['type'] == 'title_reveal':
-            clues = current_phase['index'] + 1
-        elif current_phase['type'] == 'poster':
-            clues = 5 + current_phase['index'] + 1
-        elif current_phase['type'] in ['actor_reveal', 'final_frame']:
+        if current_phase.type == 'title_reveal':
+            clues = current_phase.index + 1
+        elif current_phase.type == 'poster':
+            clues = 5 + current_phase.index + 1
+        elif current_phase.type in ['actor_reveal', 'final_frame']:
             clues = 11
         return clues
     def draw_movie_info(self, frame: np.ndarray, movie: Movie, y_pos: int):
         """Draw movie information including title, scores, and box office"""
-        title_y = y_pos + (self.config.row_height // 2) + 15
+        title_y = y_pos + (self.config.row_height // 2) + self.config.px(15)
         current_x = self.config.width - self.config.margin
         
         # Draw box office
@@ -122,13 +143,14 @@ class DrawingUtils:
                                     self.config.score_size,
                                     self.config.text_colors['white'])
             
-            self.draw_score(frame,
-                          current_x + score_width + self.config.margin,
-                          title_y - self.config.icon_size//2,
-                          score_value,
-                          "",
-                          f"icons/Fresh{score_type.capitalize()}.png",
-                          f"icons/Rotten{score_type.capitalize()}.png")
+            with self._stage('draw_score'):
+                self.draw_score(frame,
+                              current_x + score_width + self.config.margin,
+                              title_y - self.config.icon_size//2,
+                              score_value,
+                              "",
+                              f"icons/Fresh{score_type.capitalize()}.png",
+                              f"icons/Rotten{score_type.capitalize()}.png")
             
             current_x -= self.config.margin * 2
         
@@ -142,40 +164,7 @@ class DrawingUtils:
                   score: int, display_score: str, fresh_icon: str, rotten_icon: str):
         """Draw score icons with proper blending"""
         icon_path = fresh_icon if score > 60 else rotten_icon
-        icon = self.load_image_from_url_or_path(icon_path)
-        
-        if icon is not None:
-            icon = cv2.resize(icon, (self.config.icon_size, self.config.icon_size))
-            
-            # Handle transparency for both 3 and 4 channel images
-            if len(icon.shape) == 2:  # Grayscale
-                alpha = np.ones((self.config.icon_size, self.config.icon_size))
-                icon = cv2.cvtColor(icon, cv2.COLOR_GRAY2BGR)
-            elif icon.shape[2] == 4:  # RGBA
-                alpha = icon[:, :, 3] / 255.0
-                icon = icon[:, :, :3]
-            else:  # BGR
-                alpha = np.ones((self.config.icon_size, self.config.icon_size))
-            
-            y1, y2 = y, y + self.config.icon_size
-            x1, x2 = x, x + self.config.icon_size
-            
-            # Ensure coordinates are within frame bounds
-            y1 = max(0, min(y1, frame.shape[0]))
-            y2 = max(0, min(y2, frame.shape[0]))
-            x1 = max(0, min(x1, frame.shape[1]))
-            x2 = max(0, min(x2, frame.shape[1]))
-            
-            # Adjust alpha and icon dimensions to match ROI size
-            alpha = alpha[:(y2-y1), :(x2-x1)]
-            icon = icon[:(y2-y1), :(x2-x1)]
-            
-            # Blend icon
-            for c in range(3):
-                frame[y1:y2, x1:x2, c] = (
-                    frame[y1:y2, x1:x2, c] * (1 - alpha) +
-                    icon[:, :, c] * alpha
-                )
+        self.icon_atlas.draw(frame, icon_path, x, y, self.compositor)
 
     def draw_actor_text(self, frame: np.ndarray, actor: Actor, y_position: int):
         """Draw engaging text for actor reveal"""
@@ -191,7 +180,7 @@ class DrawingUtils:
             self.config.actor_name_size,
             self.config.text_colors['white'],
             outline_color=self.config.text_colors['outline'],
-            outline_thickness=3
+            outline_thickness=self.config.px(3)
         )
         
         # Draw call to action
@@ -199,37 +188,63 @@ class DrawingUtils:
         comment_width, comment_height = self.font_handler.get_text_size(
             comment_text, self.config.actor_comment_size)
         comment_x = (self.config.width - comment_width) // 2
-        comment_y = name_y + comment_height + 30
+        comment_y = name_y + comment_height + self.config.px(30)
         
         self.font_handler.put_text(
             frame, comment_text, (comment_x, comment_y),
             self.config.actor_comment_size,
             self.config.text_colors['yellow'],
             outline_color=self.config.text_colors['outline'],
-            outline_thickness=2
+            outline_thickness=self.config.px(2)
         )
         
         # Draw scoring levels
-        current_y = comment_y + comment_height + 40
+        current_y = comment_y + comment_height + self.config.px(40)
+        level_size = self.config.actor_comment_size - self.config.px(5)
         for level_text, (min_clues, max_clues) in self.config.level_ranges:
             level_width, level_height = self.font_handler.get_text_size(
-                level_text, self.config.actor_comment_size - 5)
+                level_text, level_size)
             level_x = (self.config.width - level_width) // 2
             
             self.font_handler.put_text(
                 frame, level_text, (level_x, current_y),
-                self.config.actor_comment_size - 5,
+                level_size,
                 self.config.text_colors['white'],
                 outline_color=self.config.text_colors['outline'],
-                outline_thickness=2
+                outline_thickness=self.config.px(2)
             )
-            current_y += level_height + 20
+            current_y += level_height + self.config.px(20)
+
+    def resize_actor(self, image: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+        """Resize into a reused buffer; the result is only valid until the next call"""
+        width, height = size
+        shape = (height, width) + image.shape[2:]
+        count = int(np.prod(shape))
+        if self.actor_buffer is None or self.actor_buffer.size < count:
+            self.actor_buffer = np.empty(count, dtype=image.dtype)
+        resized = self.actor_buffer[:count].reshape(shape)
+        cv2.resize(image, size, dst=resized, interpolation=cv2.INTER_CUBIC)
+        return resized
+
+    def load_actor_pyramid(self, url_or_path: str) -> Optional[ImagePyramid]:
+        """Decode the actor image once and build its downscale pyramid"""
+        def load():
+            actor_image = self.load_image_from_url_or_path(url_or_path)
+            if actor_image is None:
+                return None
+            img_h, img_w = actor_image.shape[:2]
+            # Levels are at most twice the target size, so cubic is enough for the final resize
+            return ImagePyramid(
+                actor_image, (img_w, img_h),
+                self.resize_actor,
+                reduce=lambda image, size: cv2.resize(image, size, interpolation=cv2.INTER_AREA))
+        return self.actor_images.get_or_create(url_or_path, load)
 
     def draw_actor(self, frame: np.ndarray, actor: Actor, progress: float):
             """Draw the actor reveal animation with enhanced text"""
             if actor.url and os.path.exists(actor.url):
-                actor_image = self.load_image_from_url_or_path(actor.url)
-                if actor_image is not None:
+                actor_pyramid = self.load_actor_pyramid(actor.url)
+                if actor_pyramid is not None:
                     # Animation progress
                     t = progress
                     ease_progress = 1 - (1 - t) * (1 - t) * (1 - t)
@@ -240,7 +255,7 @@ class DrawingUtils:
                                     (target_size - self.config.actor_start_size) * ease_progress)
                     
                     # Resize maintaining aspect ratio
-                    img_h, img_w = actor_image.shape[:2]
+                    img_w, img_h = actor_pyramid.size
                     aspect_ratio = img_w / img_h
                     
                     if aspect_ratio > 1:
@@ -250,37 +265,36 @@ class DrawingUtils:
                         height = current_size
                         width = int(current_size * aspect_ratio)
                     
-                    # Resize actor image
-                    actor_image = cv2.resize(actor_image, (width, height), interpolation=cv2.INTER_LANCZOS4)
+                    # Resize from the nearest pyramid level
+                    actor_image = actor_pyramid.resize(width, height)
                     
                     # Calculate position
                     x = (self.config.width - width) // 2
                     y = (self.config.height - height) // 2
                     
-                    # Create alpha mask for smooth blending
-                    alpha = np.full((height, width, 1), progress, dtype=np.float32)
-                    
                     # Blend actor image with frame
-                    roi = frame[y:y+height, x:x+width]
-                    blended = cv2.addWeighted(roi, 1 - progress, actor_image, progress, 0)
-                    frame[y:y+height, x:x+width] = blended
+                    with self._stage('blend_actor'):
+                        self.compositor.blend_constant(frame, actor_image, x, y, progress)
                     
                     # Draw text overlay
                     if progress > 0.8:  # Only show text near end of animation
                         text_alpha = min(1.0, (progress - 0.8) * 5)  # Fade in text
-                        temp_frame = frame.copy()
-                        self.draw_actor_text(temp_frame, actor, 50)  # Adjust Y position as needed
-                        cv2.addWeighted(temp_frame, text_alpha, frame, 1 - text_alpha, 0, frame)
+                        if self.fade_buffer is None or self.fade_buffer.shape != frame.shape:
+                            self.fade_buffer = np.empty_like(frame)
+                        with self._stage('actor_text'):
+                            np.copyto(self.fade_buffer, frame)
+                            self.draw_actor_text(self.fade_buffer, actor, self.config.px(50))  # Adjust Y position as needed
+                            cv2.addWeighted(self.fade_buffer, text_alpha, frame, 1 - text_alpha, 0, frame)
     def draw_row(self, frame: np.ndarray, y_pos: int, movie: Optional[Movie],
-                descriptor: str, current_phase: dict, poster_index: Optional[int],
+                descriptor: str, current_phase: Phase, poster_index: Optional[int],
                 phase_progress: float):
         """Draw a single row including descriptor, poster, and movie info"""
         # Always draw descriptor
-        text_y = y_pos + 30  # Small padding from top of poster
+        text_y = y_pos + self.config.px(30)  # Small padding from top of poster
         self.font_handler.put_text(
             frame,
             descriptor,
-            (self.config.poster_width + 40, text_y),
+            (self.config.poster_width + self.config.px(40), text_y),
             self.config.descriptor_size,
             self.config.text_colors['light_gray']
         )
@@ -290,4 +304,5 @@ class DrawingUtils:
         
         # Show movie info if provided
         if movie is not None:
-            self.draw_movie_info(frame, movie, y_pos)
\ No newline at end of file
+            with self._stage('draw_movie_info'):
+                self.draw_movie_info(frame, movie, y_pos)
\ No newline at end of file
@@ -1,11 +1,17 @@
 import cv2
 import numpy as np
 from typing import Tuple, Optional
+from bounded_cache import LRUCache
+from opencv_compositor import Compositor, Sprite
 
 class OpenCVFontHandler:
-    def __init__(self):
+    def __init__(self, sprite_cache_size: int = 256):
         self.base_font = cv2.FONT_HERSHEY_DUPLEX
         self.base_font_size = 16
+        # Rasterized text tiles keyed by (text, size, color, thickness, outline)
+        self.text_sprites = LRUCache(sprite_cache_size)
+        self.text_sizes = LRUCache(sprite_cache_size)
+        self.compositor = Compositor()
         
     def get_font_scale(self, desired_size: int) -> float:
         """Convert desired font size to OpenCV font scale"""
@@ -13,6 +19,10 @@ class OpenCVFontHandler:
     
     def get_text_size(self, text: str, font_size: int) -> Tuple[int, int]:
         """Get the pixel dimensions of text at specified font size"""
+        return self.text_sizes.get_or_create((text, font_size),
+                                             lambda: self._measure_text(text, font_size))
+    
+    def _measure_text(self, text: str, font_size: int) -> Tuple[int, int]:
         font_scale = self.get_font_scale(font_size)
         (width, height), baseline = cv2.getTextSize(
             text, 
@@ -31,34 +41,52 @@ class OpenCVFontHandler:
                 thickness: int = 1,
                 outline_color: Optional[Tuple[int, int, int]] = None,
                 outline_thickness: int = 2) -> None:
-        """Draw text with optional outline"""
+        """Draw text with optional outline.
+        
+        Each distinct string/style is rasterized once into a premultiplied
+        tile; later calls only blend that tile into the image.
+        """
+        if not text:
+            return
+        key = (text, font_size, tuple(color), thickness,
+               tuple(outline_color) if outline_color is not None else None,
+               outline_thickness)
+        sprite, (offset_x, offset_y) = self.text_sprites.get_or_create(
+            key, lambda: self._rasterize_text(text, font_size, color, thickness,
+                                              outline_color, outline_thickness))
+        self.compositor.blend_sprite(img, sprite, position[0] - offset_x, position[1] - offset_y)
+    
+    def _rasterize_text(self, text: str, font_size: int, color: Tuple[int, int, int],
+                        thickness: int, outline_color: Optional[Tuple[int, int, int]],
+                        outline_thickness: int) -> Tuple[Sprite, Tuple[int, int]]:
+        """Render text into a sprite, returning it with the baseline origin inside the tile"""
         font_scale = self.get_font_scale(font_size)
+        stroke = max(thickness, outline_thickness if outline_color is not None else 0)
+        (width, height), baseline = cv2.getTextSize(text, self.base_font, font_scale, stroke)
+        pad = stroke + 2  # room for the outline offsets and anti-aliasing
+        origin = (pad, pad + height)
+        tile_shape = (height + baseline + 2 * pad, width + 2 * pad)
         
-        # Draw outline if specified
+        # Coverage of the outline passes and of the main text, drawn as on a frame
+        outline_cover = np.zeros(tile_shape, dtype=np.uint8)
         if outline_color is not None:
             for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1)]:
-                cv2.putText(
-                    img,
-                    text,
-                    (position[0] + dx, position[1] + dy),
-                    self.base_font,
-                    font_scale,
-                    outline_color,
-                    outline_thickness,
-                    cv2.LINE_AA
-                )
+                cv2.putText(outline_cover, text, (origin[0] + dx, origin[1] + dy),
+                            self.base_font, font_scale, 255, outline_thickness, cv2.LINE_AA)
+        text_cover = np.zeros(tile_shape, dtype=np.uint8)
+        cv2.putText(text_cover, text, origin, self.base_font, font_scale, 255,
+                    thickness, cv2.LINE_AA)
         
-        # Draw main text
-        cv2.putText(
-            img,
-            text,
-            position,
-            self.base_font,
-            font_scale,
-            color,
-            thickness,
-            cv2.LINE_AA
-        )
+        # Main text over outline: a = 1 - (1 - co)(1 - ct), c = oc*co*(1 - ct) + c*ct
+        co = (outline_cover.astype(np.float32) / 255.0)[:, :, None]
+        ct = (text_cover.astype(np.float32) / 255.0)[:, :, None]
+        premultiplied = np.asarray(color, dtype=np.float32) * ct
+        if outline_color is not None:
+            premultiplied += np.asarray(outline_color, dtype=np.float32) * co * (1 - ct)
+        inverse_alpha = (1 - co) * (1 - ct) * 255.0
+        sprite = Sprite(np.rint(premultiplied).astype(np.uint8),
+                        np.repeat(np.rint(inverse_alpha).astype(np.uint8), 3, axis=2))
+        return sprite, origin
     
     def put_multiline_text(self,
                           img: np.ndarray,
@@ -0,0 +1,46 @@
+import os
+import cv2
+import numpy as np
+from typing import Dict, Optional
+from opencv_compositor import Compositor, Sprite, default_compositor
+
+
+class IconAtlas:
+    """Every icon PNG, decoded and resized once and stored as a premultiplied Sprite.
+
+    Drawing an icon is then a single in-place blend into the frame with no
+    disk I/O.
+    """
+
+    def __init__(self, icon_size: int, icon_dir: str = "icons"):
+        self.icon_size = icon_size
+        self.icons: Dict[str, Sprite] = {}
+        if not os.path.isdir(icon_dir):
+            print(f"Icon directory not found: {icon_dir}")
+            return
+        for name in sorted(os.listdir(icon_dir)):
+            if name.lower().endswith('.png'):
+                path = os.path.join(icon_dir, name)
+                icon = self._load(path)
+                if icon is not None:
+                    self.icons[os.path.normpath(path)] = icon
+
+    def _load(self, path: str) -> Optional[Sprite]:
+        icon = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if icon is None:
+            print(f"Error loading icon: {path}")
+            return None
+        icon = cv2.resize(icon, (self.icon_size, self.icon_size))
+        return Sprite.from_image(icon)
+
+    def get(self, path: str) -> Optional[Sprite]:
+        return self.icons.get(os.path.normpath(path))
+
+    def draw(self, frame: np.ndarray, path: str, x: int, y: int,
+             compositor: Compositor = default_compositor) -> bool:
+        """Blend the icon into frame with its top-left corner at (x, y)"""
+        icon = self.get(path)
+        if icon is None:
+            return False
+        compositor.blend_sprite(frame, icon, x, y)
+        return True
@@ -1,3 +1,4 @@
+import copy
 from dataclasses import dataclass
 from typing import Dict, Tuple, List
 
@@ -7,6 +8,8 @@ class LayoutConfig:
         # Video dimensions
         self.width = width
         self.height = height
+        # Size relative to the full-size layout; see scaled()
+        self.scale = 1.0
         
         # Colors (BGR format)
         self.background_color = (20, 20, 20)
@@ -48,3 +51,29 @@ class LayoutConfig:
         self.margin = 10
         self.padding = 10
         self.text_spacing = 20
+
+    # Pixel measurements that scaled() shrinks along with the frame
+    SCALED_FIELDS = ('icon_size', 'row_height', 'poster_width', 'actor_start_size',
+                     'vertical_spacing', 'clue_size', 'clue_counter_size', 'box_office_size',
+                     'score_size', 'movie_title_size', 'descriptor_size', 'actor_name_size',
+                     'actor_comment_size', 'margin', 'padding', 'text_spacing')
+
+    def px(self, value) -> int:
+        """A full-size pixel measurement at this layout's scale, at least 1"""
+        return max(1, int(round(value * self.scale)))
+
+    def scaled(self, scale: float) -> 'LayoutConfig':
+        """Copy of this layout with every measurement multiplied by scale.
+
+        Frame dimensions are rounded to even numbers for yuv420p encoding.
+        A scale of 1 returns an identical copy.
+        """
+        config = copy.copy(self)
+        if scale == 1:
+            return config
+        config.width = max(2, int(round(self.width * scale / 2)) * 2)
+        config.height = max(2, int(round(self.height * scale / 2)) * 2)
+        config.scale = self.scale * scale
+        for name in self.SCALED_FIELDS:
+            setattr(config, name, max(1, int(round(getattr(self, name) * scale))))
+        return config
@@ -0,0 +1,157 @@
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from Actor import Actor
+from Movie import Movie
+from render_timeline import frame_times
+
+# Per-process render state, filled in by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(generator_class: type, generator_kwargs: Dict[str, Any],
+                 poster_fetch: Optional[Callable], actor: Actor,
+                 movies_with_descriptors: List[Tuple[Movie, str]], fps: float):
+    generator = generator_class(**generator_kwargs)
+    if poster_fetch is not None and hasattr(generator, 'poster_cache'):
+        generator.poster_cache.fetch = poster_fetch
+    if hasattr(generator, 'prepare_poster_tracks'):
+        generator.prepare_poster_tracks(fps)
+    _worker['generator'] = generator
+    _worker['actor'] = actor
+    _worker['movies_with_descriptors'] = movies_with_descriptors
+    _worker['times'] = frame_times(generator.duration, fps)
+
+
+def _render_range(frame_range: Tuple[int, int]) -> Tuple[int, List[np.ndarray]]:
+    start, stop = frame_range
+    generator = _worker['generator']
+    times = _worker['times']
+    frames = []
+    last_key = None
+    for index in range(start, stop):
+        progress = times[index] / generator.duration
+        key = generator.frame_state_key(progress)
+        if frames and key == last_key:
+            # Held frame: the same array is pickled only once
+            frames.append(frames[-1])
+            continue
+        frame = generator.create_frame(_worker['actor'], _worker['movies_with_descriptors'], progress)
+        frames.append(np.asarray(frame))
+        last_key = key
+    return start, frames
+
+
+def iter_frames_parallel(generator, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]],
+                         fps: float, workers: int,
+                         chunk_size: int = 8) -> Iterator[Tuple[int, np.ndarray]]:
+    """Render a whole timeline in worker processes, yielding (index, frame) in order.
+
+    The timeline is split into chunks of chunk_size frames. Each worker builds
+    its own generator from generator.init_kwargs, so poster and icon caches
+    are per process. At most two chunks per worker are in flight, which
+    bounds memory while the consumer (usually the encoder) catches up.
+    """
+    n_frames = len(frame_times(generator.duration, fps))
+    ranges = iter([(start, min(start + chunk_size, n_frames))
+                   for start in range(0, n_frames, chunk_size)])
+    poster_cache = getattr(generator, 'poster_cache', None)
+    initargs = (type(generator), generator.init_kwargs,
+                poster_cache.fetch if poster_cache else None,
+                actor, movies_with_descriptors, fps)
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=initargs) as pool:
+        pending = deque(pool.submit(_render_range, r) for r in islice(ranges, workers * 2))
+        while pending:
+            start, frames = pending.popleft().result()
+            next_range = next(ranges, None)
+            if next_range is not None:
+                pending.append(pool.submit(_render_range, next_range))
+            for offset, frame in enumerate(frames):
+                yield start + offset, frame
+
+
+def iter_prefetched(items: Iterable, depth: int) -> Iterator:
+    """Iterate items while a background thread produces up to depth of them ahead.
+
+    The hand-off queue is bounded, so a slow consumer holds the producer back
+    instead of letting rendered frames pile up. Errors raised while producing
+    are re-raised in the consumer, and closing the iterator stops the producer.
+    With depth 0 items are produced on demand in the calling thread.
+    """
+    if depth <= 0:
+        yield from items
+        return
+    
+    buffer: "queue.Queue" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    finished = object()
+    
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            put((finished, e))
+            return
+        put((finished, None))
+    
+    producer = threading.Thread(target=produce, name="frame-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is finished:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+class OrderedFrameStream:
+    """Serves frames by index from an ordered frame iterator.
+
+    Encoders that ask for frames by timestamp (MoviePy's make_frame) pull from
+    here. Requests for a frame that has already streamed past, such as the
+    size probe MoviePy does at t=0, fall back to render_frame.
+    """
+
+    def __init__(self, frames: Iterator[Tuple[int, np.ndarray]],
+                 render_frame: Callable[[int], np.ndarray]):
+        self._frames = frames
+        self._render_frame = render_frame
+        self._last: Optional[Tuple[int, np.ndarray]] = None
+
+    def get(self, index: int) -> np.ndarray:
+        if self._last is not None and self._last[0] == index:
+            return self._last[1]
+        if self._last is not None and index < self._last[0]:
+            return self._render_frame(index)
+        for frame_index, frame in self._frames:
+            self._last = (frame_index, frame)
+            if frame_index == index:
+                return frame
+        return self._render_frame(index)
+
+    def close(self):
+        close = getattr(self._frames, 'close', None)
+        if close:
+            close()
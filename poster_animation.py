@@ -0,0 +1,62 @@
+from typing import Optional, Sequence, Tuple
+import numpy as np
+
+Geometry = Tuple[int, int, int, int]
+
+
+def shrink_ease(phase_progress: np.ndarray, fullscreen_fraction: float) -> np.ndarray:
+    """Cubic ease-out of the poster shrink for each phase progress value.
+
+    0 while the poster is held full screen, 1 once it has reached its row.
+    """
+    phase_progress = np.asarray(phase_progress, dtype=np.float64)
+    shrink_progress = (phase_progress - fullscreen_fraction) / (1 - fullscreen_fraction)
+    t = 1 - shrink_progress
+    ease = 1 - (t * t * t)
+    ease[phase_progress < fullscreen_fraction] = 0.0
+    ease[shrink_progress > 1] = 1.0
+    return ease
+
+
+def quantize_ease(ease: np.ndarray, start_width: float, end_width: float, levels: int) -> np.ndarray:
+    """Snap ease values so the poster width falls on a fixed scale pyramid.
+
+    The pyramid has `levels` widths spaced geometrically from start_width
+    down to end_width, so every frame of the shrink reuses one of a bounded
+    set of resized posters. Both ends of the animation are kept exact.
+    """
+    if levels < 2 or start_width == end_width:
+        return ease
+    width = start_width + (end_width - start_width) * ease
+    position = np.log(width / end_width) / np.log(start_width / end_width)
+    level = np.rint((1 - position) * (levels - 1))
+    level_width = end_width * (start_width / end_width) ** (1 - level / (levels - 1))
+    quantized = (start_width - level_width) / (start_width - end_width)
+    quantized[level == 0] = 0.0
+    quantized[level == levels - 1] = 1.0
+    return quantized
+
+
+def interpolate_geometry(ease: np.ndarray, start: Sequence[float], end: Sequence[float]) -> np.ndarray:
+    """(x, y, width, height) rows for each ease value, truncated to ints"""
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+    geometry = start + (end - start) * ease[:, None]
+    return geometry.astype(np.int64)
+
+
+class PosterAnimationTrack:
+    """Precomputed poster geometry for the frames of one poster phase"""
+    __slots__ = ('phase_progress', 'geometry')
+
+    def __init__(self, phase_progress: np.ndarray, geometry: np.ndarray):
+        order = np.argsort(phase_progress, kind='stable')
+        self.phase_progress = np.asarray(phase_progress)[order]
+        self.geometry = geometry[order]
+
+    def lookup(self, phase_progress: float) -> Optional[Geometry]:
+        """Geometry for an exact precomputed progress value, else None"""
+        index = int(np.searchsorted(self.phase_progress, phase_progress))
+        if index < len(self.phase_progress) and self.phase_progress[index] == phase_progress:
+            return tuple(int(v) for v in self.geometry[index])
+        return None
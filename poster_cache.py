@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Callable, Iterable, Optional, Tuple
+from PIL import Image
+from Movie import Movie
+from bounded_cache import LRUCache
+from poster_store import PosterStore
+
+
+def fetch_omdb_poster(movie: Movie) -> Optional[bytes]:
+    return movie.get_poster_from_omdb()
+
+
+class PosterCache:
+    """Fetches each movie poster once and memoizes decoded and resized copies.
+
+    Posters are keyed by movie title. A failed or empty fetch is remembered
+    until the next prefetch(), so a missing poster costs one request per
+    render instead of one per frame, and a transient failure doesn't stick
+    for later renders.
+    With a PosterStore, fetched posters are decoded from the store's .npy
+    derivatives rather than from JPEG, and stored_sizes are kept in the
+    store and read from it instead of resized.
+    """
+
+    def __init__(self, max_resized: int = 64,
+                 fetch: Optional[Callable[[Movie], Optional[bytes]]] = None,
+                 max_originals: int = 256, store: Optional[PosterStore] = None,
+                 stored_sizes: Iterable[Tuple[int, int]] = ()):
+        self.fetch = fetch or fetch_omdb_poster
+        self.store = store
+        self.stored_sizes = tuple(tuple(size) for size in stored_sizes)
+        # Store digest of each title's poster
+        self._digests = {}
+        # Bounded so long-lived batch processes don't keep every poster ever seen
+        self._decoded = LRUCache(max_originals)
+        self._resized = LRUCache(max_resized)
+        self.requests = 0
+
+    def get_original(self, movie: Movie) -> Optional[Image.Image]:
+        """Return the decoded full-size poster, fetching it on first use"""
+        return self._decoded.get_or_create(movie.get_title(), lambda: self._load(movie))
+
+    def get_resized(self, movie: Movie, width: int, height: int) -> Optional[Image.Image]:
+        """Return the poster resized to (width, height), or None if unavailable"""
+        original = self.get_original(movie)
+        if original is None:
+            return None
+        key = (movie.get_title(), width, height)
+        return self._resized.get_or_create(key, lambda: self._resize(movie, original, width, height))
+
+    def prefetch(self, movies: Iterable[Movie], max_workers: int = 8):
+        """Fetch every poster not cached yet concurrently, so frames never wait on the network.
+
+        Titles whose last fetch failed are fetched again.
+        """
+        self._decoded.discard_where(lambda poster: poster is None)
+        missing = {}
+        for movie in movies:
+            if movie is not None and movie.get_title() not in self._decoded:
+                missing.setdefault(movie.get_title(), movie)
+        if not missing:
+            return
+        self.requests += len(missing)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+            fetched = list(pool.map(self._fetch, missing.values()))
+        # Decoding and caching stay on this thread; the LRU caches aren't locked
+        for movie, poster_data in zip(missing.values(), fetched):
+            self._decoded.put(movie.get_title(), self._decode(movie, poster_data))
+
+    def clear(self):
+        self._decoded.clear()
+        self._resized.clear()
+        self._digests.clear()
+
+    def _resize(self, movie: Movie, original: Image.Image, width: int, height: int) -> Image.Image:
+        digest = self._digests.get(movie.get_title())
+        if digest and (width, height) in self.stored_sizes:
+            stored = self.store.array(digest, 'RGB', (width, height))
+            if stored is not None:
+                return Image.fromarray(stored)
+        return original.resize((width, height))
+
+    def _load(self, movie: Movie) -> Optional[Image.Image]:
+        self.requests += 1
+        return self._decode(movie, self._fetch(movie))
+
+    def _fetch(self, movie: Movie) -> Optional[bytes]:
+        try:
+            return self.fetch(movie)
+        except Exception as e:
+            print(f"Could not load poster for {movie.get_title()}: {e}")
+            return None
+
+    def _decode(self, movie: Movie, poster_data: Optional[bytes]) -> Optional[Image.Image]:
+        if not poster_data:
+            return None
+        if self.store is not None:
+            digest = self.store.add(poster_data, derivatives=[('RGB', None)] +
+                                    [('RGB', size) for size in self.stored_sizes])
+            pixels = self.store.array(digest, 'RGB')
+            if pixels is not None:
+                self._digests[movie.get_title()] = digest
+                return Image.fromarray(pixels)
+        try:
+            poster = Image.open(BytesIO(poster_data))
+            poster.load()
+            return poster
+        except Exception as e:
+            print(f"Could not load poster for {movie.get_title()}: {e}")
+            return None
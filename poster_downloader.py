@@ -0,0 +1,171 @@
+"""Concurrent poster downloads over one pooled HTTP session.
+
+Every request (OMDB lookups and poster images) goes through the same
+requests.Session, so connections are reused. Each request has a timeout and
+is retried with exponential backoff on connection errors, 429 and 5xx. At
+most max_workers titles are fetched at once, and each host gets at most
+requests_per_second requests. With a PosterStore, posters already stored
+under their URL are read from disk instead of downloaded; the workers only
+save the bytes, and renderers decode the derivatives they draw.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import omdb_api
+from poster_store import PosterStore, get_default_store
+
+
+class RateLimiter:
+    """Spaces out requests to each host to at most per_second per second"""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class PosterResult:
+    """Outcome of one title's download: data and path on success, error otherwise.
+
+    digest is the poster's key in the downloader's PosterStore, if it has one.
+    """
+    __slots__ = ('title', 'data', 'path', 'error', 'digest')
+
+    def __init__(self, title: str, data: Optional[bytes] = None, path: Optional[str] = None,
+                 error: Optional[str] = None, digest: Optional[str] = None):
+        self.title = title
+        self.data = data
+        self.path = path
+        self.error = error
+        self.digest = digest
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+    def __repr__(self):
+        status = f"{len(self.data)} bytes" if self.ok else f"error={self.error!r}"
+        return f"PosterResult({self.title!r}, {status})"
+
+
+def make_session(pool_size: int = 8, retries: int = 3, backoff: float = 0.5) -> requests.Session:
+    """Session with a connection pool of pool_size and retries with backoff"""
+    retry = Retry(total=retries, backoff_factor=backoff,
+                  status_forcelist=(429, 500, 502, 503, 504), allowed_methods=('GET',),
+                  respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def poster_file_name(title: str) -> str:
+    return f"{title.replace(' ', '_').replace('/', '_').replace('?', '').replace(':', '')}.jpg"
+
+
+class PosterDownloader:
+    """Bulk poster fetcher with bounded concurrency.
+
+    Args:
+        max_workers: Titles fetched at once, also the connection pool size
+        timeout: Seconds to connect and to read, per request
+        retries: Retries per request after the first attempt
+        backoff: Base delay of the exponential backoff between retries
+        requests_per_second: Per-host request rate; 0 for no limit
+        store: PosterStore that downloaded posters are saved in and read from
+    """
+
+    def __init__(self, max_workers: int = 8, timeout: Union[float, Tuple[float, float]] = (5, 20),
+                 retries: int = 3, backoff: float = 0.5, requests_per_second: float = 10,
+                 api_key: str = omdb_api.Master_api_key, store: Optional[PosterStore] = None):
+        self.max_workers = max_workers
+        self.store = store
+        self.timeout = timeout
+        self.api_key = api_key
+        self.session = make_session(max_workers, retries, backoff)
+        self.rate_limiter = RateLimiter(requests_per_second)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Rate-limited GET over the pooled session"""
+        self.rate_limiter.wait(urlsplit(url).netloc)
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def fetch_poster(self, title: str, output_folder: Optional[str] = None,
+                     api_key: Optional[str] = None) -> PosterResult:
+        """Look up title on OMDB and download its poster, saving it if output_folder is given"""
+        movie_data = omdb_api.lookup_movie(title, api_key or self.api_key, session=self)
+        if movie_data is None:
+            return PosterResult(title, error="OMDB request failed")
+        if movie_data.get('Response') != 'True' or movie_data.get('Poster', 'N/A') == 'N/A':
+            return PosterResult(title, error="No poster found")
+        poster_url = movie_data['Poster']
+        keys = [f"url:{poster_url}"]
+        if movie_data.get('imdbID'):
+            keys.append(f"imdb:{movie_data['imdbID']}")
+        digest = self.store.lookup(keys[0]) if self.store is not None else None
+        data = self.store.read(digest) if digest else None
+        if data is None:
+            try:
+                response = self.get(poster_url)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                return PosterResult(title, error=str(e))
+            data = response.content
+            if self.store is not None:
+                digest = self.store.add(data, *keys)
+
+        result = PosterResult(title, data=data, digest=digest)
+        if output_folder:
+            result.path = os.path.join(output_folder, poster_file_name(title))
+            try:
+                with open(result.path, 'wb') as handler:
+                    handler.write(result.data)
+            except OSError as e:
+                result.error = str(e)
+        return result
+
+    def download(self, titles: Iterable[str], output_folder: Optional[str] = None) -> Dict[str, PosterResult]:
+        """Fetch every title's poster concurrently, returning {title: PosterResult}"""
+        titles = list(dict.fromkeys(titles))
+        if output_folder:
+            os.makedirs(output_folder, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = dict(zip(titles, pool.map(lambda title: self.fetch_poster(title, output_folder),
+                                                titles)))
+        if self.store is not None:
+            self.store.prune()
+        return results
+
+    def close(self):
+        self.session.close()
+
+
+_default_downloader: Optional[PosterDownloader] = None
+_default_lock = threading.Lock()
+
+
+def get_default_downloader() -> PosterDownloader:
+    """Downloader whose session every omdb_api request goes through by default"""
+    global _default_downloader
+    with _default_lock:
+        if _default_downloader is None:
+            _default_downloader = PosterDownloader(store=get_default_store())
+        return _default_downloader
@@ -0,0 +1,237 @@
+"""Content-addressed poster files with pre-sized, pre-decoded derivatives.
+
+Each poster is stored once, under the SHA-256 of its bytes. Lookup keys
+(a poster URL, an imdbID) point at that digest, so a poster seen before is
+never downloaded again. Callers name the (mode, size) derivatives they draw
+at ingest; those are decoded and resized once and saved as .npy files, and
+any other derivative is made on its first array() call. Renders then load
+them with np.load(mmap_mode='r') instead of decoding JPEGs.
+
+Derivatives are made per channel order, with the same decoder and resize
+each renderer used before the store existed: PIL for 'RGB' frames and
+OpenCV for 'BGR' frames. Frames drawn from the store match frames drawn
+from the original files.
+"""
+import hashlib
+import os
+import threading
+from io import BytesIO
+from typing import Iterable, Optional, Tuple
+import cv2
+import numpy as np
+from PIL import Image
+
+Size = Tuple[int, int]
+# (channel order, size); a size of None is the original size
+Derivative = Tuple[str, Optional[Size]]
+
+
+def decode(data: bytes, mode: str) -> Optional[np.ndarray]:
+    """Full-size pixels of an encoded image in channel order mode, or None if undecodable"""
+    if mode == 'BGR':
+        return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    try:
+        with Image.open(BytesIO(data)) as image:
+            return np.asarray(image.convert('RGB'))
+    except Exception:
+        return None
+
+
+def resize(pixels: np.ndarray, size: Size, mode: str) -> np.ndarray:
+    if mode == 'BGR':
+        return cv2.resize(pixels, size)
+    return np.asarray(Image.fromarray(pixels).resize(size))
+
+
+class PosterStore:
+    """Posters on disk under their content hash, plus decoded derivatives.
+
+    Layout of directory:
+        originals/<digest>                  the encoded bytes as downloaded
+        arrays/<digest>_<mode>_<w>x<h>.npy  decoded derivative at w x h
+        arrays/<digest>_<mode>.npy          decoded original size
+        keys/<sha1 of key>                  digest the key points at
+
+    Files are written under a temporary name and renamed, so several
+    processes can share a store. Using a poster refreshes the mtime of its
+    original, and prune() drops the least recently used posters beyond
+    max_bytes.
+
+    Args:
+        directory: Root of the store
+        max_bytes: Size prune() trims the store to
+    """
+
+    def __init__(self, directory: str = "poster_store", max_bytes: int = 1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        for sub in ('originals', 'arrays', 'keys'):
+            os.makedirs(os.path.join(directory, sub), exist_ok=True)
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def original_path(self, digest: str) -> str:
+        return os.path.join(self.directory, 'originals', digest)
+
+    def array_path(self, digest: str, mode: str, size: Optional[Size] = None) -> str:
+        name = f"{digest}_{mode}" + (f"_{size[0]}x{size[1]}" if size else "")
+        return os.path.join(self.directory, 'arrays', name + '.npy')
+
+    def key_path(self, key: str) -> str:
+        return os.path.join(self.directory, 'keys', hashlib.sha1(key.encode()).hexdigest())
+
+    def add(self, data: bytes, *keys: str, derivatives: Iterable[Derivative] = ()) -> str:
+        """Store a poster and the given derivatives once, point keys at it and return its digest"""
+        digest = self.digest(data)
+        if not os.path.exists(self.original_path(digest)):
+            self._write(self.original_path(digest), lambda f: f.write(data))
+        else:
+            self._touch(digest)
+        for mode, size in derivatives:
+            self._make(digest, mode, size, data)
+        for key in keys:
+            if self.lookup(key) != digest:
+                self._write(self.key_path(key), lambda f: f.write(digest.encode()))
+        return digest
+
+    def add_file(self, path: str, *keys: str, derivatives: Iterable[Derivative] = ()) -> Optional[str]:
+        """add() for a poster file on disk; None if it can't be read"""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        return self.add(data, *keys, derivatives=derivatives)
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Digest stored under key, or None"""
+        try:
+            with open(self.key_path(key), 'rb') as f:
+                return f.read().decode()
+        except OSError:
+            return None
+
+    def read(self, digest: str) -> Optional[bytes]:
+        """Encoded bytes of a stored poster"""
+        try:
+            with open(self.original_path(digest), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def array(self, digest: str, mode: str = 'RGB', size: Optional[Size] = None,
+              mmap: bool = True) -> Optional[np.ndarray]:
+        """Decoded poster at size (the original size by default), read-only.
+
+        Derivatives that weren't made at ingest are made and saved on first
+        use. Returns None if the poster can't be decoded.
+        """
+        self._touch(digest)
+        if not self._make(digest, mode, size):
+            return None
+        return np.load(self.array_path(digest, mode, size), mmap_mode='r' if mmap else None)
+
+    def derivative(self, data: bytes, mode: str, size: Optional[Size] = None) -> Optional[np.ndarray]:
+        """array() for encoded poster bytes, adding them to the store if needed"""
+        return self.array(self.add(data), mode, size)
+
+    def prune(self) -> int:
+        """Delete the least recently used posters until the store fits in max_bytes.
+
+        Returns how many posters were removed.
+        """
+        used, sizes = {}, {}
+        for name in os.listdir(os.path.join(self.directory, 'originals')):
+            if name.endswith('.part'):
+                continue
+            try:
+                stat = os.stat(self.original_path(name))
+            except OSError:
+                continue
+            used[name] = stat.st_mtime
+            sizes[name] = stat.st_size
+        arrays = os.listdir(os.path.join(self.directory, 'arrays'))
+        for name in arrays:
+            digest = name.split('_', 1)[0]
+            if digest in sizes:
+                try:
+                    sizes[digest] += os.path.getsize(os.path.join(self.directory, 'arrays', name))
+                except OSError:
+                    pass
+        total = sum(sizes.values())
+        evicted = set()
+        for digest in sorted(used, key=used.get):
+            if total <= self.max_bytes:
+                break
+            evicted.add(digest)
+            total -= sizes[digest]
+        if not evicted:
+            return 0
+
+        paths = [os.path.join(self.directory, 'arrays', name) for name in arrays
+                 if name.split('_', 1)[0] in evicted]
+        paths += [self.original_path(digest) for digest in evicted]
+        keys = os.path.join(self.directory, 'keys')
+        for name in os.listdir(keys):
+            try:
+                with open(os.path.join(keys, name), 'rb') as f:
+                    if f.read().decode() in evicted:
+                        paths.append(os.path.join(keys, name))
+            except OSError:
+                pass
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return len(evicted)
+
+    def _make(self, digest: str, mode: str, size: Optional[Size], data: Optional[bytes] = None) -> bool:
+        """Save the (mode, size) array if it isn't stored yet; False if undecodable"""
+        path = self.array_path(digest, mode, size)
+        if os.path.exists(path):
+            return True
+        original_path = self.array_path(digest, mode)
+        if size is not None and os.path.exists(original_path):
+            pixels = np.load(original_path)
+        else:
+            data = data if data is not None else self.read(digest)
+            pixels = decode(data, mode) if data is not None else None
+            if pixels is None:
+                return False
+            if size is None:
+                self._save_array(path, pixels)
+                return True
+        self._save_array(path, resize(pixels, size, mode))
+        return True
+
+    def _touch(self, digest: str):
+        try:
+            os.utime(self.original_path(digest))
+        except OSError:
+            pass
+
+    def _save_array(self, path: str, pixels: np.ndarray):
+        self._write(path, lambda f: np.save(f, np.ascontiguousarray(pixels)))
+
+    def _write(self, path: str, write):
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        with open(partial, 'wb') as f:
+            write(f)
+        os.replace(partial, path)
+
+
+_default_store: Optional[PosterStore] = None
+_default_lock = threading.Lock()
+
+
+def get_default_store() -> PosterStore:
+    """Store shared by the poster downloader and both renderers, pruned when first used"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = PosterStore()
+            _default_store.prune()
+        return _default_store
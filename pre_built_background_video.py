@@ -6,6 +6,9 @@ from Actor import Actor
 from Movie import Movie
 from typing import List
 import subprocess
+from opencv_compositor import Compositor, Sprite
+from render_timeline import Phase, Timeline
+from poster_store import get_default_store
 
 
 class PreBuiltBackgroundVideo:
@@ -23,23 +26,11 @@ class PreBuiltBackgroundVideo:
         self.image3 = self._load_and_resize_image(image3_path)
         
         # Store timing information
-        self.breakpoints = [
-            {
-                'start': 0,
-                'end': duration1,
-                'type': 'image1'
-            },
-            {
-                'start': duration1,
-                'end': duration1 + duration2,
-                'type': 'image2'
-            },
-            {
-                'start': duration1 + duration2,
-                'end': self.duration,
-                'type': 'image3'
-            }
-        ]
+        self.breakpoints = Timeline([
+            Phase(0, duration1, 'image1'),
+            Phase(duration1, duration1 + duration2, 'image2'),
+            Phase(duration1 + duration2, self.duration, 'image3')
+        ], self.duration)
         self.transition_masks = {
             '1to2': self._create_transition_mask(self.image1, self.image2),
             '2to3': self._create_transition_mask(self.image2, self.image3)
@@ -53,14 +44,17 @@ class PreBuiltBackgroundVideo:
         self.poster_reveal_duration = duration2 * poster_reveal_percentage / 6  # Second half for posters
         
         self.movies = movies[:5]  # Limit to 5 movies maximum
+        self.compositor = Compositor()
+        self.icon_sprites = {}
         self.cached_posters = {}
         for movie in self.movies:
             try:
                 poster_data = movie.get_poster_from_omdb()
                 if poster_data:
-                    poster = cv2.imdecode(np.frombuffer(poster_data, np.uint8), cv2.IMREAD_UNCHANGED)
+                    # Pre-sized in the poster store, so nothing is decoded after the first run
+                    poster = get_default_store().derivative(poster_data, 'BGR', (255, 384))
                     if poster is not None:
-                        self.cached_posters[movie.get_title()] = cv2.resize(poster, (255, 384))
+                        self.cached_posters[movie.get_title()] = poster
             except Exception as e:
                 print(f"Could not cache poster for {movie.get_title()}: {str(e)}")
     def _create_transition_mask(self, img1: np.ndarray, img2: np.ndarray) -> np.ndarray:
@@ -89,34 +83,30 @@ class PreBuiltBackgroundVideo:
         current_time = progress * self.duration
         
         # Find current phase
-        current_phase = None
-        for breakpoint in self.breakpoints:
-            if breakpoint['start'] <= current_time <= breakpoint['end']:
-                current_phase = breakpoint
-                break
-                
-        if current_phase is None:
+        phase_index = self.breakpoints.find(current_time)
+        if phase_index is None:
             return self.image3.copy()
+        current_phase = self.breakpoints[phase_index]
             
         # Handle transitions
         frame = None
         
         # Transition from image1 to image2
-        if current_phase['type'] == 'image1':
+        if current_phase.type == 'image1':
             frame = self.image1.copy()
-            if current_time > (current_phase['end'] - self.fade_duration):
-                fade_progress = (current_time - (current_phase['end'] - self.fade_duration)) / self.fade_duration
+            if current_time > (current_phase.end - self.fade_duration):
+                fade_progress = (current_time - (current_phase.end - self.fade_duration)) / self.fade_duration
                 frame = cv2.addWeighted(self.image1, 1 - fade_progress, self.image2, fade_progress, 0)
                 
         # Image2 phase with transitions on both ends
-        elif current_phase['type'] == 'image2':
+        elif current_phase.type == 'image2':
             # Fade in from image1
-            if current_time < (current_phase['start'] + self.fade_duration):
-                fade_progress = (current_time - current_phase['start']) / self.fade_duration
+            if current_time < (current_phase.start + self.fade_duration):
+                fade_progress = (current_time - current_phase.start) / self.fade_duration
                 frame = cv2.addWeighted(self.image1, 1 - fade_progress, self.image2, fade_progress, 0)
             # Fade out to image3
-            elif current_time > (current_phase['end'] - self.fade_duration):
-                fade_progress = (current_time - (current_phase['end'] - self.fade_duration)) / self.fade_duration
+            elif current_time > (current_phase.end - self.fade_duration):
+                fade_progress = (current_time - (current_phase.end - self.fade_duration)) / self.fade_duration
                 frame = cv2.addWeighted(self.image2, 1 - fade_progress, self.image3, fade_progress, 0)
             # Middle of image2 phase
             else:
@@ -124,14 +114,14 @@ class PreBuiltBackgroundVideo:
             
             # Add dynamic reveals during image2 phase
             if frame is not None:
-                phase_progress = (current_time - current_phase['start']) / (current_phase['end'] - current_phase['start'])
+                phase_progress = current_phase.progress(current_time)
                 self._add_reveals(frame, phase_progress)
                 
         # Transition from image2 to image3
         else:  # image3
             frame = self.image3.copy()
-            if current_time < (current_phase['start'] + self.fade_duration):
-                fade_progress = (current_time - current_phase['start']) / self.fade_duration
+            if current_time < (current_phase.start + self.fade_duration):
+                fade_progress = (current_time - current_phase.start) / self.fade_duration
                 frame = cv2.addWeighted(self.image2, 1 - fade_progress, self.image3, fade_progress, 0)
         
         return frame
@@ -260,24 +250,14 @@ class PreBuiltBackgroundVideo:
 
     def _add_icon(self, frame: np.ndarray, icon_path: str, x: int, y: int, icon_size: int):
         """Helper function to add an icon to the frame with alpha channel support"""
-        icon = cv2.imread(icon_path, cv2.IMREAD_UNCHANGED)
-        if icon is not None:
-            icon = cv2.resize(icon, (icon_size, icon_size))
-            
-            if icon.shape[2] == 4:  # If icon has alpha channel
-                y1, y2 = y, y + icon_size
-                x1, x2 = x, x + icon_size
-                
-                if y2 <= frame.shape[0] and x2 <= frame.shape[1]:  # Check bounds
-                    alpha = icon[:,:,3]
-                    alpha = alpha.astype(float)/255
-                    alpha = np.stack([alpha]*3, axis=-1)
-                    foreground = icon[:,:,:3]
-                    background = frame[y1:y2, x1:x2]
-                    blended = cv2.convertScaleAbs(foreground * alpha + background * (1 - alpha))
-                    frame[y1:y2, x1:x2] = blended
-                else:  # If icon doesn't have alpha channel
-                    frame[y:y+icon_size, x:x+icon_size] = icon
+        key = (icon_path, icon_size)
+        if key not in self.icon_sprites:
+            icon = cv2.imread(icon_path, cv2.IMREAD_UNCHANGED)
+            self.icon_sprites[key] = (Sprite.from_image(cv2.resize(icon, (icon_size, icon_size)))
+                                      if icon is not None else None)
+        sprite = self.icon_sprites[key]
+        if sprite is not None:
+            self.compositor.blend_sprite(frame, sprite, x, y)
     def _add_movie_poster(self, frame: np.ndarray, movie: Movie, index: int):
         """Add a movie poster to the frame"""
         poster_width = 255
@@ -294,9 +274,8 @@ class PreBuiltBackgroundVideo:
         try:
             poster_data = movie.get_poster_from_omdb()
             if poster_data:
-                poster = cv2.imdecode(np.frombuffer(poster_data, np.uint8), cv2.IMREAD_UNCHANGED)
+                poster = get_default_store().derivative(poster_data, 'BGR', (poster_width, poster_height))
                 if poster is not None:
-                    poster = cv2.resize(poster, (poster_width, poster_height))
                     frame[poster_y:poster_y+poster_height, 
                         poster_x:poster_x+poster_width] = poster
                 else:
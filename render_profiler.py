@@ -0,0 +1,75 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+# Returned by the generators' _stage() when profiling is off
+NULL_STAGE = nullcontext()
+
+
+class RenderProfiler:
+    """Per-stage timings of a render, grouped by timeline phase type.
+
+    Generators time their draw calls with stage(name) while a profiler is
+    attached. Stages nest (draw_row includes draw_movie_info, which includes
+    draw_score), so a stage's time includes that of the stages inside it.
+    Timings come from the process that renders; frames rendered in worker
+    processes are not profiled.
+    """
+
+    def __init__(self, json_path: Optional[str] = None):
+        self.json_path = json_path
+        # Phase type the renderer is currently drawing, set per frame
+        self.phase = 'unknown'
+        self.samples: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+        self.started: Optional[float] = None
+        self.wall_seconds = 0.0
+
+    def begin(self):
+        self.samples.clear()
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, phase: Optional[str] = None) -> Iterator[None]:
+        """Time the block under name, for phase or the phase being drawn"""
+        phase = phase or self.phase
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[(phase, name)].append(time.perf_counter() - start)
+
+    def report(self) -> Dict[str, Any]:
+        """{phase: {stage: {calls, total, mean, p50, p95}}} in seconds"""
+        phases: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (phase, name), samples in sorted(self.samples.items()):
+            values = np.asarray(samples)
+            phases.setdefault(phase, {})[name] = {
+                'calls': len(values),
+                'total': float(values.sum()),
+                'mean': float(values.mean()),
+                'p50': float(np.percentile(values, 50)),
+                'p95': float(np.percentile(values, 95)),
+            }
+        return {'wall_seconds': self.wall_seconds, 'phases': phases}
+
+    def format_table(self) -> str:
+        report = self.report()
+        lines = [f"{'phase':<14} {'stage':<18} {'calls':>7} {'total':>9} {'p50':>9} {'p95':>9}"]
+        for phase, stages in report['phases'].items():
+            for name, row in sorted(stages.items(), key=lambda item: -item[1]['total']):
+                lines.append(f"{phase:<14} {name:<18} {row['calls']:>7} {row['total']:>8.2f}s "
+                             f"{row['p50'] * 1000:>7.2f}ms {row['p95'] * 1000:>7.2f}ms")
+        lines.append(f"wall time {report['wall_seconds']:.2f}s")
+        return "\n".join(lines)
+
+    def finish(self):
+        """Print the table and write the JSON report, if a path was given"""
+        if self.started is not None:
+            self.wall_seconds = time.perf_counter() - self.started
+        print(self.format_table())
+        if self.json_path:
+            with open(self.json_path, 'w', encoding='utf-8') as f:
+                json.dump(self.report(), f, indent=2)
@@ -0,0 +1,116 @@
+from bisect import bisect_left
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+class Phase:
+    """One breakpoint of the timeline: a [start, end] span of a given type"""
+    __slots__ = ('start', 'end', 'type', 'index')
+
+    def __init__(self, start: float, end: float, type: str, index: int = -1):
+        self.start = start
+        self.end = end
+        self.type = type
+        self.index = index
+
+    def progress(self, time: float) -> float:
+        return (time - self.start) / (self.end - self.start)
+
+    def __repr__(self):
+        return f"Phase({self.start!r}, {self.end!r}, {self.type!r}, {self.index!r})"
+
+
+class Timeline:
+    """Breakpoint phases sorted by start time, looked up by bisection.
+
+    Phases must not overlap except at shared boundaries, where the earlier
+    phase wins, the same as scanning the list in order.
+    """
+
+    def __init__(self, phases: Iterable[Phase], duration: Optional[float] = None):
+        self.phases = sorted(phases, key=lambda phase: phase.start)
+        if not self.phases:
+            raise ValueError("Timeline needs at least one phase")
+        self.starts = [phase.start for phase in self.phases]
+        self.ends = [phase.end for phase in self.phases]
+        if any(a > b for a, b in zip(self.ends, self.ends[1:])):
+            raise ValueError("Timeline phases must not overlap")
+        self.duration = self.ends[-1] if duration is None else duration
+        self.start_array = np.asarray(self.starts, dtype=np.float64)
+        self.end_array = np.asarray(self.ends, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.phases)
+
+    def __iter__(self) -> Iterator[Phase]:
+        return iter(self.phases)
+
+    def __getitem__(self, index: int) -> Phase:
+        return self.phases[index]
+
+    def find(self, time: float) -> Optional[int]:
+        """Index of the first phase containing time, or None if no phase does"""
+        index = bisect_left(self.ends, time)
+        if index < len(self.phases) and self.starts[index] <= time:
+            return index
+        return None
+
+    def locate(self, time: float) -> Tuple[Phase, float]:
+        """Phase at time and the progress within it.
+
+        Times outside every phase report the last phase fully complete.
+        """
+        index = self.find(time)
+        if index is None:
+            return self.phases[-1], 1.0
+        phase = self.phases[index]
+        return phase, phase.progress(time)
+
+    def phases_for_frames(self, n_frames: int, fps: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Phase index and phase progress of every frame, in one vectorized pass.
+
+        Gives the same results as calling locate() on each frame's progress
+        times duration, as the generators do.
+        """
+        times = np.arange(n_frames) * (1.0 / fps)
+        current = (times / self.duration) * self.duration
+        found = np.searchsorted(self.end_array, current, side='left')
+        clipped = np.minimum(found, len(self.phases) - 1)
+        valid = (found < len(self.phases)) & (self.start_array[clipped] <= current)
+        indices = np.where(valid, clipped, len(self.phases) - 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            progress = (current - self.start_array[indices]) / (self.end_array[indices] - self.start_array[indices])
+        return indices, np.where(valid, progress, 1.0)
+
+
+def frame_times(duration: float, fps: float) -> np.ndarray:
+    """Timestamps of every frame in a render.
+
+    Matches the grid MoviePy's writer iterates, so frames rendered outside of
+    MoviePy land on exactly the same times as the serial path.
+    """
+    return np.arange(0, duration, 1.0 / fps)
+
+
+def hold_runs(keys: Sequence[Hashable]) -> List[Tuple[int, int]]:
+    """Group consecutive equal frame keys into (first_index, length) runs"""
+    runs = []
+    for index, key in enumerate(keys):
+        if runs and keys[runs[-1][0]] == key:
+            runs[-1][1] += 1
+        else:
+            runs.append([index, 1])
+    return [(start, length) for start, length in runs]
+
+
+def iter_held_frames(keys: Sequence[Hashable],
+                     render_index: Callable[[int], Any]) -> Iterator[Tuple[int, Any]]:
+    """Yield (index, frame) for every frame, rendering each hold only once.
+
+    Frames within a hold are the same object, so consumers must not modify
+    them in place.
+    """
+    for start, length in hold_runs(keys):
+        frame = render_index(start)
+        for index in range(start, start + length):
+            yield index, frame
@@ -0,0 +1,208 @@
+"""Incremental renders: one cached encode per timeline phase.
+
+The timeline is split into segments at its breakpoints. Each segment is
+encoded on its own and stored on disk under a hash of everything that is
+drawn in it (generator settings, the phase, the rows and actor visible in
+that phase, the encode settings and the renderer's source code). A
+re-render after swapping a movie or reordering categories only encodes the
+segments whose inputs changed; the rest are reused and all of them are
+joined with ffmpeg's concat demuxer without re-encoding.
+"""
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from Actor import Actor
+from Movie import Movie
+from encode_profiles import EncodeProfile, get_encode_profile
+from ffmpeg_pipe_encoder import FFmpegPipeEncoder, get_ffmpeg_binary
+from render_timeline import frame_times, hold_runs
+
+# Bump to invalidate every cached segment after a change to the format
+SEGMENT_FORMAT = 1
+
+
+def file_inputs(path: Optional[str]) -> tuple:
+    """Path plus size and mtime, so edited files miss the cache"""
+    if path and os.path.exists(path):
+        stat = os.stat(path)
+        return (path, stat.st_size, stat.st_mtime_ns)
+    return (path,)
+
+
+def movie_inputs(movie: Optional[Movie]) -> tuple:
+    if movie is None:
+        return ()
+    return (movie.title, movie.year, movie.box_office, movie.tomatometer, movie.popcornmeter,
+            file_inputs(movie.poster_path))
+
+
+def actor_inputs(actor: Actor) -> tuple:
+    return (actor.name, file_inputs(actor.url))
+
+
+def source_fingerprint(generator) -> str:
+    """Hash of the source of every loaded module of this repository.
+
+    Drawing depends on more than the generator's own module (poster easing,
+    image pyramids, Movie's display text, ...), so every repo module that
+    is imported counts. Editing any of them changes the fingerprint, so
+    stale segments are never reused after a code change. A different set of
+    loaded modules (another entry point) only costs cache misses.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in sorted(sys.modules):
+        # The running script, unless the generator itself is defined there
+        if name == '__main__' and type(generator).__module__ != '__main__':
+            continue
+        path = getattr(sys.modules.get(name), '__file__', None)
+        if path and path.endswith('.py') and os.path.dirname(os.path.abspath(path)) == root:
+            with open(path, 'rb') as f:
+                digest.update(name.encode() + b'\0' + f.read())
+    return digest.hexdigest()
+
+
+class SegmentCache:
+    """Encoded segments on disk, one file per input hash.
+
+    Reused segments have their mtime refreshed, and prune() drops the least
+    recently used files beyond max_segments.
+    """
+
+    def __init__(self, directory: str = "segment_cache", max_segments: int = 512,
+                 extension: str = ".mp4"):
+        self.directory = directory
+        self.max_segments = max_segments
+        self.extension = extension
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(inputs: Any) -> str:
+        return hashlib.sha256(repr(inputs).encode()).hexdigest()[:40]
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.extension)
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of the cached segment for key, or None on a miss"""
+        path = self.path(key)
+        if os.path.exists(path):
+            os.utime(path)
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def prune(self):
+        entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                   if name.endswith(self.extension)]
+        if len(entries) <= self.max_segments:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - self.max_segments]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def plan_segments(generator, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]],
+                  profile: EncodeProfile) -> List[Tuple[int, int, str]]:
+    """(first_frame, frame_count, cache_key) for each phase of the timeline"""
+    fps = generator.fps
+    n_frames = len(frame_times(generator.duration, fps))
+    phase_indices, _ = generator.breakpoints.phases_for_frames(n_frames, fps)
+    # x264 thread count only changes speed, so it stays out of the key
+    params = profile.ffmpeg_params(fps)
+    params = params[:params.index('-threads')]
+    shared = (SEGMENT_FORMAT, type(generator).__name__, generator.width, generator.height, fps,
+              generator.duration, tuple(params), source_fingerprint(generator))
+
+    segments = []
+    for start, length in hold_runs(phase_indices.tolist()):
+        phase = generator.breakpoints[int(phase_indices[start])]
+        inputs = shared + ((phase.type, phase.index, phase.start, phase.end), start, length,
+                           generator.segment_inputs(phase, actor, movies_with_descriptors))
+        segments.append((start, length, SegmentCache.key(inputs)))
+    return segments
+
+
+def concat_segments(paths: List[str], output_path: str, audio_path: Optional[str] = None,
+                    audio_volume_db: float = 0, duration: Optional[float] = None):
+    """Join encoded segments without re-encoding, muxing in the audio track"""
+    list_file = tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8')
+    try:
+        with list_file:
+            for path in paths:
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                list_file.write(f"file '{escaped}'\n")
+        cmd = [get_ffmpeg_binary(), '-y', '-hide_banner', '-loglevel', 'error',
+               '-f', 'concat', '-safe', '0', '-i', list_file.name]
+        if audio_path:
+            cmd += ['-i', audio_path, '-map', '0:v:0', '-map', '1:a:0', '-c:a', 'aac', '-shortest']
+            if audio_volume_db:
+                cmd += ['-af', f'volume={audio_volume_db}dB']
+        if duration is not None:
+            cmd += ['-t', f'{duration}']
+        cmd += ['-c:v', 'copy', '-movflags', '+faststart', output_path]
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg concat failed: {result.stderr.decode(errors='replace').strip()}")
+    finally:
+        os.remove(list_file.name)
+
+
+def generate_video_incremental(generator, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]],
+                               output_path: str, cache: SegmentCache,
+                               progress_callback: Optional[Callable[[float], None]] = None,
+                               profile: Union[str, EncodeProfile] = 'publish',
+                               audio_path: Optional[str] = None,
+                               audio_volume_db: float = 0) -> Dict[str, Any]:
+    """Render a short, re-encoding only the segments whose inputs changed.
+
+    Works with either generator. Returns counts of rendered and reused
+    segments and frames, and the time taken.
+    """
+    profile = get_encode_profile(profile)
+    started = time.perf_counter()
+    segments = plan_segments(generator, actor, movies_with_descriptors, profile)
+    n_frames = sum(length for _, length, _ in segments)
+    stats = {'segments': len(segments), 'rendered': 0, 'reused': 0, 'frames_rendered': 0}
+
+    paths = []
+    done = 0
+    for start, length, key in segments:
+        path = cache.get(key)
+        if path is None:
+            path = cache.path(key)
+            partial = path + '.part' + cache.extension
+            with FFmpegPipeEncoder(partial, generator.width, generator.height, generator.fps,
+                                   ffmpeg_params=profile.ffmpeg_params(generator.fps),
+                                   pixel_format=generator.pixel_format) as encoder:
+                for _, _, frame in generator.iter_frames(actor, movies_with_descriptors,
+                                                         start=start, stop=start + length):
+                    encoder.write(frame)
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done / n_frames)
+            # Only complete encodes ever appear under the final name
+            os.replace(partial, path)
+            stats['rendered'] += 1
+            stats['frames_rendered'] += length
+        else:
+            stats['reused'] += 1
+            done += length
+            if progress_callback:
+                progress_callback(done / n_frames)
+        paths.append(path)
+
+    concat_segments(paths, output_path, audio_path, audio_volume_db, generator.duration)
+    cache.prune()
+    stats['seconds'] = time.perf_counter() - started
+    return stats
@@ -17,6 +17,7 @@ class SoundManager:
         
         # Store audio segments
         self.background_music: Optional[AudioSegment] = None
+        self.background_music_key: Optional[tuple] = None
         self.narrations: Dict[float, AudioSegment] = {}
         
         # Playback control
@@ -28,6 +29,12 @@ class SoundManager:
         """Load background music from file"""
         if not os.path.exists(music_path):
             raise FileNotFoundError(f"Background music file not found: {music_path}")
+        
+        # Decoding is slow, so keep the music if this file is already loaded
+        loaded_key = (os.path.abspath(music_path), os.path.getmtime(music_path), bool(loop),
+                      self.background_volume)
+        if self.background_music is not None and self.background_music_key == loaded_key:
+            return
             
         self.background_music = AudioSegment.from_file(music_path)
         if loop:
@@ -36,6 +43,7 @@ class SoundManager:
             
         # Apply volume adjustment
         self.background_music = self.background_music + self.background_volume
+        self.background_music_key = loaded_key
     
     # def add_narration(self, timestamp: float, text: str, voice: str = "Josh"):
     #     """Generate and add narration at specific timestamp"""
@@ -0,0 +1,86 @@
+"""Storyboard previews drawn straight from a generator's create_frame.
+
+Nothing is encoded: the frames at a handful of timestamps, by default the
+end of every timeline phase, are rendered in memory and tiled into one
+contact sheet. With a draft generator (see ShortsGenerator.draft) a full
+storyboard takes a fraction of a second.
+"""
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from PIL import Image, ImageDraw
+from Actor import Actor
+from Movie import Movie
+from render_timeline import Phase
+
+PHASE_LABELS = {'title_reveal': "Title", 'poster': "Poster", 'actor_reveal': "Actor"}
+
+
+def phase_label(phase: Phase) -> str:
+    label = PHASE_LABELS.get(phase.type, phase.type)
+    return f"{label} {phase.index + 1}" if phase.index >= 0 else label
+
+
+def storyboard_times(generator, position: float = 1.0) -> List[float]:
+    """One timestamp per timeline phase, position of the way through it"""
+    return [phase.start + (phase.end - phase.start) * position for phase in generator.breakpoints]
+
+
+def frame_progress(generator, time: float) -> float:
+    """Overall progress for time, kept inside the phase that time falls in.
+
+    Phase ends are shared with the next phase's start, and time / duration
+    can round across that boundary.
+    """
+    phase = generator.breakpoints.locate(time)[0]
+    progress = time / generator.duration
+    while progress > 0 and generator.get_current_phase(progress)[0] is not phase:
+        progress = float(np.nextafter(progress, 0))
+    return progress
+
+
+def render_preview_frame(generator, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]],
+                         time: float) -> Image.Image:
+    """The frame at time seconds as an RGB image, for either generator"""
+    frame = generator.create_frame(actor, movies_with_descriptors, frame_progress(generator, time))
+    if isinstance(frame, np.ndarray):
+        # OpenCV frames are BGR and may live in a reused frame pool
+        return Image.fromarray(np.ascontiguousarray(frame[:, :, ::-1]))
+    return frame.copy()
+
+
+def render_storyboard(generator, actor: Actor, movies_with_descriptors: List[Tuple[Movie, str]],
+                      times: Optional[Sequence[float]] = None, columns: int = 6,
+                      thumb_width: int = 180, labels: bool = True) -> Image.Image:
+    """Contact sheet of the frames at times, by default one per phase.
+
+    Args:
+        generator: ShortsGenerator or OpenCVShortsGenerator
+        times: Timestamps in seconds, defaults to storyboard_times(generator)
+        columns: Thumbnails per row
+        thumb_width: Width of each thumbnail; heights keep the frame's aspect ratio
+        labels: Caption each thumbnail with its phase and timestamp
+    """
+    if times is None:
+        times = storyboard_times(generator)
+    thumb_height = int(round(thumb_width * generator.height / generator.width))
+    caption_height = 16 if labels else 0
+    spacing = 4
+    columns = max(1, min(columns, len(times)))
+    rows = (len(times) + columns - 1) // columns
+
+    sheet = Image.new('RGB', (columns * (thumb_width + spacing) + spacing,
+                              rows * (thumb_height + caption_height + spacing) + spacing),
+                      (0, 0, 0))
+    draw = ImageDraw.Draw(sheet)
+    for i, time in enumerate(times):
+        frame = render_preview_frame(generator, actor, movies_with_descriptors, time)
+        if frame.size != (thumb_width, thumb_height):
+            frame = frame.resize((thumb_width, thumb_height), Image.Resampling.BILINEAR)
+        x = spacing + (i % columns) * (thumb_width + spacing)
+        y = spacing + (i // columns) * (thumb_height + caption_height + spacing)
+        sheet.paste(frame, (x, y))
+        if labels:
+            phase = generator.breakpoints.locate(time)[0]
+            draw.text((x + 2, y + thumb_height + 2), f"{phase_label(phase)}  {time:.1f}s",
+                      fill=(200, 200, 200))
+    return sheet